@@ -0,0 +1,28 @@
+-- ============================================================
+-- MIGRATION: Denormalized per-article view totals
+-- Target schema: schema v5
+-- ============================================================
+-- Adds article_view_total, one row per viewed article with the sum of
+-- user_article_view.view_count. It feeds the "N views" line of the
+-- infographic page (md_to_html_v2._generate_top_metadata) and the
+-- "Most viewed" sort on search and bookmarks, which would otherwise
+-- aggregate user_article_view per request.
+--
+-- Maintained by mockup_data/view_counter.py in the same batches that
+-- upsert user_article_view.
+-- ============================================================
+
+CREATE TABLE article_view_total (
+    article_id     UNIQUEIDENTIFIER PRIMARY KEY,
+    total_views    BIGINT NOT NULL DEFAULT 0,
+    last_viewed_at DATETIME2,
+    updated_at     DATETIME2 DEFAULT GETDATE(),
+    FOREIGN KEY (article_id) REFERENCES article(id) ON DELETE CASCADE
+);
+GO
+
+-- "Most viewed": ORDER BY total_views DESC without a sort
+CREATE NONCLUSTERED INDEX ix_article_view_total_total_views ON article_view_total (total_views DESC);
+GO
+
+PRINT 'Migration completed: article_view_total created.';
@@ -0,0 +1,24 @@
+-- ============================================================
+-- MIGRATION: Review time of completed courses
+-- Target schema: schema v5
+-- ============================================================
+-- Adds user_course.last_reviewed_at, set when a learner reopens a
+-- completed or Stale course (screens/4-roadmap/doc.md: "cập nhật thời
+-- gian truy cập"). completed_at stays the completion time — it is the
+-- learning history and a streak activity (mockup_data/streak_engine.py).
+--
+-- A course is due for review stale_days after
+-- COALESCE(last_reviewed_at, completed_at)
+-- (mockup_data/review_scheduler.py, mockup_data/roadmap_states.py).
+--
+-- NULL = never reviewed since completion.
+-- ============================================================
+
+-- 1) user_course: add last_reviewed_at (if needed)
+IF COL_LENGTH('user_course', 'last_reviewed_at') IS NULL
+BEGIN
+    ALTER TABLE user_course ADD last_reviewed_at DATETIME2 NULL;
+END
+GO
+
+PRINT 'Migration completed: user_course.last_reviewed_at added.';
@@ -0,0 +1,20 @@
+-- ============================================================
+-- MIGRATION: Per-user time zone for streak day bucketing
+-- Target schema: schema v5
+-- ============================================================
+-- Adds user_setting.timezone, an IANA zone name ('Asia/Ho_Chi_Minh',
+-- 'Europe/Berlin', ...). A streak day is the user's local calendar day:
+-- mockup_data/streak_engine.py converts user_course.completed_at and
+-- user_section_test.completed_at (GETDATE() on the server) into it.
+--
+-- NULL = not set yet; the streak engine falls back to the server's zone.
+-- ============================================================
+
+-- 1) user_setting: add timezone (if needed)
+IF COL_LENGTH('user_setting', 'timezone') IS NULL
+BEGIN
+    ALTER TABLE user_setting ADD timezone NVARCHAR(64) NULL;
+END
+GO
+
+PRINT 'Migration completed: user_setting.timezone added.';
@@ -0,0 +1,48 @@
+-- ============================================================
+-- MIGRATION: Materialized roadmap progress per (user, theme)
+-- Target schema: schema v5
+-- ============================================================
+-- Adds user_theme_progress, one compact row per user and theme that the
+-- roadmap screen reads instead of joining course / section / user_course /
+-- user_section_test / initial_user_section_proficiency on every load.
+--
+-- Maintained by mockup_data/roadmap_progress.py:
+-- - batch rebuild from the source tables
+-- - incremental update on every user_course / user_section_test write
+-- - a row whose curriculum_version or demographic no longer matches
+--   (courses added, reordered, deactivated) is recomputed on read
+--
+-- Encodings (section positions follow section.order_index, course
+-- positions follow course.order_index among active courses):
+-- - completed_bitmaps / passed_bitmaps: one hex bitmap per section,
+--   comma-separated; bit k = k-th course completed / passed (>= 80% quiz)
+-- - skippable_sections / tests_eligible / tests_passed: hex bitmaps over
+--   section positions
+-- - next_item_type + next_item_id: what the "Continue Learning" sheet
+--   opens ('course' → course.id, 'test' → section_test.section_id)
+-- ============================================================
+
+CREATE TABLE user_theme_progress (
+    user_id            UNIQUEIDENTIFIER NOT NULL,
+    theme_id           UNIQUEIDENTIFIER NOT NULL,
+    curriculum_version NVARCHAR(16) NOT NULL,
+    demographic        NVARCHAR(20) NULL,
+    completed_courses  INT NOT NULL DEFAULT 0,
+    total_courses      INT NOT NULL DEFAULT 0,
+    completed_bitmaps  NVARCHAR(2000) NOT NULL DEFAULT '',
+    passed_bitmaps     NVARCHAR(2000) NOT NULL DEFAULT '',
+    skippable_sections NVARCHAR(32) NOT NULL DEFAULT '0',
+    tests_eligible     NVARCHAR(32) NOT NULL DEFAULT '0',
+    tests_passed       NVARCHAR(32) NOT NULL DEFAULT '0',
+    next_item_type     NVARCHAR(10) NULL,
+    next_item_id       UNIQUEIDENTIFIER NULL,
+    is_finished        BIT DEFAULT 0,
+    updated_at         DATETIME2 DEFAULT GETDATE(),
+    PRIMARY KEY (user_id, theme_id),
+    FOREIGN KEY (theme_id) REFERENCES theme(id),
+    -- No FK on user_id: cross-service reference
+    CONSTRAINT chk_progress_next_item_type CHECK (next_item_type IN ('course', 'test') OR next_item_type IS NULL)
+);
+GO
+
+PRINT 'Migration completed: user_theme_progress created.';
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Content Index
+Shared, cached lookup tables over the mockup content hierarchy.
+
+Sources:
+  generated/mockup_data.json — ids, names, orderIndex, content file names
+  content_layout.json        — authoring-only fields (theme colour/icon,
+                               course objectives) not carried into mockup_data
+
+Generators call load_content_index() instead of walking themes → sections →
+courses themselves or hardcoding labels. The index is built once per process
+(and rebuilt only if either source file changes on disk); every lookup is a
+plain dict access.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+
+MOCKUP_DIR          = Path(__file__).resolve().parent
+DEFAULT_MOCKUP_DATA = MOCKUP_DIR / 'generated' / 'mockup_data.json'
+DEFAULT_LAYOUT      = MOCKUP_DIR / 'content_layout.json'
+
+
+class ContentIndex:
+    """
+    Flat lookups over themes, sections and courses.
+
+    Ordered lists (roadmap order — theme.orderIndex, then section.orderIndex,
+    then course.orderIndex):
+        themes, sections, courses            — dicts as found in mockup_data.json
+
+    Lookups keyed by slug:
+        theme_names, theme_ids, theme_order, theme_colors, theme_icons
+        section_names, section_ids, section_theme, section_order, roadmap_order
+        course_names, course_ids, course_section, course_theme, course_order,
+        course_files, course_objectives
+        section_courses                      — section slug → [course slugs]
+        section_by_id, course_by_id          — id → slug
+    """
+
+    def __init__(self, mockup_data, layout=None):
+        self.version  = mockup_data.get('version')
+        self.language = mockup_data.get('language')
+
+        self.themes, self.sections, self.courses = [], [], []
+
+        self.theme_names, self.theme_ids, self.theme_order = {}, {}, {}
+        self.theme_colors, self.theme_icons = {}, {}
+
+        self.section_names, self.section_ids, self.section_theme = {}, {}, {}
+        self.section_order, self.roadmap_order = {}, {}
+        self.section_courses = {}
+
+        self.course_names, self.course_ids, self.course_section = {}, {}, {}
+        self.course_theme, self.course_order, self.course_files = {}, {}, {}
+        self.course_objectives = {}
+
+        for theme in sorted(mockup_data['themes'], key=lambda t: t['orderIndex']):
+            t_slug = theme['slug']
+            self.themes.append(theme)
+            self.theme_names[t_slug] = theme['name']
+            self.theme_ids[t_slug]   = theme['id']
+            self.theme_order[t_slug] = theme['orderIndex']
+
+            for section in sorted(theme['sections'], key=lambda s: s['orderIndex']):
+                s_slug = section['slug']
+                self.roadmap_order[s_slug] = len(self.sections)
+                self.sections.append(section)
+                self.section_names[s_slug] = section['name']
+                self.section_ids[s_slug]   = section['id']
+                self.section_theme[s_slug] = t_slug
+                self.section_order[s_slug] = section['orderIndex']
+                self.section_courses[s_slug] = []
+
+                for course in sorted(section['courses'], key=lambda c: c['orderIndex']):
+                    c_slug = course['slug']
+                    self.courses.append(course)
+                    self.section_courses[s_slug].append(c_slug)
+                    self.course_names[c_slug]   = course['name']
+                    self.course_ids[c_slug]     = course['id']
+                    self.course_section[c_slug] = s_slug
+                    self.course_theme[c_slug]   = t_slug
+                    self.course_order[c_slug]   = course['orderIndex']
+                    self.course_files[c_slug]   = course['contentFile']
+
+        for theme in (layout or {}).get('themes', []):
+            if theme.get('color_code'):
+                self.theme_colors[theme['slug']] = theme['color_code']
+            if theme.get('icon_file_name'):
+                self.theme_icons[theme['slug']] = theme['icon_file_name']
+            for section in theme.get('sections', []):
+                for course in section.get('courses', []):
+                    self.course_objectives[course['slug']] = course.get('objectives', [])
+
+        self.section_by_id = {v: k for k, v in self.section_ids.items()}
+        self.course_by_id  = {v: k for k, v in self.course_ids.items()}
+
+    def section_label(self, slug):
+        """Display name for a section slug, falling back to the slug itself."""
+        return self.section_names.get(slug, slug)
+
+
+# ---------------------------------------------------------------------------
+# Loader
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=8)
+def _build_index(mockup_data_path, layout_path, _mtimes):
+    with open(mockup_data_path, 'r', encoding='utf-8') as f:
+        mockup_data = json.load(f)
+    layout = None
+    if layout_path is not None:
+        with open(layout_path, 'r', encoding='utf-8') as f:
+            layout = json.load(f)
+    return ContentIndex(mockup_data, layout)
+
+
+def load_content_index(mockup_data_path=DEFAULT_MOCKUP_DATA, layout_path=DEFAULT_LAYOUT):
+    """
+    Return the shared ContentIndex. Repeated calls in one process reuse the
+    same instance until a source file's mtime changes. Pass layout_path=None
+    to skip content_layout.json.
+    """
+    mockup_data_path = str(Path(mockup_data_path).resolve())
+    mtimes = [Path(mockup_data_path).stat().st_mtime_ns]
+    if layout_path is not None:
+        layout_path = str(Path(layout_path).resolve())
+        if Path(layout_path).exists():
+            mtimes.append(Path(layout_path).stat().st_mtime_ns)
+        else:
+            layout_path = None
+    return _build_index(mockup_data_path, layout_path, tuple(mtimes))
+
+
+def main():
+    index = load_content_index()
+    print(f"Content index ({DEFAULT_MOCKUP_DATA.name}, {DEFAULT_LAYOUT.name})")
+    print(f"  - Themes:   {len(index.themes)}")
+    print(f"  - Sections: {len(index.sections)}")
+    print(f"  - Courses:  {len(index.courses)}")
+
+
+if __name__ == "__main__":
+    main()
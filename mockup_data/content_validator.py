@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Content Validator
+Multi-error validation for the course, section test and initial assessment
+JSON corpus.
+
+Schemas:
+  course, section_test   screens/6-course_test/JSON_SPEC.md
+  assessment             screens/5-onboarding/spec.md (v1.1 — isCorrect +
+                         sectionSlug; supersedes the scoreValue layout in
+                         database/specs/INITIAL_ASSESSMENT_STRUCTURE.md)
+
+Every problem in a file is reported as "<json path>: <message>", e.g.
+  $.screens[3].content.options: expected 2-6 items, got 1
+A bad file never stops the run — unreadable or malformed JSON is just another
+error for that file. Field tables are checked by one generic walker, and
+directory runs fan out over a process pool, so a CI pass over the whole
+corpus is bounded by JSON parsing.
+
+Usage:
+    python content_validator.py                  # both default course folders
+    python content_validator.py path/or/dir ...  # explicit course files/dirs
+    python content_validator.py --kind KIND path ...
+                                                 # KIND: course (default),
+                                                 # section_test or assessment
+"""
+
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+
+MOCKUP_DIR      = Path(__file__).resolve().parent
+DEFAULT_COURSE_DIRS = [
+    MOCKUP_DIR / 'content_files' / 'courses',
+    MOCKUP_DIR / 'generated' / 'course_json',
+]
+
+# Below this many files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+PLACEHOLDER_RE = re.compile(r'<(\d+)>')
+
+
+# ---------------------------------------------------------------------------
+# Field tables — (name, type(s), required, max length)
+# ---------------------------------------------------------------------------
+
+COURSE_FIELDS = (
+    ('version', str,  True, None),
+    ('screens', list, True, None),
+)
+SCREEN_FIELDS = (
+    ('id',         str,  True, None),
+    ('type',       str,  True, None),
+    ('orderIndex', int,  True, None),
+    ('content',    dict, True, None),
+)
+INFOGRAPHIC_FIELDS = (
+    ('imageFileName', str, False, 255),
+    ('summaryText',   str, True,  2000),
+)
+
+SECTION_TEST_FIELDS = (
+    ('version',   str,  True, None),
+    ('questions', list, True, None),
+)
+SECTION_TEST_QUESTION_FIELDS = (
+    ('id',              str,  True, None),
+    ('orderIndex',      int,  True, None),
+    ('difficultyLevel', str,  True, None),
+    ('content',         dict, True, None),
+)
+
+MC_FIELDS = (
+    ('questionType', str,  True,  None),
+    ('questionText', str,  True,  1000),
+    ('explanation',  str,  False, 2000),
+    ('options',      list, True,  None),
+)
+MC_OPTION_FIELDS = (
+    ('id',        str,  True, None),
+    ('text',      str,  True, None),
+    ('isCorrect', bool, True, None),
+)
+TF_FIELDS = (
+    ('questionType',  str,  True,  None),
+    ('questionText',  str,  True,  1000),
+    ('explanation',   str,  False, 2000),
+    ('correctAnswer', bool, True,  None),
+)
+MATCHING_FIELDS = (
+    ('questionType',   str,  True, None),
+    ('sentence',       str,  True, None),
+    ('correctAnswers', list, True, None),
+    ('wrongAnswers',   list, True, None),
+)
+
+ASSESSMENT_FIELDS = (
+    ('version',   str,  True, None),
+    ('questions', list, True, None),
+    ('ageGroups', list, True, None),
+)
+ASSESSMENT_QUESTION_FIELDS = (
+    ('id',           str,  True, 50),
+    ('questionText', str,  True, 1000),
+    ('questionType', str,  True, None),
+    ('sectionSlug',  str,  True, 300),
+    ('orderIndex',   int,  True, None),
+    ('options',      list, True, None),
+)
+ASSESSMENT_OPTION_FIELDS = (
+    ('id',         str,  True, 50),
+    ('text',       str,  True, 500),
+    ('isCorrect',  bool, True, None),
+    ('orderIndex', int,  True, None),
+)
+
+SCREEN_TYPES       = ('infographic', 'quiz')
+DIFFICULTY_LEVELS  = ('easy', 'medium', 'hard')
+ASSESSMENT_QUESTION_TYPES = ('multiple_choice', 'true_false')
+
+_TYPE_NAMES = {str: 'string', int: 'integer', bool: 'boolean', list: 'array', dict: 'object'}
+
+
+# ---------------------------------------------------------------------------
+# Generic checks
+# ---------------------------------------------------------------------------
+
+def _type_name(value):
+    if value is None:
+        return 'null'
+    return _TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def _is_type(value, expected):
+    # bool is an int subclass — never accept it where an integer is expected
+    if expected is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, expected)
+
+
+def check_fields(obj, path, fields, errors):
+    """
+    Check obj against a field table. Returns False (after recording an error)
+    if obj is not an object at all, so callers can skip the nested rules.
+    """
+    if not isinstance(obj, dict):
+        errors.append(f"{path}: expected object, got {_type_name(obj)}")
+        return False
+    for name, expected, required, max_len in fields:
+        if name not in obj:
+            if required:
+                errors.append(f"{path}.{name}: required field missing")
+            continue
+        value = obj[name]
+        if not _is_type(value, expected):
+            errors.append(f"{path}.{name}: expected {_TYPE_NAMES[expected]}, got {_type_name(value)}")
+        elif max_len is not None and len(value) > max_len:
+            errors.append(f"{path}.{name}: longer than {max_len} characters ({len(value)})")
+    return True
+
+
+def _check_non_empty(obj, name, path, errors):
+    value = obj.get(name)
+    if isinstance(value, str) and not value.strip():
+        errors.append(f"{path}.{name}: must be non-empty")
+
+
+def _check_items(items, path, min_items, max_items, errors):
+    """Length bounds for an array; returns the array (or [] if not a list)."""
+    if not isinstance(items, list):
+        return []
+    if len(items) < min_items or (max_items is not None and len(items) > max_items):
+        bound = f"{min_items}-{max_items}" if max_items is not None else f"at least {min_items}"
+        errors.append(f"{path}: expected {bound} items, got {len(items)}")
+    return items
+
+
+def _check_ids_and_order(items, path, errors, order_key='orderIndex'):
+    """Unique 'id' values and orderIndex sequential from 1 across an array of objects."""
+    seen = {}
+    orders = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        item_id = item.get('id')
+        if isinstance(item_id, str):
+            if item_id in seen:
+                errors.append(f"{path}[{i}].id: duplicate id '{item_id}' (first at [{seen[item_id]}])")
+            else:
+                seen[item_id] = i
+        order = item.get(order_key)
+        if _is_type(order, int):
+            orders.append(order)
+    if order_key and len(orders) == len(items) and sorted(orders) != list(range(1, len(items) + 1)):
+        errors.append(f"{path}: {order_key} values must be sequential starting from 1")
+
+
+# ---------------------------------------------------------------------------
+# Question content (JSON_SPEC.md Part 3)
+# ---------------------------------------------------------------------------
+
+def _validate_mc(content, path, errors):
+    if not check_fields(content, path, MC_FIELDS, errors):
+        return
+    _check_non_empty(content, 'questionText', path, errors)
+    options = _check_items(content.get('options'), f"{path}.options", 2, 6, errors)
+    for i, opt in enumerate(options):
+        check_fields(opt, f"{path}.options[{i}]", MC_OPTION_FIELDS, errors)
+    _check_ids_and_order(options, f"{path}.options", errors, order_key=None)
+    correct = sum(1 for opt in options if isinstance(opt, dict) and opt.get('isCorrect') is True)
+    if options and correct != 1:
+        errors.append(f"{path}.options: exactly 1 option must have isCorrect: true, got {correct}")
+
+
+def _validate_tf(content, path, errors):
+    if check_fields(content, path, TF_FIELDS, errors):
+        _check_non_empty(content, 'questionText', path, errors)
+
+
+def _validate_matching(content, path, errors):
+    if not check_fields(content, path, MATCHING_FIELDS, errors):
+        return
+    sentence = content.get('sentence')
+    if not isinstance(sentence, str):
+        return
+    placeholders = set(PLACEHOLDER_RE.findall(sentence))
+    if not placeholders:
+        errors.append(f"{path}.sentence: must contain at least one placeholder (<1>)")
+    answers = content.get('correctAnswers')
+    if isinstance(answers, list) and placeholders and len(answers) != len(placeholders):
+        errors.append(f"{path}.correctAnswers: expected {len(placeholders)} items "
+                      f"(one per placeholder), got {len(answers)}")
+    _check_items(content.get('wrongAnswers'), f"{path}.wrongAnswers", 1, None, errors)
+
+
+QUESTION_VALIDATORS = {
+    'multiple_choice': _validate_mc,
+    'true_false':      _validate_tf,
+    'matching':        _validate_matching,
+}
+
+
+def validate_question_content(content, path, errors):
+    if not isinstance(content, dict):
+        return
+    qtype = content.get('questionType')
+    validator = QUESTION_VALIDATORS.get(qtype)
+    if validator is None:
+        errors.append(f"{path}.questionType: expected one of {', '.join(QUESTION_VALIDATORS)}, got {qtype!r}")
+    else:
+        validator(content, path, errors)
+
+
+# ---------------------------------------------------------------------------
+# Document validators
+# ---------------------------------------------------------------------------
+
+def validate_screen(screen, path, errors):
+    """Check one course screen object; appends to errors."""
+    if not check_fields(screen, path, SCREEN_FIELDS, errors):
+        return
+    content = screen.get('content')
+    stype = screen.get('type')
+    if stype == 'infographic':
+        if check_fields(content, f"{path}.content", INFOGRAPHIC_FIELDS, errors):
+            _check_non_empty(content, 'summaryText', f"{path}.content", errors)
+    elif stype == 'quiz':
+        validate_question_content(content, f"{path}.content", errors)
+    elif isinstance(stype, str):
+        errors.append(f"{path}.type: expected one of {', '.join(SCREEN_TYPES)}, got {stype!r}")
+
+
+def validate_section_test_question(question, path, errors):
+    """Check one section test question object; appends to errors."""
+    if not check_fields(question, path, SECTION_TEST_QUESTION_FIELDS, errors):
+        return
+    level = question.get('difficultyLevel')
+    if isinstance(level, str) and level not in DIFFICULTY_LEVELS:
+        errors.append(f"{path}.difficultyLevel: expected one of {', '.join(DIFFICULTY_LEVELS)}, got {level!r}")
+    validate_question_content(question.get('content'), f"{path}.content", errors)
+
+
+def validate_course(data, path='$'):
+    """All problems in a course document (JSON_SPEC.md Part 1), as a list."""
+    errors = []
+    if not check_fields(data, path, COURSE_FIELDS, errors):
+        return errors
+    screens = _check_items(data.get('screens'), f"{path}.screens", 1, None, errors)
+    for i, screen in enumerate(screens):
+        validate_screen(screen, f"{path}.screens[{i}]", errors)
+    _check_ids_and_order(screens, f"{path}.screens", errors)
+    return errors
+
+
+def validate_section_test(data, path='$'):
+    """All problems in a section test document (JSON_SPEC.md Part 2), as a list."""
+    errors = []
+    if not check_fields(data, path, SECTION_TEST_FIELDS, errors):
+        return errors
+    questions = _check_items(data.get('questions'), f"{path}.questions", 1, None, errors)
+    for i, question in enumerate(questions):
+        validate_section_test_question(question, f"{path}.questions[{i}]", errors)
+    _check_ids_and_order(questions, f"{path}.questions", errors)
+    return errors
+
+
+def validate_assessment(data, path='$', section_slugs=None):
+    """
+    All problems in an initial assessment document (5-onboarding/spec.md).
+    Pass section_slugs (e.g. ContentIndex.section_ids) to also check that
+    every sectionSlug exists in the Learning Service.
+    """
+    errors = []
+    if not check_fields(data, path, ASSESSMENT_FIELDS, errors):
+        return errors
+    questions = _check_items(data.get('questions'), f"{path}.questions", 1, None, errors)
+    for i, question in enumerate(questions):
+        q_path = f"{path}.questions[{i}]"
+        if not check_fields(question, q_path, ASSESSMENT_QUESTION_FIELDS, errors):
+            continue
+        _check_non_empty(question, 'questionText', q_path, errors)
+
+        qtype = question.get('questionType')
+        if isinstance(qtype, str) and qtype not in ASSESSMENT_QUESTION_TYPES:
+            errors.append(f"{q_path}.questionType: expected one of "
+                          f"{', '.join(ASSESSMENT_QUESTION_TYPES)}, got {qtype!r}")
+        slug = question.get('sectionSlug')
+        if section_slugs is not None and isinstance(slug, str) and slug not in section_slugs:
+            errors.append(f"{q_path}.sectionSlug: unknown section '{slug}'")
+
+        max_options = 2 if qtype == 'true_false' else 6
+        min_options = 2
+        options = _check_items(question.get('options'), f"{q_path}.options",
+                               min_options, max_options, errors)
+        for j, opt in enumerate(options):
+            check_fields(opt, f"{q_path}.options[{j}]", ASSESSMENT_OPTION_FIELDS, errors)
+        _check_ids_and_order(options, f"{q_path}.options", errors)
+
+        correct = sum(1 for opt in options if isinstance(opt, dict) and opt.get('isCorrect') is True)
+        if options and correct != 1:
+            errors.append(f"{q_path}.options: exactly 1 option must have isCorrect: true, got {correct}")
+        if qtype == 'true_false' and len(options) == 2:
+            texts = sorted(str(opt.get('text', '')) for opt in options if isinstance(opt, dict))
+            if texts != ['False', 'True']:
+                errors.append(f"{q_path}.options: true_false option texts must be \"True\" and \"False\"")
+    _check_ids_and_order(questions, f"{path}.questions", errors)
+    return errors
+
+
+VALIDATORS = {
+    'course':       validate_course,
+    'section_test': validate_section_test,
+    'assessment':   validate_assessment,
+}
+
+
+# ---------------------------------------------------------------------------
+# Files & batches
+# ---------------------------------------------------------------------------
+
+def validate_file(path, kind='course'):
+    """
+    Parse and validate one file. Returns (data, errors); data is None when
+    the file could not be read or parsed. Never raises for bad input.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None, ["$: file not found"]
+    except UnicodeDecodeError as e:
+        return None, [f"$: not valid UTF-8 ({e.reason} at byte {e.start})"]
+    except json.JSONDecodeError as e:
+        return None, [f"$: invalid JSON — {e.msg} (line {e.lineno}, column {e.colno})"]
+    except OSError as e:
+        return None, [f"$: cannot read file ({e.strerror})"]
+    return data, VALIDATORS[kind](data)
+
+
+@lru_cache(maxsize=256)
+def _load_validated(path, kind, _mtime):
+    return validate_file(path, kind)
+
+
+def load_validated(path, kind='course'):
+    """
+    Cached validate_file() for generators: each file is parsed and checked
+    once per process until its mtime changes. Treat the returned data as
+    read-only — it is shared between callers.
+    """
+    path = str(Path(path).resolve())
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return validate_file(path, kind)
+    return _load_validated(path, kind, mtime)
+
+
+def _validate_job(args):
+    path, kind = args
+    return path, validate_file(path, kind)[1]
+
+
+def iter_json_files(paths):
+    """Expand files and directories (recursively) into sorted .json paths."""
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from sorted(str(p) for p in path.rglob('*.json'))
+        else:
+            yield str(path)
+
+
+def validate_paths(paths, kind='course', workers=None):
+    """
+    Validate every JSON file under paths. Returns { path: [errors] } for the
+    files that have problems; an empty dict means the whole batch is valid.
+    Large batches are spread over a process pool.
+    """
+    files = list(iter_json_files(paths))
+    jobs = [(path, kind) for path in files]
+    if len(files) < PARALLEL_MIN_FILES or workers == 1:
+        results = map(_validate_job, jobs)
+        return {path: errors for path, errors in results if errors}
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_validate_job, jobs, chunksize=chunksize)
+        return {path: errors for path, errors in results if errors}
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    args = sys.argv[1:]
+    kind = 'course'
+    if '--kind' in args:
+        i = args.index('--kind')
+        kind = args[i + 1] if i + 1 < len(args) else None
+        del args[i:i + 2]
+    if kind not in VALIDATORS:
+        print(f"Error: --kind must be one of {', '.join(VALIDATORS)}")
+        sys.exit(1)
+    if not args and kind != 'course':
+        print(f"Error: no {kind} files given — pass files or directories to validate")
+        sys.exit(1)
+    paths = args or DEFAULT_COURSE_DIRS
+    files = list(iter_json_files(paths))
+
+    print(f"Validating {len(files)} {kind} files...")
+    failures = validate_paths(files, kind)
+
+    for path, errors in failures.items():
+        print(f"✗ {path}")
+        for error in errors:
+            print(f"    {error}")
+
+    total = sum(len(errors) for errors in failures.values())
+    print(f"  - Files checked:  {len(files)}")
+    print(f"  - Files invalid:  {len(failures)}")
+    print(f"  - Errors:         {total}")
+    if failures:
+        sys.exit(1)
+    print("✓ All files valid")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Course Compression
+Shared-dictionary storage for the course corpus in content_files/courses.
+
+Generated courses are near-identical: the same JSON skeleton, the same quiz
+phrasing, the same explanations. Per-file gzip cannot exploit that — every
+file starts from an empty window. Here a zlib preset dictionary (zdict) is
+trained once over the corpus, and each course is deflated against it, so a
+file only pays for what is actually unique to it.
+
+zlib treats the dictionary as already-seen history, and for documents this
+alike the best history is a handful of real documents: the dictionary is the
+tail (zlib's 32 KB window) of a concatenation of sample courses.
+
+Export layout (out_dir):
+  dictionary.zdict     the trained dictionary
+  <slug>.json.zd       raw deflate of the course file, against the dictionary
+  index.json           dictionary id + per-course sizes
+
+The export's dictionary has seen the files it compresses, so its ratio is
+optimistic. Each course is also compressed against a dictionary trained
+without it (heldOutBytes) — the size a new course would get.
+
+Usage:
+    python course_compression.py [course_dir] [out_dir]
+
+Readers need the same dictionary to inflate; index.json records its id
+(sha256 prefix) so a stale dictionary is detected instead of producing
+garbage.
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import sys
+import zlib
+from functools import lru_cache
+from pathlib import Path
+
+
+MOCKUP_DIR      = Path(__file__).resolve().parent
+DEFAULT_COURSES = MOCKUP_DIR / 'content_files' / 'courses'
+DEFAULT_EXPORT  = MOCKUP_DIR / 'generated' / 'course_zdict'
+
+DICTIONARY_SIZE  = 32 * 1024    # deflate window — bytes beyond this are never referenced
+MAX_SAMPLES      = 64
+LEVEL            = 9
+DICTIONARY_FILE  = 'dictionary.zdict'
+INDEX_FILE       = 'index.json'
+COMPRESSED_SUFFIX = '.json.zd'
+
+
+# ---------------------------------------------------------------------------
+# Dictionary
+# ---------------------------------------------------------------------------
+
+def train_dictionary(samples, size=DICTIONARY_SIZE, max_samples=MAX_SAMPLES, seed=0):
+    """
+    Build a preset dictionary from sample documents (bytes). A seeded sample
+    of at most max_samples documents is concatenated and the last `size`
+    bytes kept — deterministic for the same corpus.
+    """
+    samples = list(samples)
+    if len(samples) > max_samples:
+        samples = random.Random(seed).sample(samples, max_samples)
+    return b''.join(samples)[-size:]
+
+
+class SharedDictionary:
+    """Compress / decompress documents against one preset dictionary."""
+
+    def __init__(self, data):
+        self.data = bytes(data)
+        self.id   = hashlib.sha256(self.data).hexdigest()[:16]
+
+    def compress(self, payload, level=LEVEL):
+        c = zlib.compressobj(level, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, self.data)
+        return c.compress(payload) + c.flush()
+
+    def decompress(self, blob):
+        d = zlib.decompressobj(-15, zdict=self.data)
+        return d.decompress(blob) + d.flush()
+
+
+# ---------------------------------------------------------------------------
+# Export & load
+# ---------------------------------------------------------------------------
+
+def export_corpus(course_dir=DEFAULT_COURSES, out_dir=DEFAULT_EXPORT, size=DICTIONARY_SIZE):
+    """
+    Train a dictionary over course_dir and write the compressed corpus to
+    out_dir. Returns the index dict that is also written to index.json.
+    Raises ValueError if course_dir has no course files.
+    """
+    paths = sorted(Path(course_dir).glob('*.json'))
+    if not paths:
+        raise ValueError(f"no course files (*.json) in {course_dir}")
+    payloads = [path.read_bytes() for path in paths]
+    shared = SharedDictionary(train_dictionary(payloads, size))
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / DICTIONARY_FILE).write_bytes(shared.data)
+
+    courses = {}
+    for i, (path, payload) in enumerate(zip(paths, payloads)):
+        blob = shared.compress(payload)
+        held_out = SharedDictionary(train_dictionary(payloads[:i] + payloads[i + 1:], size))
+        name = path.stem + COMPRESSED_SUFFIX
+        (out_dir / name).write_bytes(blob)
+        courses[path.stem] = {
+            'file':            name,
+            'bytes':           len(payload),
+            'compressedBytes': len(blob),
+            'gzipBytes':       len(gzip.compress(payload, LEVEL)),
+            'heldOutBytes':    len(held_out.compress(payload)),
+        }
+
+    index = {
+        'dictionaryId':    shared.id,
+        'dictionaryFile':  DICTIONARY_FILE,
+        'dictionaryBytes': len(shared.data),
+        'courses':         courses,
+    }
+    with open(out_dir / INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+@lru_cache(maxsize=8)
+def _load_export(out_dir):
+    out_dir = Path(out_dir)
+    with open(out_dir / INDEX_FILE, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    shared = SharedDictionary((out_dir / index['dictionaryFile']).read_bytes())
+    if shared.id != index['dictionaryId']:
+        raise ValueError(f"{out_dir}: dictionary does not match index.json "
+                         f"({shared.id} != {index['dictionaryId']})")
+    return index, shared
+
+
+def load_course_bytes(slug, out_dir=DEFAULT_EXPORT):
+    """Original course file bytes for slug, inflated from an export directory."""
+    index, shared = _load_export(str(Path(out_dir).resolve()))
+    entry = index['courses'][slug]
+    return shared.decompress((Path(out_dir) / entry['file']).read_bytes())
+
+
+def load_course(slug, out_dir=DEFAULT_EXPORT):
+    """Parsed course JSON for slug, from an export directory."""
+    return json.loads(load_course_bytes(slug, out_dir))
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    args = sys.argv[1:]
+    options = [a for a in args if a.startswith('-')]
+    if options or len(args) > 2:
+        print(f"Error: unexpected argument {(options or args[2:])[0]!r}")
+        print("Usage: python course_compression.py [course_dir] [out_dir]")
+        sys.exit(1)
+    course_dir = Path(args[0]) if len(args) > 0 else DEFAULT_COURSES
+    out_dir    = Path(args[1]) if len(args) > 1 else DEFAULT_EXPORT
+    if not course_dir.is_dir():
+        print(f"Error: Course directory not found: {course_dir}")
+        sys.exit(1)
+
+    print(f"Compressing courses from: {course_dir}")
+    try:
+        index = export_corpus(course_dir, out_dir)
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+    courses = index['courses'].values()
+
+    raw    = sum(c['bytes'] for c in courses)
+    gz     = sum(c['gzipBytes'] for c in courses)
+    packed = sum(c['compressedBytes'] for c in courses)
+    held   = sum(c['heldOutBytes'] for c in courses)
+    print(f"  - Courses:          {len(index['courses'])}")
+    print(f"  - Dictionary:       {index['dictionaryBytes']:,} bytes (id {index['dictionaryId']})")
+    print(f"  - Raw JSON:         {raw:,} bytes")
+    print(f"  - Per-file gzip:    {gz:,} bytes")
+    print(f"  - With dictionary:  {packed:,} bytes "
+          f"(+ {index['dictionaryBytes']:,} once, {gz / max(packed, 1):.1f}x smaller than gzip"
+          f" — dictionary trained on these files)")
+    print(f"  - Held out:         {held:,} bytes "
+          f"({gz / max(held, 1):.1f}x smaller than gzip — each course against a dictionary trained without it)")
+
+    for slug in index['courses']:
+        if load_course_bytes(slug, out_dir) != (course_dir / f"{slug}.json").read_bytes():
+            print(f"Error: {slug} does not round-trip")
+            sys.exit(1)
+
+    print(f"✓ Successfully generated {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
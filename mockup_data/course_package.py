@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Course Package
+Packs every course JSON in content_files/courses into one binary archive with
+an offset index, so a content service can hand out a single screen without
+reading or parsing the whole course file.
+
+File layout (all integers little-endian):
+
+  header   MCPK | u16 format | u16 reserved | u32 courses | u32 screens
+           | u32 keys | u64 index offset | u64 index length          (36 bytes)
+  data     one encoded value per screen, back to back; after a course's
+           screens, its top-level fields ("screens" → null, in place)
+  index    key table    keys × (varint len, utf-8)
+           course table courses × (slug, u32 first screen, u32 count,
+                                   u64 fields offset, u32 fields length)
+           screen table screens × (u64 offset, u32 length, screen id)
+           — strings are varint length + utf-8, course table sorted by slug
+
+Values use a small tagged encoding (see _encode): dict keys are stored once
+in the key table and referenced by number, ints are zigzag varints, strings
+are length-prefixed utf-8. CoursePackage maps the file with mmap; looking up
+a screen is a dict access into the index plus decoding that screen's bytes.
+
+Usage:
+    with CoursePackage(DEFAULT_PACKAGE) as pkg:
+        screen = pkg.screen('recognizing-choking-in-adults', 'screen-002')
+"""
+
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+
+MOCKUP_DIR      = Path(__file__).resolve().parent
+DEFAULT_COURSES = MOCKUP_DIR / 'content_files' / 'courses'
+DEFAULT_PACKAGE = MOCKUP_DIR / 'generated' / 'courses.mcpk'
+
+MAGIC          = b'MCPK'
+FORMAT_VERSION = 2
+HEADER         = struct.Struct('<4sHHIIIQQ')
+SCREEN_ENTRY   = struct.Struct('<QI')
+COURSE_ENTRY   = struct.Struct('<IIQI')
+
+T_NULL, T_FALSE, T_TRUE, T_INT, T_FLOAT, T_STR, T_LIST, T_DICT = range(8)
+
+_F64 = struct.Struct('<d')
+
+
+# ---------------------------------------------------------------------------
+# Value encoding
+# ---------------------------------------------------------------------------
+
+def _put_varint(out, n):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf, pos):
+    shift = result = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _put_str(out, text):
+    data = text.encode('utf-8')
+    _put_varint(out, len(data))
+    out += data
+
+
+def _get_str(buf, pos):
+    n, pos = _get_varint(buf, pos)
+    return str(buf[pos:pos + n], 'utf-8'), pos + n
+
+
+def _encode(value, out, keys):
+    """Append the encoding of a JSON value to out; keys maps dict key → key id."""
+    if value is None:
+        out.append(T_NULL)
+    elif value is True:
+        out.append(T_TRUE)
+    elif value is False:
+        out.append(T_FALSE)
+    elif isinstance(value, int):
+        out.append(T_INT)
+        _put_varint(out, value << 1 if value >= 0 else ((-value) << 1) - 1)
+    elif isinstance(value, float):
+        out.append(T_FLOAT)
+        out += _F64.pack(value)
+    elif isinstance(value, str):
+        out.append(T_STR)
+        _put_str(out, value)
+    elif isinstance(value, list):
+        out.append(T_LIST)
+        _put_varint(out, len(value))
+        for item in value:
+            _encode(item, out, keys)
+    elif isinstance(value, dict):
+        out.append(T_DICT)
+        _put_varint(out, len(value))
+        for key, item in value.items():
+            _put_varint(out, keys.setdefault(key, len(keys)))
+            _encode(item, out, keys)
+    else:
+        raise TypeError(f"cannot encode {type(value).__name__}")
+
+
+def _decode(buf, pos, keys):
+    """Decode one value from buf at pos; returns (value, next pos)."""
+    tag = buf[pos]
+    pos += 1
+    if tag == T_STR:
+        return _get_str(buf, pos)
+    if tag == T_DICT:
+        n, pos = _get_varint(buf, pos)
+        obj = {}
+        for _ in range(n):
+            key_id, pos = _get_varint(buf, pos)
+            obj[keys[key_id]], pos = _decode(buf, pos, keys)
+        return obj, pos
+    if tag == T_LIST:
+        n, pos = _get_varint(buf, pos)
+        items = []
+        for _ in range(n):
+            item, pos = _decode(buf, pos, keys)
+            items.append(item)
+        return items, pos
+    if tag == T_INT:
+        z, pos = _get_varint(buf, pos)
+        return (z >> 1) ^ -(z & 1), pos
+    if tag == T_TRUE:
+        return True, pos
+    if tag == T_FALSE:
+        return False, pos
+    if tag == T_NULL:
+        return None, pos
+    if tag == T_FLOAT:
+        return _F64.unpack_from(buf, pos)[0], pos + 8
+    raise ValueError(f"corrupt package: unknown tag {tag} at offset {pos - 1}")
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+def build_package(course_dir=DEFAULT_COURSES, output_path=DEFAULT_PACKAGE):
+    """
+    Pack every *.json course under course_dir (slug = file stem) into
+    output_path. Returns {'courses', 'screens', 'sourceBytes', 'packageBytes'}.
+    """
+    paths = sorted(Path(course_dir).glob('*.json'))
+    keys = {}
+    courses, screen_entries = [], []
+    source_bytes = 0
+
+    with open(output_path, 'wb') as f:
+        f.write(bytes(HEADER.size))
+        offset = HEADER.size
+        for path in paths:
+            source_bytes += path.stat().st_size
+            with open(path, 'r', encoding='utf-8') as src:
+                course = json.load(src)
+            first = len(screen_entries)
+            for screen in course['screens']:
+                out = bytearray()
+                _encode(screen, out, keys)
+                f.write(out)
+                screen_entries.append((offset, len(out), str(screen['id'])))
+                offset += len(out)
+            out = bytearray()
+            _encode({key: None if key == 'screens' else value for key, value in course.items()}, out, keys)
+            f.write(out)
+            courses.append((path.stem, first, len(course['screens']), offset, len(out)))
+            offset += len(out)
+
+        index = bytearray()
+        for key in keys:
+            _put_str(index, key)
+        for slug, *entry in courses:
+            _put_str(index, slug)
+            index += COURSE_ENTRY.pack(*entry)
+        for screen_offset, length, screen_id in screen_entries:
+            index += SCREEN_ENTRY.pack(screen_offset, length)
+            _put_str(index, screen_id)
+
+        f.write(index)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(courses), len(screen_entries),
+                            len(keys), offset, len(index)))
+
+    return {
+        'courses':      len(courses),
+        'screens':      len(screen_entries),
+        'sourceBytes':  source_bytes,
+        'packageBytes': offset + len(index),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+
+class CoursePackage:
+    """
+    Read-only, mmap-backed view of a package file. Only the index is decoded
+    on open; screens are decoded on demand from their byte range.
+    """
+
+    def __init__(self, path=DEFAULT_PACKAGE):
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._load_index()
+
+    def _load_index(self):
+        buf = self._map
+        magic, fmt, _, n_courses, n_screens, n_keys, index_offset, _ = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: not a course package")
+        if fmt != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: unsupported package format {fmt}")
+
+        pos = index_offset
+        self._keys = []
+        for _ in range(n_keys):
+            key, pos = _get_str(buf, pos)
+            self._keys.append(key)
+
+        self._courses = {}                  # slug → (first, count, fields offset, fields length)
+        for _ in range(n_courses):
+            slug, pos = _get_str(buf, pos)
+            self._courses[slug] = COURSE_ENTRY.unpack_from(buf, pos)
+            pos += COURSE_ENTRY.size
+
+        self._spans, self._screen_ids = [], []
+        for _ in range(n_screens):
+            self._spans.append(SCREEN_ENTRY.unpack_from(buf, pos))
+            pos += SCREEN_ENTRY.size
+            screen_id, pos = _get_str(buf, pos)
+            self._screen_ids.append(screen_id)
+
+        self._screen_index = {}             # (slug, screen id) → entry number
+        for slug, (first, count, _, _) in self._courses.items():
+            for entry in range(first, first + count):
+                self._screen_index[(slug, self._screen_ids[entry])] = entry
+
+    # -- lookups ---------------------------------------------------------------
+
+    def __contains__(self, slug):
+        return slug in self._courses
+
+    def courses(self):
+        return list(self._courses)
+
+    def screen_ids(self, slug):
+        first, count, _, _ = self._courses[slug]
+        return self._screen_ids[first:first + count]
+
+    def raw_screen(self, slug, screen_id):
+        """Encoded bytes of one screen, as a zero-copy memoryview into the map."""
+        offset, length = self._spans[self._screen_index[(slug, screen_id)]]
+        return memoryview(self._map)[offset:offset + length]
+
+    def screen(self, slug, screen_id):
+        """Decode one screen. Raises KeyError for an unknown course or screen."""
+        return self._decode_entry(self._screen_index[(slug, screen_id)])
+
+    def screen_at(self, slug, position):
+        """Decode the screen at a 0-based position within the course."""
+        first, count, _, _ = self._courses[slug]
+        if not 0 <= position < count:
+            raise IndexError(position)
+        return self._decode_entry(first + position)
+
+    def course(self, slug):
+        """The whole course document, as it was in the source JSON."""
+        first, count, offset, _ = self._courses[slug]
+        course = _decode(self._map, offset, self._keys)[0]
+        course['screens'] = [self._decode_entry(entry) for entry in range(first, first + count)]
+        return course
+
+    def _decode_entry(self, entry):
+        offset, _ = self._spans[entry]
+        return _decode(self._map, offset, self._keys)[0]
+
+    # -- lifecycle -------------------------------------------------------------
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    course_dir  = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COURSES
+    output_path = Path(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PACKAGE
+
+    print(f"Packing courses from: {course_dir}")
+    stats = build_package(course_dir, output_path)
+    print(f"  - Courses:       {stats['courses']}")
+    print(f"  - Screens:       {stats['screens']}")
+    print(f"  - Source JSON:   {stats['sourceBytes']:,} bytes")
+    print(f"  - Package:       {stats['packageBytes']:,} bytes")
+
+    with CoursePackage(output_path) as pkg:
+        mismatched = [
+            path.stem for path in sorted(Path(course_dir).glob('*.json'))
+            if pkg.course(path.stem) != json.loads(path.read_text(encoding='utf-8'))
+        ]
+    if mismatched:
+        print(f"Error: package does not round-trip for: {', '.join(mismatched)}")
+        sys.exit(1)
+
+    print(f"✓ Successfully generated {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Mockup Generation
+Regenerates generated/mockup_data.json, generated/manifest.json and the
+content inserts of pipeline.sql from content_layout.json.
+
+Ids are UUIDv5 (URL namespace) over a stable name, upper-cased:
+  theme    medicalogy:theme:<theme slug>
+  section  medicalogy:section:<theme slug>:<section slug>
+  course   medicalogy:course:<section slug>:<course slug>
+  article  medicalogy:article:<infographic slug>
+so regenerating never changes the id of an existing entity.
+
+Generation is incremental. Every layout node gets a subtree hash (its own
+fields, its position, and its children's hashes), and the rendered output of
+each node — mockup_data dict, SQL rows, and per theme the serialized JSON
+and SQL text — is kept in generated/generation_state/. On the next run only
+nodes whose hash changed are rendered again; an unchanged theme is copied
+into the outputs from its two text parts without being parsed. When nothing
+changed, no output is rewritten.
+
+pipeline.sql is spliced, not rebuilt: only the theme / section / article /
+course inserts (between the auth inserts and "-- LEARNING PROGRESS INSERTS")
+come from the layout. The schema and the user/progress/social fixture rows
+around them are kept as they are.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import textwrap
+import uuid
+from pathlib import Path
+
+
+MOCKUP_DIR          = Path(__file__).resolve().parent
+DEFAULT_LAYOUT      = MOCKUP_DIR / 'content_layout.json'
+DEFAULT_MOCKUP_DATA = MOCKUP_DIR / 'generated' / 'mockup_data.json'
+DEFAULT_MANIFEST    = MOCKUP_DIR / 'generated' / 'manifest.json'
+DEFAULT_SQL         = MOCKUP_DIR / 'pipeline.sql'
+DEFAULT_STATE       = MOCKUP_DIR / 'generated' / 'generation_state'
+
+STATE_VERSION        = 1
+STATE_INDEX          = 'index.json'
+CONTENT_STORAGE_MODE = 'file_name_reference'
+CONTENT_FOLDERS = {
+    'articles': 'content_files/articles',
+    'courses':  'content_files/courses',
+    'media':    'medicalogy medias',
+}
+
+# Hand-authored content; every other course / article is template-generated
+FULL_FLEDGED_COURSES  = ('recognizing-choking-in-adults', 'suicide-risk-rapid-screen')
+FULL_FLEDGED_ARTICLES = ('airway-emergencies-recognition', 'mood-disorders-recognition-and-care')
+
+SQL_CONTENT_START = 'INSERT INTO theme '
+SQL_CONTENT_END   = '-- LEARNING PROGRESS INSERTS'
+
+
+def stable_id(kind, *names):
+    """Deterministic upper-case UUIDv5 for medicalogy:<kind>:<name>[:<name>...]."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, ':'.join(('medicalogy', kind) + names))).upper()
+
+
+ADMIN_USER_ID = stable_id('user', 'admin')
+
+
+def _digest(value):
+    text = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def _depth(slug, full_fledged):
+    return 'full-fledged' if slug in full_fledged else 'standard'
+
+
+# ---------------------------------------------------------------------------
+# SQL rows
+# ---------------------------------------------------------------------------
+
+def sql_value(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "N'" + str(value).replace("'", "''") + "'"
+
+
+def sql_id(value):
+    return 'NULL' if value is None else f"'{value}'"
+
+
+def _insert(table, columns, values):
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(values)});"
+
+
+# ---------------------------------------------------------------------------
+# Node rendering — each returns (mockup_data node without children, SQL rows)
+# ---------------------------------------------------------------------------
+
+def render_course(course, order, section_id, section_slug):
+    slug = course['slug']
+    node = {
+        'id':                       stable_id('course', section_slug, slug),
+        'name':                     course['name'],
+        'slug':                     slug,
+        'description':              course.get('description'),
+        'difficultyLevel':          course.get('difficulty_level', 'beginner'),
+        'orderIndex':               order,
+        'estimatedDurationMinutes': course.get('estimated_duration_minutes', 7),
+        'contentFile':              f"{slug}.json",
+        'contentDepth':             _depth(slug, FULL_FLEDGED_COURSES),
+    }
+    row = _insert('course', (
+        'id', 'section_id', 'name', 'description', 'slug', 'order_index',
+        'estimated_duration_minutes', 'difficulty_level', 'is_active', 'content_file_name',
+    ), (
+        sql_id(node['id']), sql_id(section_id), sql_value(node['name']),
+        sql_value(node['description']), sql_value(slug), sql_value(order),
+        sql_value(node['estimatedDurationMinutes']), sql_value(node['difficultyLevel']),
+        '1', sql_value(node['contentFile']),
+    ))
+    return node, [row]
+
+
+def render_section(section, order, theme_slug, theme_id):
+    slug = section['slug']
+    node = {
+        'id':                       stable_id('section', theme_slug, slug),
+        'name':                     section['name'],
+        'slug':                     slug,
+        'orderIndex':               order,
+        'estimatedDurationMinutes': section.get('estimated_duration_minutes'),
+    }
+    rows = [_insert('section', (
+        'id', 'theme_id', 'name', 'slug', 'order_index', 'estimated_duration_minutes',
+    ), (
+        sql_id(node['id']), sql_id(theme_id), sql_value(node['name']), sql_value(slug),
+        sql_value(order), sql_value(node['estimatedDurationMinutes']),
+    ))]
+
+    infographic = section.get('infographic')
+    if infographic:
+        article_slug = infographic['slug']
+        node['infographic'] = {
+            'id':           stable_id('article', article_slug),
+            'title':        infographic['title'],
+            'slug':         article_slug,
+            'contentFile':  f"{article_slug}.md",
+            'contentDepth': _depth(article_slug, FULL_FLEDGED_ARTICLES),
+        }
+        rows.append(_insert('article', (
+            'id', 'theme_id', 'name', 'slug', 'content_markdown', 'author_admin_id',
+            'is_published', 'published_at',
+        ), (
+            sql_id(node['infographic']['id']), sql_id(theme_id),
+            sql_value(infographic['title']), sql_value(article_slug),
+            sql_value(node['infographic']['contentFile']), sql_id(ADMIN_USER_ID), '1', 'GETDATE()',
+        )))
+    return node, rows
+
+
+def render_theme(theme, order):
+    node = {
+        'id':          stable_id('theme', theme['slug']),
+        'name':        theme['name'],
+        'slug':        theme['slug'],
+        'description': theme.get('description'),
+        'orderIndex':  order,
+    }
+    row = _insert('theme', (
+        'id', 'name', 'slug', 'description', 'icon_file_name', 'color_code', 'order_index',
+    ), (
+        sql_id(node['id']), sql_value(node['name']), sql_value(node['slug']),
+        sql_value(node['description']), sql_value(theme.get('icon_file_name')),
+        sql_value(theme.get('color_code')), sql_value(order),
+    ))
+    return node, [row]
+
+
+def _own_fields(layout_node, children_key):
+    return {k: v for k, v in layout_node.items() if k != children_key}
+
+
+# ---------------------------------------------------------------------------
+# Incremental build
+# ---------------------------------------------------------------------------
+
+class Generator:
+    """
+    Renders the layout tree, reusing the previous run's output for every
+    subtree whose hash is unchanged. stats counts rendered vs reused nodes.
+
+    State lives in state_dir:
+      index.json          { theme slug: {'layoutHash', 'summary'} } in order
+      <theme>.cache.json  per-section / per-course hashes and rendered output,
+                          read only when that theme has to be rendered again
+      <theme>.json.part   the theme's text in mockup_data.json
+      <theme>.sql.part    the theme's insert block in pipeline.sql
+    """
+
+    def __init__(self, state_dir=DEFAULT_STATE, full=False):
+        self.state_dir = Path(state_dir)
+        index = {} if full else _read_json(self.state_dir / STATE_INDEX)
+        if index.get('version') != STATE_VERSION:
+            index = {}
+        self.previous = index.get('themes', {})
+        self.previous_head = index.get('head')
+        self.rendered_themes = []
+        self.stats = {level: {'rendered': 0, 'reused': 0} for level in ('themes', 'sections', 'courses')}
+
+    def _count(self, level, key, n=1):
+        self.stats[level][key] += n
+
+    def part_path(self, slug, kind):
+        return self.state_dir / f"{slug}.{kind}.part"
+
+    def build_course(self, course, order, section_id, section_slug, cached):
+        digest = _digest(['course', order, section_id, section_slug, course,
+                          course['slug'] in FULL_FLEDGED_COURSES])
+        if cached and cached['hash'] == digest:
+            self._count('courses', 'reused')
+            return cached
+        self._count('courses', 'rendered')
+        node, rows = render_course(course, order, section_id, section_slug)
+        return {'hash': digest, 'node': node, 'sql': rows}
+
+    def build_section(self, section, order, theme_slug, theme_id, cached):
+        own = _own_fields(section, 'courses')
+        section_id = stable_id('section', theme_slug, section['slug'])
+        previous_courses = (cached or {}).get('courses', {})
+        courses = {
+            course['slug']: self.build_course(course, n, section_id, section['slug'],
+                                              previous_courses.get(course['slug']))
+            for n, course in enumerate(section.get('courses', []), start=1)
+        }
+        digest = _digest(['section', order, theme_slug, own,
+                          own.get('infographic', {}).get('slug') in FULL_FLEDGED_ARTICLES,
+                          [c['hash'] for c in courses.values()]])
+        if cached and cached['hash'] == digest:
+            self._count('sections', 'reused')
+            return cached
+        self._count('sections', 'rendered')
+        node, rows = render_section(section, order, theme_slug, theme_id)
+        return {'hash': digest, 'node': node, 'sql': rows, 'courses': courses}
+
+    def build_theme(self, theme, order):
+        slug = theme['slug']
+        entry = self.previous.get(slug)
+        # Cheap check first: when the layout subtree hashes the same, the
+        # theme's parts are reused as they are — no per-section work at all.
+        layout_digest = _digest(['theme', order, theme, FULL_FLEDGED_COURSES, FULL_FLEDGED_ARTICLES])
+        if (entry and entry['layoutHash'] == layout_digest
+                and self.part_path(slug, 'json').exists() and self.part_path(slug, 'sql').exists()):
+            self._count('themes', 'reused')
+            self._count('sections', 'reused', entry['summary']['sections'])
+            self._count('courses', 'reused', entry['summary']['courses'])
+            return entry
+
+        self._count('themes', 'rendered')
+        self.rendered_themes.append(slug)
+        cache_path = self.state_dir / f"{slug}.cache.json"
+        previous_sections = _read_json(cache_path).get('sections', {}) if entry else {}
+
+        node, rows = render_theme(theme, order)
+        sections = {
+            section['slug']: self.build_section(section, n, slug, node['id'],
+                                                previous_sections.get(section['slug']))
+            for n, section in enumerate(theme.get('sections', []), start=1)
+        }
+
+        node['sections'] = []
+        for section in sections.values():
+            node['sections'].append({**section['node'],
+                                     'courses': [c['node'] for c in section['courses'].values()]})
+            rows.extend(section['sql'])
+            rows.extend(r for c in section['courses'].values() for r in c['sql'])
+
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.part_path(slug, 'json').write_text(
+            textwrap.indent(json.dumps(node, ensure_ascii=False, indent=2), '    '), encoding='utf-8')
+        self.part_path(slug, 'sql').write_text('\n'.join(rows) + '\n', encoding='utf-8')
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'sections': sections}, f, ensure_ascii=False, separators=(',', ':'))
+        return {'layoutHash': layout_digest, 'summary': _theme_summary(node)}
+
+    def build(self, layout):
+        themes = {theme['slug']: self.build_theme(theme, n)
+                  for n, theme in enumerate(layout.get('themes', []), start=1)}
+        for slug in set(self.previous) - set(themes):
+            for name in (f"{slug}.cache.json", f"{slug}.json.part", f"{slug}.sql.part"):
+                (self.state_dir / name).unlink(missing_ok=True)
+        return themes
+
+    def write_index(self, themes, head):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.state_dir / STATE_INDEX, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, 'head': head, 'themes': themes}, f,
+                      ensure_ascii=False, indent=2)
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _theme_summary(theme_node):
+    """Counts and full-fledged slugs of one theme, for manifest.json."""
+    sections = theme_node['sections']
+    courses = [c for s in sections for c in s['courses']]
+    articles = [s['infographic'] for s in sections if 'infographic' in s]
+    return {
+        'sections':           len(sections),
+        'courses':            len(courses),
+        'articles':           len(articles),
+        'fullFledgedCourses':  [c['slug'] for c in courses if c['contentDepth'] == 'full-fledged'],
+        'fullFledgedArticles': [a['slug'] for a in articles if a['contentDepth'] == 'full-fledged'],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Output assembly
+# ---------------------------------------------------------------------------
+
+def document_head(layout):
+    return {
+        'version':            layout.get('version', '1.0'),
+        'language':           layout.get('language', 'en'),
+        'contentStorageMode': CONTENT_STORAGE_MODE,
+    }
+
+
+def write_mockup_data(path, head, generator, slugs):
+    """
+    Write mockup_data.json from the per-theme parts — the same text as
+    json.dumps(document, indent=2), without holding the document in memory.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write(json.dumps(head, ensure_ascii=False, indent=2)[:-2])
+        if not slugs:
+            out.write(',\n  "themes": []\n}')
+            return
+        out.write(',\n  "themes": [\n')
+        for n, slug in enumerate(slugs):
+            if n:
+                out.write(',\n')
+            out.write(generator.part_path(slug, 'json').read_text(encoding='utf-8'))
+        out.write('\n  ]\n}')
+
+
+def manifest_text(themes, mockup_data_path=DEFAULT_MOCKUP_DATA, sql_path=DEFAULT_SQL):
+    summaries = [theme['summary'] for theme in themes.values()]
+    articles = [slug for s in summaries for slug in s['fullFledgedArticles']]
+    courses  = [slug for s in summaries for slug in s['fullFledgedCourses']]
+    manifest = {
+        'themeCount':               len(summaries),
+        'sectionCount':             sum(s['sections'] for s in summaries),
+        'courseCount':              sum(s['courses'] for s in summaries),
+        'articleCount':             sum(s['articles'] for s in summaries),
+        'fullFledgedArticleCount':  len(articles),
+        'fullFledgedCourseCount':   len(courses),
+        'fullFledgedArticleSlugs':  articles,
+        'fullFledgedCourseSlugs':   courses,
+        'contentFolders':           CONTENT_FOLDERS,
+        'finalDataFile':            Path(os.path.relpath(mockup_data_path, MOCKUP_DIR)).as_posix(),
+        'sqlFile':                  Path(sql_path).name,
+    }
+    return json.dumps(manifest, ensure_ascii=False, indent=2)
+
+
+def splice_sql(sql_text, generator, slugs):
+    """
+    Replace the content inserts in pipeline.sql with the theme blocks (blank
+    line between themes). Raises ValueError if the content segment markers
+    are missing.
+    """
+    start = sql_text.find(SQL_CONTENT_START)
+    end = sql_text.find(SQL_CONTENT_END)
+    if start < 0 or end < start:
+        raise ValueError(f"content inserts not found (expected '{SQL_CONTENT_START}…' "
+                         f"before '{SQL_CONTENT_END}')")
+    blocks = [generator.part_path(slug, 'sql').read_text(encoding='utf-8') for slug in slugs]
+    return sql_text[:start] + '\n'.join(blocks) + '\n' + sql_text[end:]
+
+
+def _write_if_changed(path, text):
+    path = Path(path)
+    if path.exists() and path.read_text(encoding='utf-8') == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return True
+
+
+def generate(layout_path=DEFAULT_LAYOUT, mockup_data_path=DEFAULT_MOCKUP_DATA,
+             manifest_path=DEFAULT_MANIFEST, sql_path=DEFAULT_SQL,
+             state_dir=DEFAULT_STATE, full=False):
+    """
+    Regenerate every output from the layout. full=True ignores the saved
+    state. Returns {'stats': per-level rendered/reused counts,
+    'written': [paths whose content changed]}.
+    """
+    with open(layout_path, 'r', encoding='utf-8') as f:
+        layout = json.load(f)
+
+    generator = Generator(state_dir, full)
+    previous_order = list(generator.previous)
+    head = document_head(layout)
+    themes = generator.build(layout)
+    slugs = list(themes)
+
+    unchanged = (not generator.rendered_themes and slugs == previous_order
+                 and generator.previous_head == head and Path(mockup_data_path).exists())
+    written = []
+    if not unchanged:
+        write_mockup_data(mockup_data_path, head, generator, slugs)
+        written.append(str(mockup_data_path))
+        sql_text = splice_sql(Path(sql_path).read_text(encoding='utf-8'), generator, slugs)
+        if _write_if_changed(sql_path, sql_text):
+            written.append(str(sql_path))
+    if _write_if_changed(manifest_path, manifest_text(themes, mockup_data_path, sql_path)):
+        written.append(str(manifest_path))
+
+    generator.write_index(themes, head)
+    return {'stats': generator.stats, 'written': written}
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    full = '--full' in sys.argv[1:]
+
+    print(f"Generating mockup data from: {DEFAULT_LAYOUT}")
+    try:
+        result = generate(full=full)
+    except ValueError as exc:
+        print(f"Error: {DEFAULT_SQL.name}: {exc}")
+        sys.exit(1)
+
+    for level, counts in result['stats'].items():
+        print(f"  - {level.capitalize() + ':':<10} {counts['rendered']} rendered, {counts['reused']} reused")
+    if result['written']:
+        for path in result['written']:
+            print(f"✓ Wrote {path}")
+    else:
+        print("✓ All outputs up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Index Advisor
+Benchmarks the per-screen lookups against a synthetic dataset
+(synthetic_data.py) loaded into the SQLite stand-in (sqlite_db.py) and
+proposes a covering-index set, with latencies and query plans measured
+before and after.
+
+Workload (one query per hot access path, as the screen docs describe it):
+  roadmap        user_course by user                 (/api/users/me/themes/:id/progress)
+  bookmark       user_bookmark by user, newest first (/api/bookmarks)
+  notification   notification by user, unread first  (/api/notifications)
+  unread badge   unread notification count by user   (/api/notifications/unread-count)
+  encyclopedia   article_tag by tag                  (/api/articles?tagId=)
+  infographic    approved comments by article        (article discussion)
+
+Each query is declared as an access path (equality columns, sort, selected
+columns). A path whose plan scans the table, sorts in a temp B-tree or
+looks rows up through a non-covering index gets a candidate index: the
+equality columns, then the sort columns, with the remaining selected
+columns as INCLUDE — NVARCHAR(MAX) columns are never included. The
+candidates are written as T-SQL (ready for a schema migration), applied to
+the stand-in through its translator and measured again.
+
+    python index_advisor.py [db path] [--rows N] [--seed S]
+
+--rows (default 100,000) sizes the dataset by its largest per-user table
+(user_article_view); 10^5–10^7 are the intended range. The report goes to
+generated/index_report.json.
+"""
+
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sql_bulk import DEFAULT_SQL, split_pipeline
+from sqlite_db import connect, translate_create_index
+from synthetic_data import SyntheticDataset, config_for_rows, write_sqlite
+
+
+MOCKUP_DIR     = Path(__file__).resolve().parent
+DEFAULT_BENCH  = MOCKUP_DIR / 'generated' / 'benchmark.sqlite3'
+DEFAULT_REPORT = MOCKUP_DIR / 'generated' / 'index_report.json'
+
+DEFAULT_ROWS = 100_000
+DEFAULT_SEED = 42
+PROBES       = 50                       # distinct keys timed per query
+PAGE_SIZE    = 20
+
+# Access paths. 'where' pairs a column with a probe key kind or a constant.
+QUERIES = (
+    {'name': 'roadmap progress', 'table': 'user_course',
+     'where': (('user_id', 'user'),), 'order': (),
+     'select': ('course_id', 'quizzes_correct', 'completed_at'), 'limit': None},
+    {'name': 'bookmark list', 'table': 'user_bookmark',
+     'where': (('user_id', 'user'),), 'order': ('created_at DESC',),
+     'select': ('article_id', 'created_at'), 'limit': PAGE_SIZE},
+    {'name': 'notification popup', 'table': 'notification',
+     'where': (('user_id', 'user'),), 'order': ('is_read', 'created_at DESC'),
+     'select': ('id', 'notification_type', 'reference_type', 'reference_id', 'is_read', 'created_at'),
+     'limit': PAGE_SIZE},
+    {'name': 'unread badge', 'table': 'notification',
+     'where': (('user_id', 'user'), ('is_read', 0)), 'order': (),
+     'select': ('COUNT(*)',), 'limit': None},
+    {'name': 'articles by tag', 'table': 'article_tag',
+     'where': (('tag_id', 'tag'),), 'order': (),
+     'select': ('article_id',), 'limit': PAGE_SIZE},
+    {'name': 'article comments', 'table': 'user_article_comment',
+     'where': (('article_id', 'article'), ('is_approved', 1)), 'order': ('created_at',),
+     'select': ('id', 'user_id', 'parent_comment_id', 'comment_text', 'created_at'), 'limit': PAGE_SIZE},
+)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def probe_keys(dataset, seed=DEFAULT_SEED):
+    """{kind: [keys]} — the user, tag and article ids each query is timed with."""
+    rng = random.Random(f'{seed}:probes')
+    users = dataset.config['users']
+    return {
+        'user':    [dataset.user_id(i) for i in rng.sample(range(users), min(PROBES, users))],
+        'tag':     rng.sample(dataset.tag_ids, min(PROBES, len(dataset.tag_ids))),
+        'article': rng.sample(dataset.article_ids, min(PROBES, len(dataset.article_ids))),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Queries and plans
+# ---------------------------------------------------------------------------
+
+def query_sql(spec):
+    """(SQLite SELECT, probe key kind) for an access path."""
+    where, kind = [], None
+    for column, source in spec['where']:
+        if isinstance(source, str):
+            where.append(f'{column} = ?')
+            kind = source
+        else:
+            where.append(f'{column} = {source}')
+    sql = f"SELECT {', '.join(spec['select'])} FROM {spec['table']} WHERE {' AND '.join(where)}"
+    if spec['order']:
+        sql += f" ORDER BY {', '.join(spec['order'])}"
+    if spec['limit']:
+        sql += f" LIMIT {spec['limit']}"
+    return sql, kind
+
+
+def query_plan(conn, sql):
+    """EXPLAIN QUERY PLAN details, one string per step."""
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', ('',))]
+
+
+def needs_index(plan):
+    """
+    True if a plan scans (including a skip-scan, ANY(...)), sorts, or reads
+    rows through a non-covering index. A primary-key search is clustered.
+    """
+    for step in plan:
+        if step.startswith('SCAN') or 'TEMP B-TREE' in step or 'ANY(' in step:
+            return True
+        if step.startswith('SEARCH') and 'COVERING INDEX' not in step and 'PRIMARY KEY' not in step:
+            return True
+    return False
+
+
+def time_query(conn, sql, keys):
+    """(p50, p95) latency in ms over the probe keys, after one warm-up run."""
+    conn.execute(sql, (keys[0],)).fetchall()
+    samples = []
+    for key in keys:
+        start = time.perf_counter()
+        conn.execute(sql, (key,)).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+# ---------------------------------------------------------------------------
+# Index proposals
+# ---------------------------------------------------------------------------
+
+def max_columns(schema_sql):
+    """{(table, column)} of NVARCHAR(MAX) columns — too wide to INCLUDE."""
+    result = set()
+    for match in re.finditer(r'^CREATE TABLE\s+\[?(\w+)\]?\s*\((.*?)^\);', schema_sql, re.M | re.S):
+        for column in re.findall(r'^\s*(\w+)\s+N?VARCHAR\s*\(\s*MAX\s*\)', match.group(2), re.M | re.I):
+            result.add((match.group(1), column))
+    return result
+
+
+def candidate_index(spec, wide):
+    """{'table', 'key', 'include'} covering an access path: equality, sort, then INCLUDE."""
+    key = [column for column, _ in spec['where']]
+    key += [c for c in spec['order'] if c.split()[0] not in key]
+    names = {c.split()[0] for c in key}
+    include = [c for c in spec['select']
+               if c.isidentifier() and c not in names and (spec['table'], c) not in wide]
+    return {'table': spec['table'], 'key': key, 'include': include}
+
+
+def index_sql(index):
+    """(name, T-SQL CREATE INDEX) for a candidate."""
+    name = f"ix_{index['table']}_{'_'.join(c.split()[0] for c in index['key'])}"
+    sql = f"CREATE NONCLUSTERED INDEX {name} ON {index['table']} ({', '.join(index['key'])})"
+    if index['include']:
+        sql += f" INCLUDE ({', '.join(index['include'])})"
+    return name, sql + ';'
+
+
+def propose_indexes(plans, wide):
+    """
+    {index name: T-SQL} for the access paths whose plan needs an index. A
+    candidate whose key is a prefix of another's on the same table is served
+    by that one: its INCLUDE columns are merged in instead.
+    """
+    candidates = [candidate_index(spec, wide) for spec in QUERIES if needs_index(plans[spec['name']])]
+    chosen = []
+    for index in sorted(candidates, key=lambda c: -len(c['key'])):
+        wider = next((c for c in chosen if c['table'] == index['table']
+                      and c['key'][:len(index['key'])] == index['key']), None)
+        if wider is None:
+            chosen.append(index)
+            continue
+        key_names = {c.split()[0] for c in wider['key']}
+        wider['include'] += [c for c in index['include']
+                             if c not in key_names and c not in wider['include']]
+    order = {id(c): n for n, c in enumerate(candidates)}
+    return dict(index_sql(c) for c in sorted(chosen, key=lambda c: order[id(c)]))
+
+
+def measure(conn, keys):
+    """{query name: {'p50Ms', 'p95Ms', 'plan'}} for every access path."""
+    results = {}
+    for spec in QUERIES:
+        sql, kind = query_sql(spec)
+        p50, p95 = time_query(conn, sql, keys[kind])
+        results[spec['name']] = {'sql': sql, 'p50Ms': round(p50, 3), 'p95Ms': round(p95, 3),
+                                 'plan': query_plan(conn, sql)}
+    return results
+
+
+def run_benchmark(db_path=DEFAULT_BENCH, rows=DEFAULT_ROWS, seed=DEFAULT_SEED, sql_path=DEFAULT_SQL):
+    """Generate, measure, index, measure again. Returns the report dict."""
+    dataset = SyntheticDataset(config_for_rows(rows), seed)
+    start = time.perf_counter()
+    counts = write_sqlite(dataset, db_path, sql_path)
+    load_seconds = time.perf_counter() - start
+    keys = probe_keys(dataset, seed)
+
+    conn = connect(db_path)
+    try:
+        before = measure(conn, keys)
+        schema_sql, _ = split_pipeline(Path(sql_path).read_text(encoding='utf-8'))
+        proposals = propose_indexes({n: r['plan'] for n, r in before.items()}, max_columns(schema_sql))
+
+        start = time.perf_counter()
+        with conn:
+            for sql in proposals.values():
+                conn.execute(translate_create_index(sql))
+        conn.execute('ANALYZE')
+        index_seconds = time.perf_counter() - start
+        after = measure(conn, keys)
+    finally:
+        conn.close()
+
+    return {
+        'rows':         rows,
+        'seed':         seed,
+        'tableRows':    counts,
+        'loadSeconds':  round(load_seconds, 2),
+        'indexSeconds': round(index_seconds, 2),
+        'indexes':      list(proposals.values()),
+        'queries':      {name: {'before': before[name], 'after': after[name]} for name in before},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def _flag_value(args, flag, default):
+    if flag not in args:
+        return default
+    try:
+        return int(args[args.index(flag) + 1].replace('_', ''))
+    except (IndexError, ValueError):
+        print(f"Error: {flag} needs a number")
+        sys.exit(1)
+
+
+def main():
+    args = sys.argv[1:]
+    rows = _flag_value(args, '--rows', DEFAULT_ROWS)
+    seed = _flag_value(args, '--seed', DEFAULT_SEED)
+    positional = [a for a in args if not a.startswith('--') and not a.replace('_', '').isdigit()]
+    db_path = Path(positional[0]) if positional else DEFAULT_BENCH
+
+    print(f"Benchmarking a dataset of ~{rows:,} rows per hot table in: {db_path}")
+    try:
+        report = run_benchmark(db_path, rows, seed)
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+
+    print(f"  - Load:       {sum(report['tableRows'].values()):,} rows in {report['loadSeconds']}s, "
+          f"indexes: {report['indexSeconds']}s")
+    print(f"  {'query':<20} {'before p50/p95 ms':>20} {'after p50/p95 ms':>20}")
+    for name, result in report['queries'].items():
+        before, after = result['before'], result['after']
+        print(f"  {name:<20} {before['p50Ms']:>9.3f} /{before['p95Ms']:>9.3f} "
+              f"{after['p50Ms']:>9.3f} /{after['p95Ms']:>9.3f}")
+        print(f"  {'':<20} before: {' | '.join(before['plan'])}")
+        print(f"  {'':<20} after:  {' | '.join(after['plan'])}")
+    print("  - Proposed indexes:")
+    for sql in report['indexes']:
+        print(f"      {sql}")
+
+    DEFAULT_REPORT.parent.mkdir(parents=True, exist_ok=True)
+    with open(DEFAULT_REPORT, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✓ Successfully generated {DEFAULT_REPORT}")
+
+
+if __name__ == "__main__":
+    main()
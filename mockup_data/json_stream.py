@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Medicalogy JSON Array Stream
+Incremental reader for course / section test documents that are too large to
+json.load() in one go.
+
+The top-level object is read field by field; small fields ("version", "meta",
+...) are decoded normally, and the one big array ("screens" for a course,
+"questions" for a section test or question bank) is yielded element by
+element. Only the current element and one read chunk are held in memory, so
+a renderer can start writing output as soon as the first element is parsed.
+Malformed input fails where it is found, without reading further.
+
+Usage:
+    with open(path, 'r', encoding='utf-8') as f:
+        doc = JsonArrayStream(f)
+        doc.head            # fields before the array, e.g. {'version': '1.1'}
+        for screen in doc:  # elements of doc.array_key, one at a time
+            ...
+        doc.tail            # fields after the array (filled once exhausted)
+"""
+
+import json
+
+
+STREAM_KEYS = ('screens', 'questions')
+CHUNK_SIZE  = 1 << 16
+
+_WHITESPACE      = ' \t\n\r'
+_CUT_MARGIN      = len('false')      # a value or error this near the buffer end may be cut off
+
+
+class JsonArrayStream:
+    """
+    Stream the elements of the first top-level array field named in
+    array_keys. Raises json.JSONDecodeError for malformed input — pos,
+    lineno and colno are document positions, doc the buffered window — and
+    ValueError if the document is not an object.
+    """
+
+    def __init__(self, fp, array_keys=STREAM_KEYS, chunk_size=CHUNK_SIZE):
+        self._fp         = fp
+        self._array_keys = array_keys
+        self._chunk_size = chunk_size
+        self._decoder    = json.JSONDecoder()
+        self._buf        = ''
+        self._pos        = 0
+        self._offset     = 0      # document offset of self._buf[0]
+        self._lines      = 0      # newlines before self._buf[0]
+        self._line_start = 0      # document offset of the line self._buf[0] is on
+        self._eof        = False
+
+        self.head      = {}
+        self.tail      = {}
+        self.array_key = None
+        self.count     = 0
+        self._started  = False
+
+        self._expect('{')
+        self._read_fields(self.head, stop_at_array=True)
+
+    # -- buffer ---------------------------------------------------------------
+
+    def _fill(self):
+        """
+        Read more input; drop the consumed prefix so memory stays flat. Reads
+        at least as much as is still buffered, so a value spanning many
+        chunks is re-scanned a logarithmic number of times, not once a chunk.
+        """
+        if self._eof:
+            return False
+        chunk = self._fp.read(max(self._chunk_size, len(self._buf) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        newline = self._buf.rfind('\n', 0, self._pos)
+        if newline >= 0:
+            self._lines += self._buf.count('\n', 0, self._pos)
+            self._line_start = self._offset + newline + 1
+        self._offset += self._pos
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, msg, pos):
+        """JSONDecodeError for buffer position pos, located in the document."""
+        newline = self._buf.rfind('\n', 0, pos)
+        line_start = self._offset + newline + 1 if newline >= 0 else self._line_start
+        error = json.JSONDecodeError(msg, self._buf, pos)
+        error.pos = self._offset + pos
+        error.lineno = self._lines + self._buf.count('\n', 0, pos) + 1
+        error.colno = error.pos - line_start + 1
+        error.args = (f'{msg}: line {error.lineno} column {error.colno} (char {error.pos})',)
+        return error
+
+    def _peek(self):
+        """Next non-whitespace character (not consumed), or '' at end of input."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            if self._offset == 0 and self._pos == 0 and char == '{':
+                raise ValueError("expected a JSON object at the top level")
+            raise self._error(f"Expecting '{char}'", self._pos)
+        self._pos += 1
+
+    def _value(self):
+        """
+        Decode the next complete JSON value. A value that ends at or just
+        before the buffer end may be truncated ("12" of "12.5e3"), so read
+        more and retry; so does an error there ("tr" of "true") or an
+        unterminated string. Any other error is in the document itself and
+        raised at once.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                at_end = len(self._buf) - e.pos <= _CUT_MARGIN or e.msg.startswith('Unterminated string')
+                if at_end and self._fill():
+                    continue
+                raise self._error(e.msg, e.pos) from None
+            if len(self._buf) - end <= _CUT_MARGIN and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    # -- structure --------------------------------------------------------------
+
+    def _read_fields(self, target, stop_at_array, after_value=False):
+        """
+        Read "key": value pairs into target until '}' or the streamed array.
+        after_value: a field precedes (the array), so ',' or '}' comes next.
+        """
+        while True:
+            char = self._peek()
+            if after_value:
+                if char == '}':
+                    self._pos += 1
+                    return
+                if char != ',':
+                    raise self._error("Expecting ',' delimiter", self._pos)
+                self._pos += 1
+                char = self._peek()
+            elif char == '}':
+                self._pos += 1
+                return
+            if char != '"':
+                raise self._error("Expecting property name enclosed in double quotes", self._pos)
+            key = self._value()
+            self._expect(':')
+            if stop_at_array and self.array_key is None and key in self._array_keys and self._peek() == '[':
+                self._pos += 1
+                self.array_key = key
+                return
+            target[key] = self._value()
+            after_value = True
+
+    def __iter__(self):
+        if self._started:
+            raise RuntimeError("JsonArrayStream can only be iterated once")
+        self._started = True
+        if self.array_key is None:
+            return
+        if self._peek() == ']':
+            self._pos += 1
+        else:
+            while True:
+                self.count += 1
+                yield self._value()
+                char = self._peek()
+                if char == ']':
+                    self._pos += 1
+                    break
+                if char == '':
+                    raise self._error("Unterminated array", self._pos)
+                if char != ',':
+                    raise self._error("Expecting ',' delimiter", self._pos)
+                self._pos += 1
+        self._read_fields(self.tail, stop_at_array=False, after_value=True)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Media Index
+Format, intrinsic dimensions, byte size and content hash for every image in
+"medicalogy medias", cached in generated/media_index.json.
+
+Dimensions come from the file headers only — JPEG SOF segment, PNG IHDR,
+WebP VP8/VP8L/VP8X chunk, AVIF 'ispe' property of the primary item — so no
+image is decoded. Entries are keyed by file name and reused while the file's
+size and mtime are unchanged; only new or modified files are read (and
+hashed) again.
+
+Generators call load_media_index() and look images up by the name used in
+imageFileName / ![pos|alt](file):
+    media = load_media_index()
+    media['health-care-.jpg']  →  {'format': 'jpeg', 'width': ..., 'height': ...,
+                                    'bytes': ..., 'sha256': ..., 'mtimeNs': ...}
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+
+
+MOCKUP_DIR    = Path(__file__).resolve().parent
+DEFAULT_MEDIA = MOCKUP_DIR / 'medicalogy medias'
+DEFAULT_INDEX = MOCKUP_DIR / 'generated' / 'media_index.json'
+
+INDEX_VERSION = 1
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.webp', '.avif')
+
+# JPEG start-of-frame markers (baseline, progressive, lossless, arithmetic)
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers that stand alone, without a length field
+_JPEG_STANDALONE = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9}
+
+
+# ---------------------------------------------------------------------------
+# Header parsers — each returns (width, height) or None
+# ---------------------------------------------------------------------------
+
+def _jpeg_size(f):
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in _JPEG_STANDALONE:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in _JPEG_SOF:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>HH', frame[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _png_size(head):
+    if len(head) < 24 or head[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', head[16:24])
+
+
+def _webp_size(head):
+    chunk = head[12:16]
+    if chunk == b'VP8 ' and len(head) >= 30:
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(head) >= 25:
+        b0, b1, b2, b3 = head[21:25]
+        width  = 1 + (((b1 & 0x3F) << 8) | b0)
+        height = 1 + (((b3 & 0x0F) << 10) | (b2 << 2) | ((b1 & 0xC0) >> 6))
+        return width, height
+    if chunk == b'VP8X' and len(head) >= 30:
+        width  = 1 + int.from_bytes(head[24:27], 'little')
+        height = 1 + int.from_bytes(head[27:30], 'little')
+        return width, height
+    return None
+
+
+def _iter_boxes(data, start, end):
+    """Yield (type, payload start, box end) for ISOBMFF boxes in data[start:end]."""
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack('>I4s', data[pos:pos + 8])
+        header = 8
+        if size == 1:
+            size = struct.unpack('>Q', data[pos + 8:pos + 16])[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return
+        yield box_type, pos + header, min(pos + size, end)
+        pos += size
+
+
+def _avif_size(f):
+    """Size of the primary item: pitm → ipma association → ispe property."""
+    f.seek(0)
+    meta = None
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        size, box_type = struct.unpack('>I4s', header)
+        header_len = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_len = 16
+        if box_type == b'meta':
+            meta = f.read(size - header_len)
+            break
+        if size == 0:
+            break
+        f.seek(size - header_len, os.SEEK_CUR)
+    if meta is None:
+        return None
+
+    primary, properties, associations = None, [], {}
+    for box_type, start, end in _iter_boxes(meta, 4, len(meta)):      # meta is a full box
+        if box_type == b'pitm':
+            version = meta[start]
+            fmt = '>I' if version else '>H'
+            primary = struct.unpack_from(fmt, meta, start + 4)[0]
+        elif box_type == b'iprp':
+            for sub_type, sub_start, sub_end in _iter_boxes(meta, start, end):
+                if sub_type == b'ipco':
+                    for prop_type, prop_start, _ in _iter_boxes(meta, sub_start, sub_end):
+                        if prop_type == b'ispe':
+                            properties.append(struct.unpack_from('>II', meta, prop_start + 4))
+                        else:
+                            properties.append(None)
+                elif sub_type == b'ipma':
+                    associations = _parse_ipma(meta, sub_start)
+
+    for prop_index in associations.get(primary, []):
+        if 0 < prop_index <= len(properties) and properties[prop_index - 1]:
+            return properties[prop_index - 1]
+    sizes = [p for p in properties if p]
+    return max(sizes, key=lambda wh: wh[0] * wh[1]) if sizes else None
+
+
+def _parse_ipma(data, pos):
+    """{ item id: [1-based property indices] } from an ipma full box."""
+    version, flags = data[pos], int.from_bytes(data[pos + 1:pos + 4], 'big')
+    pos += 4
+    count = struct.unpack_from('>I', data, pos)[0]
+    pos += 4
+    associations = {}
+    for _ in range(count):
+        if version < 1:
+            item_id = struct.unpack_from('>H', data, pos)[0]
+            pos += 2
+        else:
+            item_id = struct.unpack_from('>I', data, pos)[0]
+            pos += 4
+        n = data[pos]
+        pos += 1
+        indices = []
+        for _ in range(n):
+            if flags & 1:
+                indices.append(struct.unpack_from('>H', data, pos)[0] & 0x7FFF)
+                pos += 2
+            else:
+                indices.append(data[pos] & 0x7F)
+                pos += 1
+        associations[item_id] = indices
+    return associations
+
+
+def probe_image(path):
+    """(format, width, height) from the file header; unknown parts are None."""
+    with open(path, 'rb') as f:
+        head = f.read(64)
+        if head[:3] == b'\xff\xd8\xff':
+            return ('jpeg', *(_jpeg_size(f) or (None, None)))
+        if head[:8] == b'\x89PNG\r\n\x1a\n':
+            return ('png', *(_png_size(head) or (None, None)))
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            return ('webp', *(_webp_size(head) or (None, None)))
+        if head[4:8] == b'ftyp' and (b'avif' in head[8:32] or b'avis' in head[8:32]):
+            return ('avif', *(_avif_size(f) or (None, None)))
+    return None, None, None
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+def _read_index(index_path):
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if index.get('version') != INDEX_VERSION:
+        return {}
+    return index.get('files', {})
+
+
+def build_media_index(media_dir=DEFAULT_MEDIA, index_path=DEFAULT_INDEX):
+    """
+    Refresh the index for media_dir and return (files, stats). Unchanged files
+    (same size and mtime) are taken from the cached index without being
+    opened; the index file is rewritten only if something changed.
+    """
+    cached = _read_index(index_path)
+    files, stats = {}, {'cached': 0, 'probed': 0, 'removed': 0}
+
+    for path in sorted(Path(media_dir).iterdir()):
+        if path.suffix.lower() not in IMAGE_SUFFIXES or not path.is_file():
+            continue
+        st = path.stat()
+        entry = cached.get(path.name)
+        if entry and entry['bytes'] == st.st_size and entry['mtimeNs'] == st.st_mtime_ns:
+            files[path.name] = entry
+            stats['cached'] += 1
+            continue
+        fmt, width, height = probe_image(path)
+        files[path.name] = {
+            'format':  fmt,
+            'width':   width,
+            'height':  height,
+            'bytes':   st.st_size,
+            'sha256':  _sha256(path),
+            'mtimeNs': st.st_mtime_ns,
+        }
+        stats['probed'] += 1
+
+    stats['removed'] = len(set(cached) - set(files))
+    if stats['probed'] or stats['removed'] or not Path(index_path).exists():
+        Path(index_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': files}, f, ensure_ascii=False, indent=2)
+    return files, stats
+
+
+def load_media_index(media_dir=DEFAULT_MEDIA, index_path=DEFAULT_INDEX):
+    """{ file name: entry } for every image, refreshing the cache as needed."""
+    return build_media_index(media_dir, index_path)[0]
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    media_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MEDIA
+    print(f"Indexing media in: {media_dir}")
+    files, stats = build_media_index(media_dir)
+    for name, entry in files.items():
+        size = f"{entry['width']}×{entry['height']}" if entry['width'] else 'unknown size'
+        print(f"  {name:<60} {entry['format'] or '?':<5} {size:<11} {entry['bytes']:>9,} bytes")
+    print(f"  - Probed: {stats['probed']}, cached: {stats['cached']}, removed: {stats['removed']}")
+    print(f"✓ Index written to {DEFAULT_INDEX}")
+
+
+if __name__ == "__main__":
+    main()
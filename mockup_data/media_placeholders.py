@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Image Placeholders
+A low-quality placeholder for every image in "medicalogy medias": its
+average color and a ~16px blurred WebP thumbnail as a data: URI (~150 bytes),
+painted as the <img> background so the box shows the picture's colors
+while the real file loads.
+
+Placeholders are cached in generated/media_placeholders.json keyed by the
+image's sha256 (from media_index), so each distinct image is decoded once —
+renames and page builds reuse the cached entry. JPEGs are decoded in draft
+mode at reduced scale, which keeps even a 2736px photo to a few
+milliseconds.
+
+Images with transparent pixels get no placeholder: the background would stay
+visible through them after the image loads.
+
+Entries:
+  { 'color': '#rrggbb', 'dataUri': 'data:image/webp;base64,...',
+    'width': thumbnail w, 'height': thumbnail h }
+"""
+
+import base64
+import io
+import json
+import sys
+from pathlib import Path
+
+from media_index import DEFAULT_INDEX, DEFAULT_MEDIA, load_media_index
+
+try:
+    from PIL import Image, ImageFilter, ImageOps
+    IMAGE_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+except ImportError:                     # placeholders are optional; pages render without them
+    Image = ImageFilter = ImageOps = None
+    IMAGE_ERRORS = (OSError, ValueError)
+
+
+MOCKUP_DIR           = Path(__file__).resolve().parent
+DEFAULT_PLACEHOLDERS = MOCKUP_DIR / 'generated' / 'media_placeholders.json'
+
+CACHE_VERSION  = 1
+THUMBNAIL_SIZE = 16                     # longest side, px
+BLUR_RADIUS    = 0.6
+WEBP_QUALITY   = 40
+
+
+# ---------------------------------------------------------------------------
+# Placeholder computation
+# ---------------------------------------------------------------------------
+
+def compute_placeholder(path):
+    """
+    Placeholder entry for one image file, or None if it has transparency.
+    Raises one of IMAGE_ERRORS if the file cannot be read or decoded.
+    """
+    with Image.open(path) as im:
+        im.draft('RGB', (THUMBNAIL_SIZE * 4, THUMBNAIL_SIZE * 4))
+        im = ImageOps.exif_transpose(im)
+        if 'A' in im.getbands() or 'transparency' in im.info:
+            alpha = im.convert('RGBA').getchannel('A')
+            if alpha.getextrema()[0] < 255:
+                return None
+        im = im.convert('RGB')
+        im.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.LANCZOS)
+
+    r, g, b = im.resize((1, 1), Image.BOX).getpixel((0, 0))
+    thumb = im.filter(ImageFilter.GaussianBlur(BLUR_RADIUS))
+    buf = io.BytesIO()
+    thumb.save(buf, 'WEBP', quality=WEBP_QUALITY)
+    return {
+        'color':   f"#{r:02x}{g:02x}{b:02x}",
+        'dataUri': 'data:image/webp;base64,' + base64.b64encode(buf.getvalue()).decode('ascii'),
+        'width':   thumb.width,
+        'height':  thumb.height,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache.get('placeholders', {})
+
+
+def build_placeholders(media_dir=DEFAULT_MEDIA, cache_path=DEFAULT_PLACEHOLDERS,
+                       index_path=DEFAULT_INDEX):
+    """
+    Compute the placeholders missing from the cache and return
+    (placeholders by sha256, number computed this run, skipped) — skipped
+    maps the file name of each image that could not be decoded to the
+    reason; it is left out of the cache and retried next run. Entries for
+    images no longer present are dropped.
+    """
+    cached = _read_cache(cache_path)
+    media = load_media_index(media_dir, index_path)
+
+    placeholders, computed, skipped = {}, 0, {}
+    for name, entry in media.items():
+        sha256 = entry['sha256']
+        if sha256 in placeholders:
+            continue
+        if sha256 in cached:
+            placeholders[sha256] = cached[sha256]
+        elif Image is not None and entry.get('width'):
+            try:
+                placeholders[sha256] = compute_placeholder(Path(media_dir) / name)
+            except IMAGE_ERRORS as e:
+                skipped[name] = f"cannot decode image ({e})"
+                continue
+            computed += 1
+
+    if computed or placeholders.keys() != cached.keys():
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'placeholders': placeholders}, f, indent=2)
+    return placeholders, computed, skipped
+
+
+def load_placeholders(cache_path=DEFAULT_PLACEHOLDERS):
+    """{ sha256: placeholder or None } from the cache — never decodes images."""
+    return _read_cache(cache_path)
+
+
+def placeholder_style(entry):
+    """Inline style painting an entry's placeholder behind its <img>, or ''."""
+    placeholder = (entry or {}).get('placeholder')
+    if not placeholder:
+        return ''
+    return (f' style="background: {placeholder["color"]} url(\'{placeholder["dataUri"]}\') '
+            f'center / cover no-repeat"')
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    media_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MEDIA
+
+    print(f"Computing placeholders for: {media_dir}")
+    if Image is None:
+        print("Error: Pillow is required to compute placeholders")
+        sys.exit(1)
+    placeholders, computed, skipped = build_placeholders(media_dir)
+    media = load_media_index(media_dir)
+
+    for name, entry in media.items():
+        if name in skipped:
+            print(f"✗ {name}")
+            print(f"    {skipped[name]}")
+            continue
+        placeholder = placeholders.get(entry['sha256'])
+        detail = (f"{placeholder['color']}  {len(placeholder['dataUri']):>4} chars"
+                  if placeholder else 'none (transparent)')
+        print(f"  {name[:56]:<56} {detail}")
+    print(f"  - Computed: {computed}, cached: {len(placeholders) - computed}, skipped: {len(skipped)}")
+    print(f"✓ Successfully generated {DEFAULT_PLACEHOLDERS}")
+
+
+if __name__ == "__main__":
+    main()
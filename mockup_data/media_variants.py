@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Responsive Image Variants
+Builds width-stepped AVIF / WebP copies of every image in "medicalogy medias"
+so pages can serve a phone a 480px WebP instead of a 2736px JPEG.
+
+Output is content-addressed: an image's variants live in a directory named
+after its sha256 (from media_index), so an unchanged image is never
+re-encoded and a changed one gets a fresh directory. Images are encoded in
+parallel, one process per image.
+
+Layout (out_dir, default generated/media_variants):
+  <sha256[:16]>/<width>.avif
+  <sha256[:16]>/<width>.webp
+  manifest.json     { file name: { 'sha256', 'variants': [ {width, height,
+                      format, file, bytes}, ... ] } }
+
+Pages reference variants relative to VARIANT_URL (the out_dir as deployed
+next to the page). load_responsive_media() returns the media index with each
+entry's 'variants' and 'placeholder' (media_placeholders.py) attached — the
+shape the HTML generators take as `media`.
+
+Pillow is needed to build variants; without it the existing manifest is used
+as-is and images without variants are served at full size.
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from media_index import DEFAULT_INDEX, DEFAULT_MEDIA, load_media_index
+from media_placeholders import DEFAULT_PLACEHOLDERS, IMAGE_ERRORS, build_placeholders, load_placeholders
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:                     # variants are optional; pages fall back to src
+    Image = ImageOps = None
+
+
+MOCKUP_DIR       = Path(__file__).resolve().parent
+DEFAULT_VARIANTS = MOCKUP_DIR / 'generated' / 'media_variants'
+MANIFEST_FILE    = 'manifest.json'
+VARIANT_URL      = 'media_variants/'
+
+VARIANT_WIDTHS = (320, 480, 640, 960, 1280, 1920)
+
+# (format, MIME type, Pillow save options) — in <picture> preference order
+VARIANT_FORMATS = (
+    ('avif', 'image/avif', {'quality': 50, 'speed': 6}),
+    ('webp', 'image/webp', {'quality': 75, 'method': 4}),
+)
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+def variant_widths(width):
+    """Target widths for an image `width` px wide — never upscaled."""
+    steps = [w for w in VARIANT_WIDTHS if w < width]
+    if width <= VARIANT_WIDTHS[-1]:
+        steps.append(width)
+    return steps
+
+
+def _content_dir(sha256):
+    return sha256[:16]
+
+
+def _build_image(job):
+    """
+    Encode every variant of one image. Runs in a worker process. Returns
+    (file name, manifest entry, None), or (file name, None, reason) if the
+    image cannot be decoded.
+    """
+    src_path, sha256, out_dir = job
+    try:
+        return Path(src_path).name, _encode_variants(src_path, sha256, out_dir), None
+    except IMAGE_ERRORS as e:
+        return Path(src_path).name, None, f"cannot decode image ({e})"
+
+
+def _encode_variants(src_path, sha256, out_dir):
+    target = Path(out_dir) / _content_dir(sha256)
+    target.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(src_path) as im:
+        im = ImageOps.exif_transpose(im)
+        im = im.convert('RGBA' if 'A' in im.getbands() or 'transparency' in im.info else 'RGB')
+        variants = []
+        for width in variant_widths(im.width):
+            height = max(1, round(im.height * width / im.width))
+            resized = im if width == im.width else im.resize((width, height), Image.LANCZOS)
+            for fmt, _, options in VARIANT_FORMATS:
+                path = target / f"{width}.{fmt}"
+                resized.save(path, fmt.upper(), **options)
+                variants.append({
+                    'width':  width,
+                    'height': height,
+                    'format': fmt,
+                    'file':   f"{_content_dir(sha256)}/{path.name}",
+                    'bytes':  path.stat().st_size,
+                })
+    return {'sha256': sha256, 'variants': variants}
+
+
+def _read_manifest(out_dir):
+    try:
+        with open(Path(out_dir) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _is_current(entry, sha256, out_dir):
+    return (entry is not None and entry['sha256'] == sha256
+            and all((Path(out_dir) / v['file']).exists() for v in entry['variants']))
+
+
+def build_variants(media_dir=DEFAULT_MEDIA, out_dir=DEFAULT_VARIANTS,
+                   index_path=DEFAULT_INDEX, workers=None):
+    """
+    Bring out_dir up to date with media_dir and return (manifest, built,
+    skipped) — built lists the file names that were (re-)encoded this run,
+    skipped maps each image that could not be decoded to the reason; it
+    gets no manifest entry and is served at full size.
+    """
+    media = load_media_index(media_dir, index_path)
+    previous = _read_manifest(out_dir)
+
+    manifest, jobs = {}, []
+    for name, entry in media.items():
+        if not entry.get('width'):
+            continue
+        if _is_current(previous.get(name), entry['sha256'], out_dir):
+            manifest[name] = previous[name]
+        else:
+            jobs.append((str(Path(media_dir) / name), entry['sha256'], str(out_dir)))
+
+    if jobs and Image is None:
+        print("  ! Pillow is not installed: variants not built for "
+              f"{len(jobs)} image(s), they will be served at full size")
+        jobs = []
+
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            results = list(pool.map(_build_image, jobs))
+    else:
+        results = [_build_image(job) for job in jobs]
+    built = {name: entry for name, entry, _ in results if entry is not None}
+    skipped = {name: reason for name, entry, reason in results if entry is None}
+    manifest.update(built)
+    manifest = dict(sorted(manifest.items()))
+
+    if built or manifest.keys() != previous.keys():
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        with open(Path(out_dir) / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest, list(built), skipped
+
+
+def load_responsive_media(media_dir=DEFAULT_MEDIA, out_dir=DEFAULT_VARIANTS,
+                          index_path=DEFAULT_INDEX, placeholder_path=DEFAULT_PLACEHOLDERS):
+    """
+    The media index with each entry's variant list attached under
+    'variants' (empty when none were built) and its placeholder under
+    'placeholder' (None when there is none). Only reads the caches — run
+    build_variants() / build_placeholders() (or this module) to encode.
+    """
+    manifest = _read_manifest(out_dir)
+    placeholders = load_placeholders(placeholder_path)
+    media = load_media_index(media_dir, index_path)
+    return {
+        name: {
+            **entry,
+            'variants':    manifest[name]['variants']
+                           if name in manifest and manifest[name]['sha256'] == entry['sha256'] else [],
+            'placeholder': placeholders.get(entry['sha256']),
+        }
+        for name, entry in media.items()
+    }
+
+
+# ---------------------------------------------------------------------------
+# Markup helpers
+# ---------------------------------------------------------------------------
+
+def picture_sources(entry, base=VARIANT_URL):
+    """[(MIME type, srcset), ...] for an entry's variants, in preference order."""
+    variants = (entry or {}).get('variants') or []
+    sources = []
+    for fmt, mime, _ in VARIANT_FORMATS:
+        candidates = [v for v in variants if v['format'] == fmt]
+        if candidates:
+            sources.append((mime, ', '.join(f"{base}{v['file']} {v['width']}w" for v in candidates)))
+    return sources
+
+
+def picture_html(img_html, entry, sizes, base=VARIANT_URL):
+    """Wrap an <img> tag in <picture> with one <source> per variant format."""
+    sources = picture_sources(entry, base)
+    if not sources:
+        return img_html
+    source_html = ''.join(f'<source type="{mime}" srcset="{srcset}" sizes="{sizes}" />'
+                          for mime, srcset in sources)
+    return f'<picture>{source_html}{img_html}</picture>'
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    media_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MEDIA
+    out_dir   = Path(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_VARIANTS
+
+    print(f"Building image variants from: {media_dir}")
+    manifest, built, skipped = build_variants(media_dir, out_dir)
+    _, computed, _ = build_placeholders(media_dir)
+    media = load_media_index(media_dir)
+
+    original = sum(media[name]['bytes'] for name in manifest)
+    for name, entry in manifest.items():
+        widths = sorted({v['width'] for v in entry['variants']})
+        status = 'built' if name in built else 'cached'
+        print(f"  {name[:56]:<56} {status:<6} {', '.join(map(str, widths))}")
+    smallest = {
+        fmt: sum(min((v['bytes'] for v in entry['variants']
+                      if v['format'] == fmt and v['width'] >= min(640, media[name]['width'])),
+                     default=media[name]['bytes'])
+                 for name, entry in manifest.items())
+        for fmt, _, _ in VARIANT_FORMATS
+    }
+    for name, reason in skipped.items():
+        print(f"✗ {name}")
+        print(f"    {reason}")
+    print(f"  - Images:     {len(manifest)} ({len(built)} encoded this run, {len(skipped)} skipped)")
+    print(f"  - Placeholders computed this run: {computed}")
+    print(f"  - Originals:  {original:,} bytes")
+    for fmt, total in smallest.items():
+        print(f"  - {fmt.upper()} @640w: {total:,} bytes ({total / max(original, 1):.0%})")
+    print(f"✓ Successfully generated {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
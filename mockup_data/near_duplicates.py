@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Near-Duplicate Analyzer
+MinHash + LSH clustering of near-identical course screens and articles, and
+exact-duplicate screen dedupe into shared fragments.
+
+Documents:
+  course:<slug>#<screen id>   one per screen in content_files/courses
+                              (summary / question / options / explanation text)
+  article:<slug>              content_files/articles/*.md and
+                              generated/infographic_markdown/**/*.md
+
+Each document is reduced to word shingles, hashed, and summarised by a
+MinHash signature (NumPy, one vectorised pass per document). Signatures are
+split into LSH bands; only documents that share a band bucket are compared,
+so the work grows with the number of documents and near-duplicate pairs —
+not with all pairs. Clusters are the connected components of pairs whose
+estimated Jaccard similarity reaches the threshold. Requires NumPy.
+
+dedupe_screens() separately collapses byte-identical screen content into
+fragments that courses reference by id.
+"""
+
+import hashlib
+import json
+import re
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+
+MOCKUP_DIR       = Path(__file__).resolve().parent
+DEFAULT_COURSES  = MOCKUP_DIR / 'content_files' / 'courses'
+DEFAULT_ARTICLES = [
+    MOCKUP_DIR / 'content_files' / 'articles',
+    MOCKUP_DIR / 'generated' / 'infographic_markdown',
+]
+DEFAULT_REPORT    = MOCKUP_DIR / 'generated' / 'near_duplicates.json'
+DEFAULT_FRAGMENTS = MOCKUP_DIR / 'generated' / 'course_fragments'
+
+NUM_PERM      = 128
+THRESHOLD     = 0.80
+SHINGLE_WORDS = 3
+SEED          = 1
+
+# Buckets larger than this are linked as a star around their first member
+# instead of comparing every pair
+MAX_BUCKET_PAIRS = 64
+
+WORD_RE     = re.compile(r"[^\W_]+", re.UNICODE)
+MD_IMAGE_RE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+MD_NOISE_RE = re.compile(r'[#*_|>\[\]`/-]+')
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+def screen_text(screen):
+    """Learner-visible text of a course screen."""
+    content = screen.get('content', {})
+    parts = [content.get('summaryText', ''), content.get('questionText', ''),
+             content.get('sentence', '')]
+    parts += [opt.get('text', '') for opt in content.get('options', [])]
+    parts += content.get('correctAnswers', []) + content.get('wrongAnswers', [])
+    parts.append(content.get('explanation', ''))
+    return ' '.join(str(p) for p in parts if p)
+
+
+def markdown_text(markdown):
+    """Article prose with image embeds and markup stripped."""
+    return MD_NOISE_RE.sub(' ', MD_IMAGE_RE.sub(' ', markdown))
+
+
+def iter_course_documents(course_dir=DEFAULT_COURSES):
+    for path in sorted(Path(course_dir).glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            course = json.load(f)
+        for screen in course['screens']:
+            yield f"course:{path.stem}#{screen['id']}", screen_text(screen)
+
+
+def iter_article_documents(article_dirs=DEFAULT_ARTICLES):
+    for root in article_dirs:
+        for path in sorted(Path(root).rglob('*.md')):
+            rel = path.relative_to(root).with_suffix('').as_posix()
+            yield f"article:{rel}", markdown_text(path.read_text(encoding='utf-8'))
+
+
+# ---------------------------------------------------------------------------
+# MinHash
+# ---------------------------------------------------------------------------
+
+def shingle_hashes(text, k=SHINGLE_WORDS):
+    """uint64 array of crc32 hashes of the distinct k-word shingles in text."""
+    words = WORD_RE.findall(text.casefold())
+    if len(words) < k:
+        grams = {' '.join(words)} if words else set()
+    else:
+        grams = {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams),
+                       dtype=np.uint64, count=len(grams))
+
+
+class MinHasher:
+    """
+    num_perm multiply-shift hash functions h(x) = (a·x + b) mod 2^64 >> 32;
+    a signature is the per-function minimum over a document's shingles.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=SEED):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        if len(hashes) == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        mixed = (hashes[:, None] * self.a + self.b) >> np.uint64(32)
+        return mixed.min(axis=0).astype(np.uint32)
+
+    def signatures(self, texts, k=SHINGLE_WORDS):
+        """(n_docs × num_perm) uint32 signature matrix."""
+        texts = list(texts)
+        out = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for i, text in enumerate(texts):
+            out[i] = self.signature(shingle_hashes(text, k))
+        return out
+
+
+def lsh_params(num_perm, threshold):
+    """
+    (bands, rows) with bands·rows = num_perm whose S-curve midpoint
+    (1/bands)^(1/rows) is closest to threshold.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        gap = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or gap < best[0]:
+            best = (gap, bands, rows)
+    return best[1], best[2]
+
+
+# ---------------------------------------------------------------------------
+# Clustering
+# ---------------------------------------------------------------------------
+
+class _DisjointSet:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, x, y):
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+def _band_buckets(signatures, bands, rows):
+    """Yield arrays of row numbers that share one band's hash values."""
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        shared = np.flatnonzero(counts > 1)
+        if len(shared) == 0:
+            continue
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        for bucket in shared:
+            yield order[bounds[bucket]:bounds[bucket + 1]]
+
+
+def find_clusters(doc_ids, signatures, threshold=THRESHOLD):
+    """
+    Group documents whose estimated Jaccard similarity ≥ threshold.
+    Returns clusters (largest first) as
+      {'members': [doc ids], 'similarity': lowest linking similarity}
+    Documents with identical signatures are collapsed before banding.
+    """
+    n, num_perm = signatures.shape
+    if n == 0:
+        return []
+    bands, rows = lsh_params(num_perm, threshold)
+
+    unique_sigs, first, inverse = np.unique(signatures, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    groups = _DisjointSet(len(unique_sigs))
+    link_similarity = {}
+
+    def link(x, y):
+        sim = float(np.mean(unique_sigs[x] == unique_sigs[y]))
+        if sim >= threshold:
+            rx, ry = groups.find(x), groups.find(y)
+            groups.union(x, y)
+            root = groups.find(x)
+            link_similarity[root] = min(sim, link_similarity.get(rx, 1.0), link_similarity.get(ry, 1.0))
+
+    checked = set()
+    for bucket in _band_buckets(unique_sigs, bands, rows):
+        bucket = bucket.tolist()
+        if len(bucket) * (len(bucket) - 1) // 2 > MAX_BUCKET_PAIRS:
+            pairs = ((bucket[0], other) for other in bucket[1:])
+        else:
+            pairs = ((x, y) for i, x in enumerate(bucket) for y in bucket[i + 1:])
+        for x, y in pairs:
+            if (x, y) not in checked:
+                checked.add((x, y))
+                link(x, y)
+
+    members = {}
+    for doc, sig_row in enumerate(inverse.tolist()):
+        members.setdefault(groups.find(sig_row), []).append(doc_ids[doc])
+
+    clusters = [
+        {'members': docs, 'similarity': round(link_similarity.get(root, 1.0), 3)}
+        for root, docs in members.items() if len(docs) > 1
+    ]
+    clusters.sort(key=lambda c: (-len(c['members']), c['members'][0]))
+    return clusters
+
+
+def analyze(documents, threshold=THRESHOLD, num_perm=NUM_PERM, k=SHINGLE_WORDS):
+    """Cluster an iterable of (doc id, text) pairs."""
+    doc_ids, texts = [], []
+    for doc_id, text in documents:
+        doc_ids.append(doc_id)
+        texts.append(text)
+    signatures = MinHasher(num_perm).signatures(texts, k)
+    return find_clusters(doc_ids, signatures, threshold)
+
+
+# ---------------------------------------------------------------------------
+# Exact screen dedupe
+# ---------------------------------------------------------------------------
+
+def fragment_id(content):
+    """Content address of a screen's content object."""
+    canonical = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def dedupe_screens(courses):
+    """
+    courses: { slug: course JSON }. Screen content that appears more than
+    once is moved into a shared fragment and replaced by
+    {"fragment": "<id>"}; unique content stays inline.
+    Returns (fragments { id: content }, { slug: rewritten course }).
+    """
+    counts = {}
+    for course in courses.values():
+        for screen in course['screens']:
+            fid = fragment_id(screen['content'])
+            counts[fid] = counts.get(fid, 0) + 1
+
+    fragments, rewritten = {}, {}
+    for slug, course in courses.items():
+        screens = []
+        for screen in course['screens']:
+            fid = fragment_id(screen['content'])
+            if counts[fid] > 1:
+                fragments.setdefault(fid, screen['content'])
+                screen = {**screen, 'content': {'fragment': fid}}
+            screens.append(screen)
+        rewritten[slug] = {**course, 'screens': screens}
+    return fragments, rewritten
+
+
+def expand_fragments(course, fragments):
+    """Inverse of dedupe_screens() for one course."""
+    screens = [
+        {**s, 'content': fragments[s['content']['fragment']]}
+        if set(s['content']) == {'fragment'} else s
+        for s in course['screens']
+    ]
+    return {**course, 'screens': screens}
+
+
+def write_fragments(course_dir=DEFAULT_COURSES, out_dir=DEFAULT_FRAGMENTS):
+    """Dedupe content_files/courses into out_dir (fragments.json + one file per course)."""
+    courses = {}
+    for path in sorted(Path(course_dir).glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            courses[path.stem] = json.load(f)
+    fragments, rewritten = dedupe_screens(courses)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / 'fragments.json', 'w', encoding='utf-8') as f:
+        json.dump(fragments, f, ensure_ascii=False, indent=2)
+    for slug, course in rewritten.items():
+        with open(out_dir / f"{slug}.json", 'w', encoding='utf-8') as f:
+            json.dump(course, f, ensure_ascii=False, indent=2)
+    return fragments, rewritten
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    dedupe = '--dedupe' in sys.argv[1:]
+
+    documents = list(iter_course_documents()) + list(iter_article_documents())
+    print(f"Analyzing {len(documents)} documents (threshold {THRESHOLD}, {NUM_PERM} permutations)...")
+    clusters = analyze(documents)
+
+    redundant = sum(len(c['members']) - 1 for c in clusters)
+    print(f"  - Clusters:            {len(clusters)}")
+    print(f"  - Redundant documents: {redundant}")
+    for cluster in clusters[:10]:
+        print(f"    {len(cluster['members']):>4} × (≥{cluster['similarity']:.2f})  {cluster['members'][0]}")
+
+    with open(DEFAULT_REPORT, 'w', encoding='utf-8') as f:
+        json.dump({'threshold': THRESHOLD, 'numPerm': NUM_PERM, 'clusters': clusters}, f, indent=2)
+    print(f"✓ Report written to {DEFAULT_REPORT}")
+
+    if dedupe:
+        fragments, rewritten = write_fragments()
+        shared = sum(1 for c in rewritten.values() for s in c['screens'] if set(s['content']) == {'fragment'})
+        print(f"  - Shared fragments:    {len(fragments)} (referenced by {shared} screens)")
+        print(f"✓ Deduplicated courses written to {DEFAULT_FRAGMENTS}")
+
+
+if __name__ == "__main__":
+    main()
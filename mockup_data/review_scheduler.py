@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Review Scheduler
+Keeps the roadmap's Stale state (screens/4-roadmap/doc.md) as a schedule
+instead of re-deriving it from user_course on every view: each completed
+course is due for review stale_days after its last review, or its
+completion if it was never reviewed, and becomes Stale when that moment
+passes.
+
+Structures:
+  per user      a min-heap of (due, course) — next_due() peeks it in
+                O(log n) amortised, stale() walks only the overdue part
+  global wheel  a min-heap of (due, user, course) over every schedule —
+                pop_due() pops exactly the items that became due since the
+                last call, O(log N) each, without scanning completions
+
+Both heaps use lazy deletion: a reschedule (review) or removal only updates
+the authoritative due-time map, and outdated heap entries are dropped when
+they surface.
+
+emit_notifications() turns each pop_due() batch into course_recommendation
+notifications — one per user per batch, for the most overdue course; the
+user's other due courses go back on the wheel for the next batch —
+skipping users who turned in-app course recommendations off, and inserts
+them in chunks. The notification rows double as the record of what was
+sent: load_scheduler() queues every due review that has none, so a restart
+loses neither requeued items nor those that fell due while it was down.
+
+record_review() is the write path for a review (screens/4-roadmap/doc.md:
+reopening a Stale course "cập nhật thời gian truy cập"): it sets
+user_course.last_reviewed_at
+(database/versions/migration_user_course_last_reviewed_at.sql) and
+reschedules, so load_scheduler() rebuilds the same due times after a
+restart. completed_at is never rewritten — it is the completion history
+the streak engine counts. Times are server_now() wall-clock times.
+
+    python review_scheduler.py [db path] [--stale-days N] [--days D]
+
+simulates D days (default 7) from now on the stand-in and writes the
+notifications each day would send.
+"""
+
+import heapq
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from generation import stable_id
+from roadmap_states import DEFAULT_STALE_DAYS
+from sqlite_db import DEFAULT_DB, connect, sqlite_value
+from streak_engine import server_now
+
+
+NOTIFICATION_TYPE = 'course_recommendation'
+INSERT_CHUNK      = 5_000               # notifications per executemany
+REVIEW_COLUMN     = 'last_reviewed_at'  # migration_user_course_last_reviewed_at.sql
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+class ReviewScheduler:
+    """Due reviews per user and across users; times are naive server datetimes."""
+
+    def __init__(self, stale_days=DEFAULT_STALE_DAYS):
+        self.interval = timedelta(days=stale_days)
+        self._due = defaultdict(dict)           # user -> {course: due}
+        self._heaps = defaultdict(list)         # user -> [(due, course)]
+        self._wheel = []                        # [(due, user, course)]
+
+    def __len__(self):
+        return sum(len(courses) for courses in self._due.values())
+
+    def schedule(self, user_id, course_id, reviewed_at, notify=True):
+        """
+        Record a completion or review at reviewed_at. With notify=False the
+        item is tracked but never reported by pop_due() (already overdue at load).
+        """
+        due = reviewed_at + self.interval
+        self._due[user_id][course_id] = due
+        heapq.heappush(self._heaps[user_id], (due, course_id))
+        if notify:
+            heapq.heappush(self._wheel, (due, user_id, course_id))
+        self._compact(user_id)
+
+    def remove(self, user_id, course_id):
+        """Stop tracking a course (deactivated, or the completion was deleted)."""
+        self._due.get(user_id, {}).pop(course_id, None)
+
+    def _valid(self, user_id, due, course_id):
+        return self._due.get(user_id, {}).get(course_id) == due
+
+    def _compact(self, user_id):
+        """Rebuild a user's heap once outdated entries outnumber live ones."""
+        heap, live = self._heaps[user_id], self._due[user_id]
+        if len(heap) > 2 * len(live) + 8:
+            heap[:] = [(due, course) for course, due in live.items()]
+            heapq.heapify(heap)
+
+    def next_due(self, user_id):
+        """(due, course) of the user's earliest review — overdue or upcoming — or None."""
+        heap = self._heaps.get(user_id)
+        while heap and not self._valid(user_id, *heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def stale(self, user_id, now):
+        """[(due, course)] of the user's overdue reviews, most overdue first."""
+        heap, found, stack = self._heaps.get(user_id, []), [], [0]
+        while stack:
+            i = stack.pop()
+            if i >= len(heap) or heap[i][0] > now:
+                continue                        # heap order: nothing below i is due either
+            if self._valid(user_id, *heap[i]):
+                found.append(heap[i])
+            stack.extend((2 * i + 1, 2 * i + 2))
+        return sorted(found)
+
+    def is_stale(self, user_id, course_id, now):
+        due = self._due.get(user_id, {}).get(course_id)
+        return due is not None and due <= now
+
+    def requeue(self, user_id, items):
+        """Put popped (due, course) items back on the wheel for the next pop_due()."""
+        for due, course_id in items:
+            if self._valid(user_id, due, course_id):
+                heapq.heappush(self._wheel, (due, user_id, course_id))
+
+    def pop_due(self, now):
+        """{user: [(due, course)]} of the items that became due since the last call."""
+        batch = defaultdict(list)
+        wheel = self._wheel
+        while wheel and wheel[0][0] <= now:
+            due, user_id, course_id = heapq.heappop(wheel)
+            if self._valid(user_id, due, course_id):
+                batch[user_id].append((due, course_id))
+        return dict(batch)
+
+
+def has_review_column(conn):
+    return REVIEW_COLUMN in {row[1] for row in conn.execute('PRAGMA table_info("user_course")')}
+
+
+def ensure_review_column(conn):
+    """Add user_course.last_reviewed_at to the stand-in if the migration has not run."""
+    if not has_review_column(conn):
+        with conn:
+            conn.execute(f'ALTER TABLE user_course ADD COLUMN {REVIEW_COLUMN} TEXT')
+
+
+def load_scheduler(conn, stale_days=DEFAULT_STALE_DAYS):
+    """
+    Scheduler for every completion of an active course. A review already
+    notified (a course_recommendation for the course sent at or after its
+    due time) is tracked but not queued again; everything else is queued,
+    including items that fell due while no scheduler was running.
+    """
+    scheduler = ReviewScheduler(stale_days)
+    reviewed = f'COALESCE(uc.{REVIEW_COLUMN}, uc.completed_at)' if has_review_column(conn) else 'uc.completed_at'
+    cursor = conn.execute(f'''
+        SELECT uc.user_id, uc.course_id, {reviewed}, n.sent_at FROM user_course uc
+        JOIN course c ON c.id = uc.course_id
+        LEFT JOIN (
+            SELECT user_id, reference_id, MAX(sent_at) AS sent_at FROM notification
+            WHERE notification_type = ? AND reference_type = 'course'
+            GROUP BY user_id, reference_id
+        ) n ON n.user_id = uc.user_id AND n.reference_id = uc.course_id
+        WHERE c.is_active = 1 AND uc.completed_at IS NOT NULL''', (NOTIFICATION_TYPE,))
+    for user_id, course_id, reviewed_at, sent_at in cursor:
+        reviewed_at = _datetime(reviewed_at)
+        notified = sent_at is not None and _datetime(sent_at) >= reviewed_at + scheduler.interval
+        scheduler.schedule(user_id, course_id, reviewed_at, notify=not notified)
+    return scheduler
+
+
+def _datetime(value):
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def record_review(conn, scheduler, user_id, course_id, reviewed_at=None):
+    """
+    Persist a review of a completed course (user_course.last_reviewed_at =
+    reviewed_at) and reschedule it. Returns False if the course is not completed.
+    """
+    reviewed_at = reviewed_at or server_now()
+    ensure_review_column(conn)
+    with conn:
+        updated = conn.execute(f'''
+            UPDATE user_course SET {REVIEW_COLUMN} = ?
+            WHERE user_id = ? AND course_id = ? AND completed_at IS NOT NULL''',
+                               (sqlite_value(reviewed_at), user_id, course_id)).rowcount
+    if updated:
+        scheduler.schedule(user_id, course_id, reviewed_at)
+    return bool(updated)
+
+
+# ---------------------------------------------------------------------------
+# Notifications
+# ---------------------------------------------------------------------------
+
+def opted_out(conn, user_ids):
+    """Users among user_ids with in-app course recommendations turned off."""
+    users, result = list(user_ids), set()
+    for start in range(0, len(users), 500):
+        chunk = users[start:start + 500]
+        result.update(row[0] for row in conn.execute(f'''
+            SELECT user_id FROM user_notification_preference
+            WHERE notification_type = ? AND in_app_enabled = 0
+              AND user_id IN ({", ".join("?" * len(chunk))})''', [NOTIFICATION_TYPE, *chunk]))
+    return result
+
+
+def notification_rows(conn, scheduler, batch, now):
+    """
+    notification rows for a pop_due() batch: the most overdue course per
+    user. The user's other due courses are requeued on the scheduler.
+    """
+    skipped = opted_out(conn, batch)
+    for user_id, items in batch.items():
+        if user_id in skipped:
+            continue
+        (due, course_id), *rest = sorted(items)
+        scheduler.requeue(user_id, rest)
+        yield (stable_id('notification', NOTIFICATION_TYPE, user_id, course_id, due.isoformat()),
+               user_id, NOTIFICATION_TYPE, 'course', course_id, 0, now, now)
+
+
+def emit_notifications(conn, scheduler, now=None):
+    """Insert the notifications for everything due by now. Returns the count."""
+    now = now or server_now()
+    rows = [tuple(sqlite_value(v) for v in row)
+            for row in notification_rows(conn, scheduler, scheduler.pop_due(now), now)]
+    with conn:
+        for start in range(0, len(rows), INSERT_CHUNK):
+            conn.executemany('''
+                INSERT OR IGNORE INTO notification
+                    (id, user_id, notification_type, reference_type, reference_id, is_read, sent_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', rows[start:start + INSERT_CHUNK])
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def _flag_value(args, flag, default):
+    if flag not in args:
+        return default
+    i = args.index(flag)
+    try:
+        value = int(args[i + 1])
+    except (IndexError, ValueError):
+        print(f"Error: {flag} needs a number")
+        sys.exit(1)
+    del args[i:i + 2]
+    return value
+
+
+def main():
+    args = sys.argv[1:]
+    stale_days = _flag_value(args, '--stale-days', DEFAULT_STALE_DAYS)
+    days = _flag_value(args, '--days', 7)
+    db_path = Path(args[0]) if args else DEFAULT_DB
+    if not db_path.exists():
+        print(f"Error: {db_path} not found — build it with sqlite_db.py or synthetic_data.py")
+        sys.exit(1)
+
+    print(f"Scheduling reviews in: {db_path} (stale after {stale_days} days)")
+    conn = connect(db_path)
+    try:
+        now = server_now()
+        start = time.perf_counter()
+        scheduler = load_scheduler(conn, stale_days)
+        print(f"  - Loaded:     {len(scheduler):,} completions in {time.perf_counter() - start:.2f}s")
+        for day in range(1, days + 1):
+            sent = emit_notifications(conn, scheduler, now + timedelta(days=day))
+            print(f"  - Day {day:<2}      {sent:,} {NOTIFICATION_TYPE} notifications")
+    finally:
+        conn.close()
+    print("✓ Successfully scheduled reviews")
+
+
+if __name__ == "__main__":
+    main()
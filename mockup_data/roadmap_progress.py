@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Roadmap Progress
+Maintains user_theme_progress (database/versions/migration_user_theme_progress.sql):
+one compact row per (user, theme) with everything the roadmap screen
+derives — completed / passed bitmap per section, skippable sections,
+section-test eligibility, the next unlocked item and the progress count —
+so a roadmap load reads one row instead of joining five tables.
+
+Rules (screens/4-roadmap/doc.md):
+  - sections are shown if section.intended_demographic is 'all' or the
+    user's demographic; hidden sections count for nothing
+  - a course is completed when it has a user_course row, and passed when
+    quizzes_correct reaches PASS_RATIO of the course file's quiz screens
+    (a course without a known quiz count passes on completion)
+  - in a section, the first course is unlocked when the section is open,
+    each next one when the previous is passed
+  - a section with initial_user_section_proficiency >= PASS_RATIO is
+    skippable: every course in it is unlocked, and it never blocks the next
+  - a section's test is eligible once all its courses are completed; the
+    next section opens when this one is completed (or skippable)
+  - the next item is the first unlocked incomplete course or eligible,
+    unpassed test in roadmap order
+
+Maintenance:
+  rebuild()              batch job — streams the source tables sorted by
+                         user and upserts every summary
+  on_course_completed()  incremental — called on each user_course write;
+  on_section_test()      on each user_section_test write. Both update the
+                         stored bitmaps and re-derive the rest in O(courses
+                         in the theme), without reading the source tables
+  get()                  the row, recomputed first if the curriculum or the
+                         user's demographic changed since it was written
+
+Works on the SQLite stand-in (sqlite_db.py); the table is created from the
+migration file through the same T-SQL translator.
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from sqlite_db import DEFAULT_DB, connect, translate_script
+
+
+MOCKUP_DIR        = Path(__file__).resolve().parent
+DEFAULT_COURSES   = MOCKUP_DIR / 'content_files' / 'courses'
+DEFAULT_MIGRATION = MOCKUP_DIR.parent / 'database' / 'versions' / 'migration_user_theme_progress.sql'
+
+TABLE      = 'user_theme_progress'
+PASS_RATIO = 0.8
+WRITE_CHUNK = 5_000                     # summaries per executemany
+
+COLUMNS = ('user_id', 'theme_id', 'curriculum_version', 'demographic', 'completed_courses',
+           'total_courses', 'completed_bitmaps', 'passed_bitmaps', 'skippable_sections',
+           'tests_eligible', 'tests_passed', 'next_item_type', 'next_item_id', 'is_finished')
+
+
+# ---------------------------------------------------------------------------
+# Curriculum
+# ---------------------------------------------------------------------------
+
+class Curriculum:
+    """
+    One theme's roadmap: sections in order, each with its active courses in
+    order. sections: [{'id', 'demographic', 'courses': [course id, ...],
+    'quizTotals': [int or None, ...], 'hasTest'}, ...]
+    """
+
+    def __init__(self, theme_id, sections):
+        self.theme_id = theme_id
+        self.sections = sections
+        self.positions = {course: (s, k) for s, section in enumerate(sections)
+                          for k, course in enumerate(section['courses'])}
+        self.section_positions = {section['id']: s for s, section in enumerate(sections)}
+        text = json.dumps([[s['id'], s['demographic'], s['courses'], s['quizTotals'], s['hasTest']]
+                           for s in sections])
+        self.version = hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+    def visible(self, demographic):
+        return [s for s, section in enumerate(self.sections)
+                if section['demographic'] in ('all', demographic)]
+
+    def passes(self, s, k, quizzes_correct):
+        total = self.sections[s]['quizTotals'][k]
+        return not total or (quizzes_correct or 0) >= PASS_RATIO * total
+
+
+def quiz_totals(course_dir=DEFAULT_COURSES):
+    """{content file name: number of quiz screens} for the course files on disk."""
+    totals = {}
+    for path in Path(course_dir).glob('*.json'):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                screens = json.load(f).get('screens', [])
+        except (OSError, json.JSONDecodeError):
+            continue
+        totals[path.name] = sum(1 for screen in screens if screen.get('type') == 'quiz')
+    return totals
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+
+
+def _has_table(conn, table):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (table,)).fetchone() is not None
+
+
+def load_curricula(conn, course_dir=DEFAULT_COURSES):
+    """{theme id: Curriculum} from theme / section / course / section_test."""
+    totals = quiz_totals(course_dir)
+    demographic = ('s.intended_demographic' if 'intended_demographic' in _columns(conn, 'section')
+                   else "'all'")
+    sections = conn.execute(f'''
+        SELECT s.theme_id, s.id, {demographic},
+               EXISTS (SELECT 1 FROM section_test t WHERE t.section_id = s.id AND t.is_active = 1)
+        FROM section s ORDER BY s.theme_id, s.order_index''').fetchall()
+    courses = {}
+    for section_id, course_id, file_name in conn.execute('''
+            SELECT section_id, id, content_file_name FROM course
+            WHERE is_active = 1 ORDER BY section_id, order_index'''):
+        courses.setdefault(section_id, []).append((course_id, totals.get(file_name)))
+
+    by_theme = {}
+    for theme_id, section_id, intended, has_test in sections:
+        listed = courses.get(section_id, [])
+        by_theme.setdefault(theme_id, []).append({
+            'id':          section_id,
+            'demographic': intended or 'all',
+            'courses':     [c for c, _ in listed],
+            'quizTotals':  [t for _, t in listed],
+            'hasTest':     bool(has_test),
+        })
+    return {theme_id: Curriculum(theme_id, secs) for theme_id, secs in by_theme.items()}
+
+
+# ---------------------------------------------------------------------------
+# Summary
+# ---------------------------------------------------------------------------
+
+def summarize(curriculum, demographic, completed, passed, tests_passed=0, skippable=0):
+    """
+    Summary row values for one (user, theme). completed / passed: one bitmap
+    per section (bit k = k-th course); tests_passed / skippable: bitmaps
+    over sections.
+    """
+    done_count = total = 0
+    tests_eligible = 0
+    next_item = None
+    finished = True
+    section_open = True
+    for s in curriculum.visible(demographic):
+        section = curriculum.sections[s]
+        size = len(section['courses'])
+        full = (1 << size) - 1
+        skip = bool(skippable >> s & 1)
+        done_count += bin(completed[s] & full).count('1')
+        total += size
+
+        if next_item is None and section_open:
+            for k in range(size):
+                if not completed[s] >> k & 1:
+                    next_item = ('course', section['courses'][k])
+                    break
+                if not skip and not passed[s] >> k & 1:
+                    break                   # completed below the bar: the rest stays locked
+
+        section_done = completed[s] & full == full
+        if section['hasTest'] and section_done and not tests_passed >> s & 1:
+            tests_eligible |= 1 << s
+            if next_item is None and section_open:
+                next_item = ('test', section['id'])
+        finished = finished and section_done and (not section['hasTest'] or bool(tests_passed >> s & 1))
+        section_open = section_open and (section_done or skip)
+
+    return {
+        'curriculum_version': curriculum.version,
+        'demographic':        demographic,
+        'completed_courses':  done_count,
+        'total_courses':      total,
+        'completed_bitmaps':  ','.join(f'{b:x}' for b in completed),
+        'passed_bitmaps':     ','.join(f'{b:x}' for b in passed),
+        'skippable_sections': f'{skippable:x}',
+        'tests_eligible':     f'{tests_eligible:x}',
+        'tests_passed':       f'{tests_passed:x}',
+        'next_item_type':     next_item[0] if next_item else None,
+        'next_item_id':       next_item[1] if next_item else None,
+        'is_finished':        int(finished and total > 0),
+    }
+
+
+def _bitmaps(text, count):
+    values = [int(part, 16) for part in text.split(',')] if text else []
+    return (values + [0] * count)[:count]
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class ProgressStore:
+    """user_theme_progress on a connection; curricula are loaded once."""
+
+    def __init__(self, conn, curricula=None, course_dir=DEFAULT_COURSES):
+        self.conn = conn
+        self.ensure_table()
+        self.curricula = curricula if curricula is not None else load_curricula(conn, course_dir)
+        self.course_theme = {course: theme for theme, curriculum in self.curricula.items()
+                             for course in curriculum.positions}
+        self.section_theme = {section: theme for theme, curriculum in self.curricula.items()
+                              for section in curriculum.section_positions}
+        self._demographic_column = 'demographic' in _columns(conn, 'user')
+        self._has_proficiency = _has_table(conn, 'initial_user_section_proficiency')
+
+    def ensure_table(self, migration_path=DEFAULT_MIGRATION):
+        if not _has_table(self.conn, TABLE):
+            statements, _ = translate_script(Path(migration_path).read_text(encoding='utf-8'))
+            with self.conn:
+                for statement in statements:
+                    self.conn.execute(statement)
+
+    # -- reads ---------------------------------------------------------------
+
+    def demographic(self, user_id):
+        if not self._demographic_column:
+            return None
+        row = self.conn.execute('SELECT demographic FROM "user" WHERE id = ?', (user_id,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, user_id, theme_id):
+        """The summary row as a dict, recomputed first if it is missing or out of date."""
+        row = self._row(user_id, theme_id)
+        curriculum = self.curricula[theme_id]
+        demographic = self.demographic(user_id)
+        if row is None or row['curriculum_version'] != curriculum.version or row['demographic'] != demographic:
+            row = self.refresh(user_id, theme_id)
+        return row
+
+    def _row(self, user_id, theme_id):
+        cursor = self.conn.execute(f'SELECT {", ".join(COLUMNS)} FROM {TABLE} WHERE user_id = ? AND theme_id = ?',
+                                   (user_id, theme_id))
+        values = cursor.fetchone()
+        return dict(zip(COLUMNS, values)) if values else None
+
+    # -- writes --------------------------------------------------------------
+
+    def _upsert(self, rows):
+        updates = ', '.join(f'{c} = excluded.{c}' for c in COLUMNS[2:])
+        sql = (f'INSERT INTO {TABLE} ({", ".join(COLUMNS)}, updated_at) '
+               f'VALUES ({", ".join("?" * len(COLUMNS))}, {_NOW_SQL}) '
+               f'ON CONFLICT (user_id, theme_id) DO UPDATE SET {updates}, updated_at = excluded.updated_at')
+        self.conn.executemany(sql, ([row[c] for c in COLUMNS] for row in rows))
+
+    def _state(self, user_id, theme_id):
+        """(completed, passed, tests_passed, skippable) from the stored row, or from the source tables."""
+        curriculum = self.curricula[theme_id]
+        row = self._row(user_id, theme_id)
+        count = len(curriculum.sections)
+        if row is not None and row['curriculum_version'] == curriculum.version:
+            return (_bitmaps(row['completed_bitmaps'], count), _bitmaps(row['passed_bitmaps'], count),
+                    int(row['tests_passed'], 16), int(row['skippable_sections'], 16))
+        return self._source_state(user_id, curriculum)
+
+    def _source_state(self, user_id, curriculum):
+        count = len(curriculum.sections)
+        completed, passed, tests, skippable = [0] * count, [0] * count, 0, 0
+        for course_id, correct in self.conn.execute(
+                'SELECT course_id, quizzes_correct FROM user_course WHERE user_id = ?', (user_id,)):
+            if course_id in curriculum.positions:
+                s, k = curriculum.positions[course_id]
+                completed[s] |= 1 << k
+                if curriculum.passes(s, k, correct):
+                    passed[s] |= 1 << k
+        for (section_id,) in self.conn.execute(
+                'SELECT section_test_id FROM user_section_test WHERE user_id = ? AND passed = 1', (user_id,)):
+            if section_id in curriculum.section_positions:
+                tests |= 1 << curriculum.section_positions[section_id]
+        if self._has_proficiency:
+            for section_id, seen, correct in self.conn.execute(
+                    'SELECT section_id, questions_seen, questions_correct FROM initial_user_section_proficiency '
+                    'WHERE user_id = ?', (user_id,)):
+                if section_id in curriculum.section_positions and seen and correct >= PASS_RATIO * seen:
+                    skippable |= 1 << curriculum.section_positions[section_id]
+        return completed, passed, tests, skippable
+
+    def _store(self, user_id, theme_id, state):
+        row = {'user_id': user_id, 'theme_id': theme_id,
+               **summarize(self.curricula[theme_id], self.demographic(user_id), *state)}
+        with self.conn:
+            self._upsert([row])
+        return row
+
+    def refresh(self, user_id, theme_id):
+        """Recompute one summary from the source tables."""
+        return self._store(user_id, theme_id, self._source_state(user_id, self.curricula[theme_id]))
+
+    def on_course_completed(self, user_id, course_id, quizzes_correct):
+        """Apply a user_course write. Returns the new summary, or None for a course on no roadmap."""
+        theme_id = self.course_theme.get(course_id)
+        if theme_id is None:
+            return None
+        curriculum = self.curricula[theme_id]
+        completed, passed, tests, skippable = self._state(user_id, theme_id)
+        s, k = curriculum.positions[course_id]
+        completed[s] |= 1 << k
+        if curriculum.passes(s, k, quizzes_correct):
+            passed[s] |= 1 << k
+        else:
+            passed[s] &= ~(1 << k)          # a retake below the bar replaces the earlier score
+        return self._store(user_id, theme_id, (completed, passed, tests, skippable))
+
+    def on_section_test(self, user_id, section_id, is_passed):
+        """Apply a user_section_test write. Returns the new summary, or None for an unknown section."""
+        theme_id = self.section_theme.get(section_id)
+        if theme_id is None:
+            return None
+        completed, passed, tests, skippable = self._state(user_id, theme_id)
+        bit = 1 << self.curricula[theme_id].section_positions[section_id]
+        tests = tests | bit if is_passed else tests & ~bit
+        return self._store(user_id, theme_id, (completed, passed, tests, skippable))
+
+    # -- batch ---------------------------------------------------------------
+
+    def rebuild(self):
+        """
+        Recompute every summary: one pass over each source table sorted by
+        user, holding one user's state at a time. A summary exists for every
+        enrolled theme and every theme with progress. Returns the row count.
+        """
+        streams = [
+            ('course', 'SELECT user_id, course_id, quizzes_correct FROM user_course ORDER BY user_id'),
+            ('test', 'SELECT user_id, section_test_id, passed FROM user_section_test ORDER BY user_id'),
+            ('enrolled', 'SELECT user_id, theme_id, NULL FROM user_theme_enrollment ORDER BY user_id'),
+        ]
+        if self._has_proficiency:
+            streams.append(('proficiency', 'SELECT user_id, section_id, questions_correct * 1.0 / questions_seen '
+                                           'FROM initial_user_section_proficiency WHERE questions_seen > 0 '
+                                           'ORDER BY user_id'))
+        count, batch = 0, []
+        with self.conn:
+            self.conn.execute(f'DELETE FROM {TABLE}')
+            for user_id, events in _merge_by_user(self.conn, streams):
+                for row in self._user_summaries(user_id, events):
+                    batch.append(row)
+                    if len(batch) == WRITE_CHUNK:
+                        self._upsert(batch)
+                        count += len(batch)
+                        batch = []
+            if batch:
+                self._upsert(batch)
+                count += len(batch)
+        return count
+
+    def _user_summaries(self, user_id, events):
+        states = {}
+
+        def state(theme_id):
+            if theme_id not in states:
+                n = len(self.curricula[theme_id].sections)
+                states[theme_id] = [[0] * n, [0] * n, 0, 0]
+            return states[theme_id]
+
+        for kind, key, value in events:
+            theme_id = (self.course_theme.get(key) if kind == 'course'
+                        else key if kind == 'enrolled' else self.section_theme.get(key))
+            if theme_id not in self.curricula:
+                continue
+            curriculum, current = self.curricula[theme_id], state(theme_id)
+            if kind == 'course':
+                s, k = curriculum.positions[key]
+                current[0][s] |= 1 << k
+                if curriculum.passes(s, k, value):
+                    current[1][s] |= 1 << k
+            elif kind == 'test' and value:
+                current[2] |= 1 << curriculum.section_positions[key]
+            elif kind == 'proficiency' and value >= PASS_RATIO:
+                current[3] |= 1 << curriculum.section_positions[key]
+
+        demographic = self.demographic(user_id) if states else None
+        for theme_id, current in states.items():
+            yield {'user_id': user_id, 'theme_id': theme_id,
+                   **summarize(self.curricula[theme_id], demographic, *current)}
+
+
+_NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+
+def _merge_by_user(conn, streams):
+    """
+    Yield (user id, [(kind, key, value), ...]) per user, merging the sorted
+    streams. Each stream runs on its own cursor.
+    """
+    cursors = []
+    for kind, sql in streams:
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        cursors.append((kind, cursor, cursor.fetchone()))
+    while True:
+        heads = [row[0].upper() for _, _, row in cursors if row is not None]
+        if not heads:
+            return
+        user = min(heads)
+        events, advanced = [], []
+        for kind, cursor, row in cursors:
+            while row is not None and row[0].upper() == user:
+                events.append((kind, row[1], row[2]))
+                row = cursor.fetchone()
+            advanced.append((kind, cursor, row))
+        cursors = advanced
+        yield user, events
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DB
+    if not db_path.exists():
+        print(f"Error: {db_path} not found — build it with sqlite_db.py or synthetic_data.py")
+        sys.exit(1)
+
+    print(f"Rebuilding roadmap progress in: {db_path}")
+    conn = connect(db_path)
+    try:
+        start = time.perf_counter()
+        store = ProgressStore(conn)
+        count = store.rebuild()
+        seconds = time.perf_counter() - start
+        finished = conn.execute(f'SELECT COUNT(*) FROM {TABLE} WHERE is_finished = 1').fetchone()[0]
+        sample = conn.execute(f'SELECT user_id, theme_id FROM {TABLE} LIMIT 1').fetchone()
+        row = store.get(*sample) if sample else None
+    except sqlite3.Error as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    print(f"  - Themes:     {len(store.curricula)}")
+    print(f"  - Summaries:  {count:,} ({finished:,} finished) in {seconds:.2f}s")
+    if row:
+        print(f"  - Sample:     {row['completed_courses']}/{row['total_courses']} courses, "
+              f"next {row['next_item_type']} {row['next_item_id']}, bitmaps {row['completed_bitmaps']}")
+    print(f"✓ Successfully updated {TABLE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Roadmap States
+Evaluates the roadmap rules (screens/4-roadmap/doc.md) for a whole cohort of
+users at once: one state per (user, course) and per (user, section test),
+plus each user's "Continue Learning" item — e.g. to precompute every
+roadmap after a curriculum change.
+
+A theme's curriculum (roadmap_progress.load_curricula) is flattened into
+index arrays over its courses in roadmap order: section of each course and
+the first course of each section. A cohort is a set of U × C matrices
+(completed, quizzes correct, days since completion) and U × S matrices
+(skippable, test passed, section visible). Every rule is then an array
+expression over all users together, with the same outcome as
+roadmap_progress.summarize:
+
+  passed    completed and quizzes_correct >= PASS_RATIO of the course's quizzes
+  visible   section.intended_demographic is 'all' or the user's demographic
+  open      every earlier visible section is completed or skippable
+  unlocked  section open, not completed, and every earlier course in the
+            section passed (or the section is skippable)
+  stale     completed (or last reviewed) more than stale_days ago
+
+States (uint8): LOCKED, UNLOCKED, COMPLETED, STALE, HIDDEN. Section tests
+use LOCKED / UNLOCKED / COMPLETED (passed), and HIDDEN for sections without
+an active test. Requires NumPy.
+
+    python roadmap_states.py [db path] [--stale-days N]
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from roadmap_progress import PASS_RATIO, load_curricula
+from sqlite_db import DEFAULT_DB, connect
+
+
+LOCKED, UNLOCKED, COMPLETED, STALE, HIDDEN = range(5)
+STATE_NAMES = ('locked', 'unlocked', 'completed', 'stale', 'hidden')
+
+DEMOGRAPHICS       = ('child', 'teen', 'adult')   # codes 0..2; 'all' = -1, unknown user = -2
+DEFAULT_STALE_DAYS = 14
+CHUNK_USERS        = 50_000             # users evaluated per batch
+
+
+# ---------------------------------------------------------------------------
+# Curriculum layout
+# ---------------------------------------------------------------------------
+
+def _demographic_code(value, default):
+    return DEMOGRAPHICS.index(value) if value in DEMOGRAPHICS else default
+
+
+class Layout:
+    """Index arrays for one theme's curriculum, courses in roadmap order."""
+
+    def __init__(self, curriculum):
+        self.curriculum = curriculum
+        sections = curriculum.sections
+        sizes = np.array([len(s['courses']) for s in sections], dtype=np.int64)
+        self.course_ids = [c for s in sections for c in s['courses']]
+        self.section_ids = [s['id'] for s in sections]
+        self.section_start = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64)
+        self.section_end = self.section_start + sizes
+        self.section_of = np.repeat(np.arange(len(sections)), sizes)
+        self.quiz_total = np.array([t or 0 for s in sections for t in s['quizTotals']], dtype=np.float64)
+        self.has_test = np.array([s['hasTest'] for s in sections], dtype=bool)
+        self.section_demographic = np.array([_demographic_code(s['demographic'], -1) for s in sections])
+        self.course_index = {c: i for i, c in enumerate(self.course_ids)}
+        self.section_index = {s: i for i, s in enumerate(self.section_ids)}
+
+    @property
+    def shape(self):
+        return len(self.course_ids), len(self.section_ids)
+
+
+# ---------------------------------------------------------------------------
+# Cohort
+# ---------------------------------------------------------------------------
+
+def _placeholders(values):
+    return ', '.join('?' * len(values))
+
+
+def load_cohort(conn, layout, user_ids, now=None):
+    """
+    {'users', 'completed', 'correct', 'age_days', 'skippable', 'tests_passed',
+    'demographic'} for the given users, read in one query per source table.
+    """
+    now = now or datetime.now()
+    users = list(user_ids)
+    row_of = {u.upper(): i for i, u in enumerate(users)}
+    n_courses, n_sections = layout.shape
+    completed = np.zeros((len(users), n_courses), dtype=bool)
+    correct = np.zeros((len(users), n_courses), dtype=np.float64)
+    age_days = np.zeros((len(users), n_courses), dtype=np.float64)
+    skippable = np.zeros((len(users), n_sections), dtype=bool)
+    tests_passed = np.zeros((len(users), n_sections), dtype=bool)
+    demographic = np.full(len(users), -2)
+    if not users or not n_courses:
+        return dict(users=users, completed=completed, correct=correct, age_days=age_days,
+                    skippable=skippable, tests_passed=tests_passed, demographic=demographic)
+
+    today = conn.execute('SELECT julianday(?)', (now.isoformat(sep=' '),)).fetchone()[0]
+    conn.execute('CREATE TEMP TABLE IF NOT EXISTS cohort_user (id TEXT PRIMARY KEY COLLATE NOCASE)')
+    with conn:
+        conn.execute('DELETE FROM cohort_user')
+        conn.executemany('INSERT OR IGNORE INTO cohort_user VALUES (?)', ((u,) for u in users))
+
+    columns = {r[1] for r in conn.execute('PRAGMA table_info("user_course")')}
+    reviewed = ('COALESCE(uc.last_reviewed_at, uc.completed_at)' if 'last_reviewed_at' in columns
+                else 'uc.completed_at')
+    rows, cols, scores, ages = [], [], [], []
+    for user_id, course_id, quizzes_correct, completed_day in conn.execute(f'''
+            SELECT uc.user_id, uc.course_id, uc.quizzes_correct, julianday({reviewed})
+            FROM user_course uc JOIN cohort_user cu ON cu.id = uc.user_id
+            WHERE uc.course_id IN ({_placeholders(layout.course_ids)})''', layout.course_ids):
+        rows.append(row_of[user_id.upper()])
+        cols.append(layout.course_index[course_id])
+        scores.append(quizzes_correct or 0)
+        ages.append(today - completed_day if completed_day is not None else 0.0)
+    completed[rows, cols] = True
+    correct[rows, cols] = scores
+    age_days[rows, cols] = ages
+
+    section_args = layout.section_ids
+    rows, cols = [], []
+    for user_id, section_id in conn.execute(f'''
+            SELECT t.user_id, t.section_test_id FROM user_section_test t
+            JOIN cohort_user cu ON cu.id = t.user_id
+            WHERE t.passed = 1 AND t.section_test_id IN ({_placeholders(section_args)})''', section_args):
+        rows.append(row_of[user_id.upper()])
+        cols.append(layout.section_index[section_id])
+    tests_passed[rows, cols] = True
+
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if 'initial_user_section_proficiency' in tables:
+        rows, cols = [], []
+        for user_id, section_id in conn.execute(f'''
+                SELECT p.user_id, p.section_id FROM initial_user_section_proficiency p
+                JOIN cohort_user cu ON cu.id = p.user_id
+                WHERE p.questions_seen > 0 AND p.questions_correct >= {PASS_RATIO} * p.questions_seen
+                  AND p.section_id IN ({_placeholders(section_args)})''', section_args):
+            rows.append(row_of[user_id.upper()])
+            cols.append(layout.section_index[section_id])
+        skippable[rows, cols] = True
+
+    if 'demographic' in {r[1] for r in conn.execute('PRAGMA table_info("user")')}:
+        for user_id, value in conn.execute('''
+                SELECT u.id, u.demographic FROM "user" u JOIN cohort_user cu ON cu.id = u.id'''):
+            demographic[row_of[user_id.upper()]] = _demographic_code(value, -2)
+
+    return dict(users=users, completed=completed, correct=correct, age_days=age_days,
+                skippable=skippable, tests_passed=tests_passed, demographic=demographic)
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+def _section_counts(layout, values):
+    """U × S count of True values per section (works for empty sections)."""
+    cumulative = np.zeros((values.shape[0], values.shape[1] + 1), dtype=np.int64)
+    np.cumsum(values, axis=1, out=cumulative[:, 1:])
+    return cumulative[:, layout.section_end] - cumulative[:, layout.section_start]
+
+
+def evaluate(layout, cohort, stale_days=DEFAULT_STALE_DAYS):
+    """
+    {'courses': U × C states, 'tests': U × S states, 'next': U indices into
+    next_items() (-1 = nothing left), 'completedCourses', 'totalCourses'}.
+    """
+    completed, skippable = cohort['completed'], cohort['skippable']
+    users = completed.shape[0]
+    n_courses, n_sections = layout.shape
+    sizes = layout.section_end - layout.section_start
+
+    total = layout.quiz_total
+    passed = completed & ((total == 0) | (cohort['correct'] >= PASS_RATIO * total))
+
+    demographic = cohort['demographic'][:, None]
+    visible = (layout.section_demographic == -1) | (layout.section_demographic == demographic)
+    section_done = _section_counts(layout, completed) == sizes
+    clears = section_done | skippable | ~visible
+    open_ = np.ones((users, n_sections), dtype=bool)
+    open_[:, 1:] = np.logical_and.accumulate(clears, axis=1)[:, :-1]
+
+    # Earlier courses in the same section that are not passed: exclusive
+    # prefix count of failures, minus the count before the section start
+    failures = np.zeros((users, n_courses + 1), dtype=np.int64)
+    np.cumsum(~passed, axis=1, out=failures[:, 1:])
+    blocked = failures[:, :-1] - failures[:, layout.section_start[layout.section_of]] > 0
+
+    course_open = open_[:, layout.section_of] & visible[:, layout.section_of]
+    unlocked = course_open & ~completed & (~blocked | skippable[:, layout.section_of])
+
+    courses = np.full((users, n_courses), LOCKED, dtype=np.uint8)
+    courses[unlocked] = UNLOCKED
+    courses[completed] = COMPLETED
+    courses[completed & (cohort['age_days'] > stale_days)] = STALE
+    courses[~visible[:, layout.section_of]] = HIDDEN
+
+    tests_passed = cohort['tests_passed']
+    tests = np.full((users, n_sections), LOCKED, dtype=np.uint8)
+    tests[open_ & section_done & ~tests_passed] = UNLOCKED
+    tests[tests_passed] = COMPLETED
+    tests[~visible | ~layout.has_test] = HIDDEN
+
+    # Roadmap order interleaves each section's test after its courses
+    items = np.concatenate((courses == UNLOCKED, tests == UNLOCKED), axis=1)[:, _item_order(layout)]
+    found = items.any(axis=1)
+    next_item = np.where(found, items.argmax(axis=1), -1)
+
+    course_visible = visible[:, layout.section_of]
+    return {
+        'courses':          courses,
+        'tests':            tests,
+        'next':             next_item,
+        'completedCourses': (completed & course_visible).sum(axis=1),
+        'totalCourses':     course_visible.sum(axis=1),
+    }
+
+
+def _item_order(layout):
+    """Column order of [courses | tests] that puts each test after its section's courses."""
+    n_courses, n_sections = layout.shape
+    order = []
+    for s in range(n_sections):
+        order.extend(range(layout.section_start[s], layout.section_end[s]))
+        order.append(n_courses + s)
+    return np.array(order, dtype=np.int64)
+
+
+def next_items(layout):
+    """[(item type, id)] indexed by evaluate()['next']."""
+    items = []
+    for s, section_id in enumerate(layout.section_ids):
+        items.extend(('course', layout.course_ids[c])
+                     for c in range(layout.section_start[s], layout.section_end[s]))
+        items.append(('test', section_id))
+    return items
+
+
+def cohort_users(conn, theme_id):
+    """Enrolled users plus users with progress in the theme, sorted."""
+    return [row[0] for row in conn.execute('''
+        SELECT user_id FROM user_theme_enrollment WHERE theme_id = ?
+        UNION
+        SELECT uc.user_id FROM user_course uc
+        JOIN course c ON c.id = uc.course_id JOIN section s ON s.id = c.section_id
+        WHERE s.theme_id = ?
+        ORDER BY 1''', (theme_id, theme_id))]
+
+
+def evaluate_theme(conn, layout, stale_days=DEFAULT_STALE_DAYS, chunk=CHUNK_USERS, now=None):
+    """Yield (user ids, evaluate() result) per chunk of the theme's cohort."""
+    users = cohort_users(conn, layout.curriculum.theme_id)
+    for start in range(0, len(users), chunk):
+        cohort = load_cohort(conn, layout, users[start:start + chunk], now)
+        yield cohort['users'], evaluate(layout, cohort, stale_days)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    args = sys.argv[1:]
+    stale_days = DEFAULT_STALE_DAYS
+    if '--stale-days' in args:
+        i = args.index('--stale-days')
+        try:
+            stale_days = int(args[i + 1])
+        except (IndexError, ValueError):
+            print("Error: --stale-days needs a number")
+            sys.exit(1)
+        del args[i:i + 2]
+    db_path = Path(args[0]) if args else DEFAULT_DB
+    if not db_path.exists():
+        print(f"Error: {db_path} not found — build it with sqlite_db.py or synthetic_data.py")
+        sys.exit(1)
+
+    print(f"Evaluating roadmap states in: {db_path} (stale after {stale_days} days)")
+    conn = connect(db_path)
+    try:
+        curricula = load_curricula(conn)
+        totals = np.zeros(len(STATE_NAMES), dtype=np.int64)
+        users = evaluated = 0
+        seconds = 0.0
+        for theme_id, curriculum in curricula.items():
+            layout = Layout(curriculum)
+            start = time.perf_counter()
+            for chunk_users, result in evaluate_theme(conn, layout, stale_days):
+                users += len(chunk_users)
+                evaluated += result['courses'].size
+                totals += np.bincount(result['courses'].ravel(), minlength=len(STATE_NAMES))
+            seconds += time.perf_counter() - start
+    finally:
+        conn.close()
+
+    print(f"  - Themes:     {len(curricula)}")
+    print(f"  - Roadmaps:   {users:,} (user, theme) in {seconds:.2f}s")
+    print(f"  - Courses:    {evaluated:,} states — " +
+          ', '.join(f"{name} {count:,}" for name, count in zip(STATE_NAMES, totals)))
+    print("✓ Successfully evaluated roadmap states")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Bulk-Load Seeding
+Turns the one-row-per-statement data section of pipeline.sql (or any row
+stream) into a form SQL Server loads in bulk, table by table in foreign-key
+order.
+
+Two output modes:
+
+  batched  generated/pipeline_bulk.sql — the schema part of pipeline.sql,
+           then per table multi-row INSERT ... VALUES statements of
+           batch_size rows (SQL Server caps a VALUES list at 1000), grouped
+           into explicit transactions and GO batches, under SET NOCOUNT ON.
+
+  csv      generated/bulk/ — <table>.csv (UTF-8, header row, RFC 4180
+           quoting), <table>.fmt (non-XML format file mapping CSV fields to
+           table columns, so defaulted columns may be left out) and load.sql:
+           the schema part, then one BULK INSERT per table with TABLOCK, and
+           finally WITH CHECK CHECK CONSTRAINT so the foreign keys BULK INSERT
+           skipped are verified and trusted again. load.sql is run with
+           sqlcmd (-v DataDir="<folder as seen by the server>").
+
+CSV holds values, not expressions, so GETDATE() / DATEADD(...) /
+CAST(... AS DATE) in the seed rows are evaluated against one reference time
+(the moment of export unless `now` is given).
+
+Row producers (e.g. synthetic data generators) use the writers directly:
+    with BatchedInsertWriter(out, batch_size=500) as w:
+        w.write_rows('user_course', columns, rows)      # rows of Python values
+"""
+
+import csv
+import re
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+
+MOCKUP_DIR         = Path(__file__).resolve().parent
+DEFAULT_SQL        = MOCKUP_DIR / 'pipeline.sql'
+DEFAULT_BATCHED    = MOCKUP_DIR / 'generated' / 'pipeline_bulk.sql'
+DEFAULT_CSV_DIR    = MOCKUP_DIR / 'generated' / 'bulk'
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE     = 1000               # SQL Server limit on rows in one VALUES list
+BATCHES_PER_GO     = 20                 # statements sent to the server per GO batch
+FORMAT_FILE_VERSION = '14.0'
+
+_CREATE_TABLE = re.compile(r'^CREATE TABLE\s+(\[?\w+\]?)\s*\((.*?)^\);', re.M | re.S)
+_REFERENCES   = re.compile(r'REFERENCES\s+(\[?\w+\]?)\s*\(', re.I)
+_INSERT       = re.compile(r'^INSERT INTO\s+(\[?\w+\]?)\s*\(([^)]*)\)\s*VALUES\s*', re.I)
+_NON_COLUMNS  = ('PRIMARY', 'FOREIGN', 'CONSTRAINT', 'UNIQUE', 'CHECK', '--', ')')
+
+
+def bare(name):
+    """Table name without T-SQL brackets: [user] → user."""
+    return name.strip('[]')
+
+
+def quoted(name):
+    """Table name safe to use in T-SQL (user is a reserved word)."""
+    return f"[{bare(name)}]"
+
+
+# ---------------------------------------------------------------------------
+# Schema: columns and foreign-key order
+# ---------------------------------------------------------------------------
+
+def parse_schema(sql_text):
+    """
+    { table: { 'columns': [column, ...] (in CREATE order),
+               'references': {table, ...} } } for every CREATE TABLE,
+    in CREATE order.
+    """
+    tables = {}
+    for match in _CREATE_TABLE.finditer(sql_text):
+        columns, references = [], set()
+        for line in match.group(2).splitlines():
+            line = line.strip()
+            if not line or line.upper().startswith(_NON_COLUMNS):
+                references.update(bare(t) for t in _REFERENCES.findall(line))
+                continue
+            columns.append(line.split()[0])
+            references.update(bare(t) for t in _REFERENCES.findall(line))
+        name = bare(match.group(1))
+        references.discard(name)        # self references: row order handles them
+        tables[name] = {'columns': columns, 'references': references}
+    return tables
+
+
+def load_order(schema, tables=None):
+    """
+    Tables in foreign-key dependency order (referenced tables first); ties
+    keep CREATE order. tables limits the result to the given names.
+    """
+    wanted = set(tables if tables is not None else schema)
+    order, done = [], set()
+
+    def visit(name, path=()):
+        if name in done:
+            return
+        if name in path:
+            raise ValueError(f"foreign-key cycle: {' → '.join(path + (name,))}")
+        for parent in sorted(schema.get(name, {}).get('references', ()), key=list(schema).index):
+            visit(parent, path + (name,))
+        done.add(name)
+        order.append(name)
+
+    for name in schema:
+        visit(name)
+    order.extend(name for name in sorted(wanted - set(schema)) if name not in done)
+    return [name for name in order if name in wanted]
+
+
+# ---------------------------------------------------------------------------
+# Seed rows: single-row INSERT statements → (table, columns, literals)
+# ---------------------------------------------------------------------------
+
+def split_values(text):
+    """
+    Split a VALUES (...) tuple body into SQL literal/expression strings,
+    respecting quotes ('' escapes) and nested parentheses.
+    """
+    values, depth, start, i, in_quote = [], 0, 0, 0, False
+    while i < len(text):
+        ch = text[i]
+        if in_quote:
+            if ch == "'":
+                if i + 1 < len(text) and text[i + 1] == "'":
+                    i += 1
+                else:
+                    in_quote = False
+        elif ch == "'":
+            in_quote = True
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            values.append(text[start:i].strip())
+            start = i + 1
+        i += 1
+    values.append(text[start:].strip())
+    return values
+
+
+def parse_inserts(sql_text):
+    """
+    Yield (table, columns, literals) for each single-row INSERT statement in
+    sql_text, in file order.
+    """
+    for line in sql_text.splitlines():
+        match = _INSERT.match(line)
+        if not match:
+            continue
+        body = line[match.end():].rstrip()
+        if not (body.startswith('(') and body.endswith(');')):
+            raise ValueError(f"unsupported INSERT form: {line[:120]}")
+        columns = tuple(c.strip() for c in match.group(2).split(','))
+        literals = tuple(split_values(body[1:-2]))
+        if len(literals) != len(columns):
+            raise ValueError(f"{bare(match.group(1))}: {len(columns)} columns but "
+                             f"{len(literals)} values in: {line[:120]}")
+        yield bare(match.group(1)), columns, literals
+
+
+def split_pipeline(sql_text):
+    """(schema part, data part) — the data part starts after the last GO before the first INSERT."""
+    first_insert = _find_first_insert(sql_text)
+    if first_insert < 0:
+        return sql_text, ''
+    go = sql_text.rfind('\nGO\n', 0, first_insert)
+    cut = go + len('\nGO\n') if go >= 0 else 0
+    return sql_text[:cut], sql_text[cut:]
+
+
+def _find_first_insert(sql_text):
+    match = re.search(r'^INSERT INTO ', sql_text, re.M)
+    return match.start() if match else -1
+
+
+def group_rows(rows):
+    """
+    { table: (columns, [literals, ...]) } keeping file order within a table.
+    Rows of one table must share a column list.
+    """
+    grouped = {}
+    for table, columns, literals in rows:
+        if table not in grouped:
+            grouped[table] = (columns, [])
+        elif grouped[table][0] != columns:
+            raise ValueError(f"{table}: rows use different column lists")
+        grouped[table][1].append(literals)
+    return grouped
+
+
+# ---------------------------------------------------------------------------
+# Values
+# ---------------------------------------------------------------------------
+
+def to_literal(value):
+    """T-SQL literal for a Python value (str → N'...', UUID → '...')."""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    if isinstance(value, uuid.UUID):
+        return f"'{str(value).upper()}'"
+    if isinstance(value, datetime):
+        return f"'{value.isoformat(sep=' ', timespec='milliseconds')}'"
+    if isinstance(value, date):
+        return f"'{value.isoformat()}'"
+    return "N'" + str(value).replace("'", "''") + "'"
+
+
+_DATEADD = re.compile(r'^DATEADD\(\s*(\w+)\s*,\s*(-?\d+)\s*,\s*(.+)\)$', re.I | re.S)
+_CAST_DATE = re.compile(r'^CAST\(\s*(.+?)\s+AS\s+DATE\s*\)$', re.I | re.S)
+_DATEADD_UNITS = {
+    'DAY': 'days', 'DD': 'days', 'HOUR': 'hours', 'HH': 'hours',
+    'MINUTE': 'minutes', 'MI': 'minutes', 'SECOND': 'seconds', 'SS': 'seconds',
+    'WEEK': 'weeks', 'WK': 'weeks',
+}
+
+
+def literal_value(text, now):
+    """
+    Python value of a seed-row literal or date expression, with GETDATE()
+    taken as now. Raises ValueError for expressions it does not know.
+    """
+    text = text.strip()
+    upper = text.upper()
+    if upper == 'NULL':
+        return None
+    if text.startswith("N'") or text.startswith("'"):
+        return text[text.index("'") + 1:-1].replace("''", "'")
+    if re.fullmatch(r'-?\d+', text):
+        return int(text)
+    if re.fullmatch(r'-?\d*\.\d+', text):
+        return Decimal(text)
+    if upper in ('GETDATE()', 'SYSDATETIME()', 'CURRENT_TIMESTAMP'):
+        return now
+    match = _CAST_DATE.match(text)
+    if match:
+        value = literal_value(match.group(1), now)
+        return value.date() if isinstance(value, datetime) else value
+    match = _DATEADD.match(text)
+    if match:
+        unit = _DATEADD_UNITS.get(match.group(1).upper())
+        if unit is None:
+            raise ValueError(f"unsupported DATEADD unit: {text}")
+        return literal_value(match.group(3), now) + timedelta(**{unit: int(match.group(2))})
+    raise ValueError(f"unsupported expression: {text}")
+
+
+def csv_field(value):
+    """CSV text for a Python value, in the form BULK INSERT parses."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, uuid.UUID):
+        return str(value).upper()
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ', timespec='milliseconds')
+    return str(value)
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+class BatchedInsertWriter:
+    """
+    Streams rows as multi-row INSERT statements to the text stream out.
+    Rows are buffered per table only up to batch_size; every BATCHES_PER_GO
+    statements the transaction is committed and a GO ends the batch, so
+    neither the client nor the server holds an unbounded script.
+    """
+
+    def __init__(self, out, batch_size=DEFAULT_BATCH_SIZE, batches_per_go=BATCHES_PER_GO):
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be 1-{MAX_BATCH_SIZE}, got {batch_size}")
+        self.out = out
+        self.batch_size = batch_size
+        self.batches_per_go = batches_per_go
+        self.statements = 0
+        self.rows = 0
+        self._pending = 0               # statements in the open transaction
+        self.out.write('SET NOCOUNT ON;\nSET XACT_ABORT ON;\nGO\n')
+
+    def write_literals(self, table, columns, literal_rows):
+        """Write rows already rendered as SQL literals (see parse_inserts); returns the row count."""
+        header = f"INSERT INTO {quoted(table)} ({', '.join(columns)}) VALUES\n"
+        rows_before, batch = self.rows, []
+        for literals in literal_rows:
+            batch.append(literals)
+            if len(batch) == self.batch_size:
+                self._statement(header, batch)
+                batch = []
+        if batch:
+            self._statement(header, batch)
+        self._commit()
+        return self.rows - rows_before
+
+    def write_rows(self, table, columns, rows):
+        """Write rows of Python values; returns the row count."""
+        return self.write_literals(table, columns, (tuple(map(to_literal, row)) for row in rows))
+
+    def _statement(self, header, batch):
+        if not self._pending:
+            self.out.write('BEGIN TRANSACTION;\n')
+        self.out.write(header)
+        self.out.write(',\n'.join(f"    ({', '.join(literals)})" for literals in batch))
+        self.out.write(';\n')
+        self.statements += 1
+        self.rows += len(batch)
+        self._pending += 1
+        if self._pending >= self.batches_per_go:
+            self._commit()
+
+    def _commit(self):
+        if self._pending:
+            self.out.write('COMMIT;\nGO\n')
+            self._pending = 0
+
+    def close(self):
+        self._commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_format_file(path, table_columns, csv_columns):
+    """
+    Non-XML BCP format file: CSV field i → the table column of the same name
+    (ordinal from CREATE order). Columns absent from the CSV keep defaults.
+    """
+    lines = [FORMAT_FILE_VERSION, str(len(csv_columns))]
+    for n, column in enumerate(csv_columns, start=1):
+        terminator = r'\r\n' if n == len(csv_columns) else ','
+        ordinal = table_columns.index(column) + 1
+        lines.append(f'{n:<4}SQLCHAR  0  0  "{terminator}"  {ordinal:<4}{column:<28}""')
+    Path(path).write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+class CsvTableWriter:
+    """
+    Writes one table's rows to <out_dir>/<table>.csv plus its format file;
+    collects the BULK INSERT statements for load.sql.
+    """
+
+    def __init__(self, out_dir, schema, batch_size=None):
+        self.out_dir = Path(out_dir)
+        self.schema = schema
+        self.batch_size = batch_size
+        self.tables = []                # (table, rows written)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+    def write_rows(self, table, columns, rows):
+        if table not in self.schema:
+            raise ValueError(f"{table}: not in schema")
+        unknown = [c for c in columns if c not in self.schema[table]['columns']]
+        if unknown:
+            raise ValueError(f"{table}: unknown columns {', '.join(unknown)}")
+
+        count = 0
+        with open(self.out_dir / f"{table}.csv", 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, lineterminator='\r\n')
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow([csv_field(v) for v in row])
+                count += 1
+        write_format_file(self.out_dir / f"{table}.fmt", self.schema[table]['columns'], columns)
+        self.tables.append((table, count))
+        return count
+
+    def load_script(self, schema_sql=''):
+        options = ["FORMAT = 'CSV'", 'FIRSTROW = 2', "CODEPAGE = '65001'", 'TABLOCK']
+        if self.batch_size:
+            options.append(f'BATCHSIZE = {self.batch_size}')
+        parts = [schema_sql, '-- BULK LOAD (sqlcmd -v DataDir="<folder as seen by the server>")\n',
+                 'SET NOCOUNT ON;\nGO\n']
+        for table, _ in self.tables:
+            parts.append(
+                f"BULK INSERT {quoted(table)}\n"
+                f"    FROM '$(DataDir)\\{table}.csv'\n"
+                f"    WITH ({', '.join(options)},\n"
+                f"          FORMATFILE = '$(DataDir)\\{table}.fmt');\nGO\n")
+        for table, _ in self.tables:
+            parts.append(f"ALTER TABLE {quoted(table)} WITH CHECK CHECK CONSTRAINT ALL;\n")
+        parts.append('GO\n')
+        return ''.join(parts)
+
+
+# ---------------------------------------------------------------------------
+# pipeline.sql conversion
+# ---------------------------------------------------------------------------
+
+def _ordered_tables(sql_text):
+    schema_sql, data_sql = split_pipeline(sql_text)
+    schema = parse_schema(schema_sql)
+    grouped = group_rows(parse_inserts(data_sql))
+    return schema_sql, schema, [(t, *grouped[t]) for t in load_order(schema, grouped)]
+
+
+def export_batched(sql_path=DEFAULT_SQL, output_path=DEFAULT_BATCHED, batch_size=DEFAULT_BATCH_SIZE):
+    """Write the batched-INSERT form of sql_path. Returns {table: rows}."""
+    schema_sql, _, tables = _ordered_tables(Path(sql_path).read_text(encoding='utf-8'))
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as out:
+        out.write(schema_sql)
+        out.write('\n-- BULK DATA INSERTS (foreign-key order, '
+                  f'{batch_size} rows per statement)\n')
+        with BatchedInsertWriter(out, batch_size) as writer:
+            for table, columns, rows in tables:
+                writer.write_literals(table, columns, rows)
+    return {table: len(rows) for table, _, rows in tables}
+
+
+def export_csv(sql_path=DEFAULT_SQL, out_dir=DEFAULT_CSV_DIR, batch_size=None, now=None):
+    """Write CSV + format files + load.sql for sql_path. Returns {table: rows}."""
+    now = now or datetime.now().replace(microsecond=0)
+    schema_sql, schema, tables = _ordered_tables(Path(sql_path).read_text(encoding='utf-8'))
+    writer = CsvTableWriter(out_dir, schema, batch_size)
+    for table, columns, rows in tables:
+        writer.write_rows(table, columns, ([literal_value(v, now) for v in row] for row in rows))
+    (Path(out_dir) / 'load.sql').write_text(writer.load_script(schema_sql), encoding='utf-8')
+    return dict(writer.tables)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    args = sys.argv[1:]
+    use_csv = '--csv' in args
+    batch_size = DEFAULT_BATCH_SIZE
+    if '--batch-size' in args:
+        try:
+            batch_size = int(args[args.index('--batch-size') + 1])
+        except (IndexError, ValueError):
+            print("Error: --batch-size needs a number")
+            sys.exit(1)
+
+    print(f"Loading seed SQL from: {DEFAULT_SQL}")
+    try:
+        if use_csv:
+            counts = export_csv(batch_size=batch_size)
+            target = DEFAULT_CSV_DIR
+        else:
+            counts = export_batched(batch_size=batch_size)
+            target = DEFAULT_BATCHED
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+
+    print(f"  - Tables:     {len(counts)}")
+    print(f"  - Rows:       {sum(counts.values())}")
+    print(f"  - Load order: {', '.join(counts)}")
+    print(f"✓ Successfully generated {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Medicalogy SQLite Stand-in
+Builds a SQLite database file with the tables, keys and constraints of the
+SQL Server schema, loaded with the seed rows of pipeline.sql — so queries
+can be tried and benchmarked locally or in CI without a SQL Server
+instance.
+
+The T-SQL is translated, not hand-maintained:
+  - the script is split on GO; server statements (USE, IF ... CREATE/DROP
+    DATABASE, PRINT, SET) are skipped, CREATE TABLE / CREATE INDEX are kept
+  - [user] → "user", N'...' → '...'
+  - types:     UNIQUEIDENTIFIER → TEXT COLLATE NOCASE, NVARCHAR(n) → TEXT
+               COLLATE NOCASE + CHECK (length(col) <= n), BIT / INT → INTEGER,
+               DATETIME2 / DATE / TIME → TEXT, DECIMAL → NUMERIC
+               (NOCASE mirrors the server's case-insensitive collation)
+  - functions: NEWID() → random upper-case GUID text, GETDATE() → local time
+               'YYYY-MM-DD HH:MM:SS.SSS', CAST(x AS DATE) → date(x),
+               DATEADD(unit, n, x) → strftime/date modifiers, ISJSON → json_valid,
+               RIGHT(x, n) → substr(x, -n), LEN(x) → length(rtrim(x))
+  - tables with a primary key are WITHOUT ROWID, i.e. clustered on it as
+    on the server
+  - CREATE [UNIQUE] [NON]CLUSTERED INDEX ... INCLUDE (cols): the INCLUDE
+    columns are appended to the key (SQLite's way to cover a query)
+
+Seed rows are parsed with sql_bulk (GETDATE()-relative values evaluated
+once, at build time) and loaded table by table in foreign-key order with
+foreign keys enforced; the build fails if any row violates a constraint.
+The finished database is ANALYZEd so the query planner has statistics.
+
+    python sqlite_db.py [db path] [--schema <T-SQL schema file>] [--no-seed]
+
+--schema swaps in another schema (e.g. database/versions/schema v5.sql).
+Seed tables and columns the schema does not have are left out (and
+listed); the remaining rows must still fit it, or use --no-seed for an
+empty database.
+"""
+
+import re
+import sqlite3
+import sys
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+from sql_bulk import (DEFAULT_SQL, bare, group_rows, literal_value, load_order,
+                      parse_inserts, parse_schema, split_pipeline, split_values)
+
+
+MOCKUP_DIR = Path(__file__).resolve().parent
+DEFAULT_DB = MOCKUP_DIR / 'generated' / 'medicalogy.sqlite3'
+
+INSERT_CHUNK = 10_000                   # rows per executemany call
+_BINDABLE    = {str, int, float, bytes, type(None)}
+
+_KEPT_STATEMENTS = re.compile(r'^CREATE\s+(TABLE|(UNIQUE\s+)?((NON)?CLUSTERED\s+)?INDEX)\b', re.I)
+_CONSTRAINT_ITEM = re.compile(r'^(CONSTRAINT|PRIMARY\s+KEY|FOREIGN\s+KEY|UNIQUE|CHECK)\b', re.I)
+_FUNCTION_CALL   = re.compile(r'\b([A-Za-z_]\w*)\s*\(')
+_TSQL_FUNCTIONS  = {'GETDATE', 'SYSDATETIME', 'GETUTCDATE', 'SYSUTCDATETIME', 'NEWID', 'CAST',
+                    'DATEADD', 'ISJSON', 'RIGHT', 'LEFT', 'LEN', 'ISNULL'}
+
+_TYPES = {
+    'UNIQUEIDENTIFIER': 'TEXT COLLATE NOCASE',
+    'NVARCHAR': 'TEXT COLLATE NOCASE', 'VARCHAR': 'TEXT COLLATE NOCASE',
+    'NCHAR': 'TEXT COLLATE NOCASE', 'CHAR': 'TEXT COLLATE NOCASE',
+    'NTEXT': 'TEXT COLLATE NOCASE', 'TEXT': 'TEXT COLLATE NOCASE',
+    'BIT': 'INTEGER', 'TINYINT': 'INTEGER', 'SMALLINT': 'INTEGER', 'INT': 'INTEGER', 'BIGINT': 'INTEGER',
+    'DECIMAL': 'NUMERIC', 'NUMERIC': 'NUMERIC', 'FLOAT': 'REAL', 'REAL': 'REAL',
+    'DATETIME2': 'TEXT', 'DATETIME': 'TEXT', 'DATE': 'TEXT', 'TIME': 'TEXT',
+    'VARBINARY': 'BLOB',
+}
+
+_NOW        = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+_NEWID      = ("(hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' || "
+               "substr(hex(randomblob(2)), 2) || '-' || substr('89AB', 1 + abs(random()) % 4, 1) || "
+               "substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6)))")
+_DATE_UNITS = {
+    'DAY': 'days', 'DD': 'days', 'D': 'days', 'HOUR': 'hours', 'HH': 'hours',
+    'MINUTE': 'minutes', 'MI': 'minutes', 'N': 'minutes', 'SECOND': 'seconds', 'SS': 'seconds',
+    'MONTH': 'months', 'MM': 'months', 'M': 'months', 'YEAR': 'years', 'YY': 'years', 'YYYY': 'years',
+}
+
+
+# ---------------------------------------------------------------------------
+# Lexical helpers
+# ---------------------------------------------------------------------------
+
+def strip_comments(text):
+    """Remove -- line comments and /* */ block comments outside string literals."""
+    out, i, n = [], 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch == "'":
+            end = i + 1
+            while end < n:
+                if text[end] == "'":
+                    if end + 1 < n and text[end + 1] == "'":
+                        end += 2
+                        continue
+                    break
+                end += 1
+            out.append(text[i:end + 1])
+            i = end + 1
+        elif text.startswith('--', i):
+            end = text.find('\n', i)
+            i = n if end < 0 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        else:
+            out.append(ch)
+            i += 1
+    return ''.join(out)
+
+
+def _outside_strings(text, fn):
+    """Apply fn to the parts of text that are not inside '...' literals."""
+    parts = re.split(r"('(?:[^']|'')*')", text)
+    return ''.join(part if k % 2 else fn(part) for k, part in enumerate(parts))
+
+
+def split_batches(sql_text):
+    """T-SQL batches: the text between GO lines."""
+    return re.split(r'^\s*GO\s*;?\s*$', sql_text, flags=re.M | re.I)
+
+
+def split_statements(batch):
+    """Statements of one batch, split on top-level semicolons."""
+    return [s for s in (s.strip() for s in _split_top_level(batch, ';')) if s]
+
+
+def _split_top_level(text, separator):
+    parts, depth, start, i, in_quote = [], 0, 0, 0, False
+    while i < len(text):
+        ch = text[i]
+        if in_quote:
+            if ch == "'":
+                if i + 1 < len(text) and text[i + 1] == "'":
+                    i += 1
+                else:
+                    in_quote = False
+        elif ch == "'":
+            in_quote = True
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+        i += 1
+    parts.append(text[start:])
+    return parts
+
+
+def _call_end(text, open_paren):
+    """Index just past the parenthesis closing the one at open_paren."""
+    depth, i, in_quote = 0, open_paren, False
+    while i < len(text):
+        ch = text[i]
+        if in_quote:
+            if ch == "'":
+                if i + 1 < len(text) and text[i + 1] == "'":
+                    i += 1
+                else:
+                    in_quote = False
+        elif ch == "'":
+            in_quote = True
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError(f"unbalanced parentheses in: {text[:120]}")
+
+
+# ---------------------------------------------------------------------------
+# Expression translation
+# ---------------------------------------------------------------------------
+
+def translate_expression(text):
+    """SQLite form of a T-SQL expression (DEFAULT value, CHECK condition, ...)."""
+    out, i = [], 0
+    while True:
+        match = _next_call(text, i)
+        if match is None:
+            out.append(_translate_tokens(text[i:]))
+            return ''.join(out)
+        out.append(_translate_tokens(text[i:match.start()]))
+        end = _call_end(text, match.end() - 1)
+        args = split_values(text[match.end():end - 1]) if text[match.end():end - 1].strip() else []
+        out.append(_translate_call(match.group(1), args))
+        i = end
+
+
+def _next_call(text, start):
+    """Next call of a T-SQL function that needs rewriting, outside string literals, or None."""
+    in_quote, i = False, start
+    while i < len(text):
+        ch = text[i]
+        if in_quote:
+            if ch == "'":
+                if i + 1 < len(text) and text[i + 1] == "'":
+                    i += 1
+                else:
+                    in_quote = False
+        elif ch == "'":
+            in_quote = True
+        else:
+            match = _FUNCTION_CALL.match(text, i)
+            if (match and match.group(1).upper() in _TSQL_FUNCTIONS
+                    and (i == 0 or not (text[i - 1].isalnum() or text[i - 1] == '_'))):
+                return match
+        i += 1
+    return None
+
+
+def _translate_tokens(text):
+    """[name] → "name" and N'...' → '...' outside string literals."""
+    def fix(part):
+        part = re.sub(r'\[(\w+)\]', r'"\1"', part)
+        return re.sub(r'\bN$', '', part)        # N prefix sits right before a literal
+    return _outside_strings(text, fix)
+
+
+def _translate_call(name, args):
+    upper = name.upper()
+    if upper in ('GETDATE', 'SYSDATETIME', 'GETUTCDATE', 'SYSUTCDATETIME'):
+        return _NOW if 'UTC' not in upper else "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+    if upper == 'NEWID':
+        return _NEWID
+    args = [translate_expression(a) for a in args]
+    if upper == 'CAST':
+        match = re.match(r'^(.*)\s+AS\s+(\w+)(\s*\([^)]*\))?$', args[0], re.S | re.I)
+        if match and match.group(2).upper() == 'DATE':
+            return f"date({match.group(1)})"
+        if match:
+            return f"CAST({match.group(1)} AS {_TYPES.get(match.group(2).upper(), match.group(2))})"
+        raise ValueError(f"unsupported CAST: {args[0]}")
+    if upper == 'DATEADD':
+        unit = _DATE_UNITS.get(args[0].strip().upper())
+        if unit is None:
+            raise ValueError(f"unsupported DATEADD unit: {args[0]}")
+        modifier = f"({args[1]}) || ' {unit}'"
+        if args[2].startswith('date('):
+            return f"date({args[2]}, {modifier})"
+        return f"strftime('%Y-%m-%d %H:%M:%f', {args[2]}, {modifier})"
+    if upper == 'ISJSON':
+        return f"json_valid({args[0]})"
+    if upper == 'RIGHT':
+        return f"substr({args[0]}, -({args[1]}))"
+    if upper == 'LEFT':
+        return f"substr({args[0]}, 1, {args[1]})"
+    if upper == 'LEN':
+        return f"length(rtrim({args[0]}))"
+    return f"ifnull({', '.join(args)})"
+
+
+# ---------------------------------------------------------------------------
+# Statement translation
+# ---------------------------------------------------------------------------
+
+def _translate_column(item):
+    """One column definition of a CREATE TABLE."""
+    match = re.match(r'^(\[?\w+\]?)\s+(\w+)(\s*\(\s*(\w+)\s*(,\s*\d+\s*)?\))?(.*)$', item, re.S)
+    if not match:
+        raise ValueError(f"unsupported column definition: {item}")
+    name, sql_type, length, rest = bare(match.group(1)), match.group(2).upper(), match.group(4), match.group(6)
+    if sql_type not in _TYPES:
+        raise ValueError(f"unsupported column type {sql_type} in: {item}")
+
+    rest = _translate_default(rest.strip())
+    column = f'"{name}" {_TYPES[sql_type]}'
+    if rest:
+        column += ' ' + rest
+    if length and length.isdigit() and _TYPES[sql_type].startswith('TEXT'):
+        column += f' CHECK (length("{name}") <= {length})'
+    return column
+
+
+def _translate_default(rest):
+    """Translate a column's constraints; SQLite needs DEFAULT expressions in parentheses."""
+    match = re.search(r'\bDEFAULT\s+', rest, re.I)
+    if not match:
+        return translate_expression(rest)
+    start = match.end()
+    call = _FUNCTION_CALL.match(rest, start)
+    if call:
+        end = _call_end(rest, call.end() - 1)
+        value = f"({translate_expression(rest[start:end])})"
+    elif rest.startswith('(', start):
+        end = _call_end(rest, start)
+        value = translate_expression(rest[start:end])
+    else:
+        token = re.match(r"N?'(?:[^']|'')*'|[-\w.]+", rest[start:])
+        end = start + token.end()
+        value = translate_expression(rest[start:end])
+    return (translate_expression(rest[:match.start()]) + 'DEFAULT ' + value
+            + translate_expression(rest[end:]))
+
+
+def translate_create_table(statement):
+    """SQLite CREATE TABLE for a T-SQL CREATE TABLE statement."""
+    match = re.match(r'^CREATE\s+TABLE\s+(\[?\w+\]?)\s*\((.*)\)\s*$', statement, re.S | re.I)
+    if not match:
+        raise ValueError(f"unsupported CREATE TABLE: {statement[:120]}")
+    items = []
+    for item in _split_top_level(match.group(2), ','):
+        item = ' '.join(item.split())
+        if not item:
+            continue
+        items.append(translate_expression(item) if _CONSTRAINT_ITEM.match(item)
+                     else _translate_column(item))
+    body = ',\n    '.join(items)
+    # SQL Server clusters a table on its primary key; WITHOUT ROWID stores it the same way
+    clustered = ' WITHOUT ROWID' if re.search(r'\bPRIMARY\s+KEY\b', body, re.I) else ''
+    return f'CREATE TABLE "{bare(match.group(1))}" (\n    {body}\n){clustered};'
+
+
+def translate_create_index(statement):
+    """SQLite CREATE INDEX; INCLUDE columns become trailing key columns."""
+    statement = ' '.join(statement.split()).rstrip(';')
+    match = re.match(r'^CREATE\s+(UNIQUE\s+)?(?:(?:NON)?CLUSTERED\s+)?INDEX\s+(\[?\w+\]?)\s+ON\s+'
+                     r'(\[?\w+\]?)\s*\(([^)]*)\)(?:\s*INCLUDE\s*\(([^)]*)\))?(?:\s*WHERE\s+(.*?))?'
+                     r'(?:\s*WITH\s*\(.*\))?$', statement, re.I)
+    if not match:
+        raise ValueError(f"unsupported CREATE INDEX: {statement[:120]}")
+    unique, name, table, keys, include, where = match.groups()
+    columns = [c.strip() for c in keys.split(',')]
+    key_names = {re.sub(r'\s+(ASC|DESC)$', '', c, flags=re.I) for c in columns}
+    if include:
+        columns += [c.strip() for c in include.split(',') if c.strip() not in key_names]
+    sql = (f'CREATE {"UNIQUE " if unique else ""}INDEX "{bare(name)}" ON "{bare(table)}" '
+           f'({", ".join(_translate_tokens(c) for c in columns)})')
+    if where:
+        sql += f' WHERE {translate_expression(where)}'
+    return sql + ';'
+
+
+def translate_script(sql_text):
+    """
+    (SQLite statements, skipped statement heads) for a T-SQL schema script.
+    Only CREATE TABLE and CREATE INDEX are kept.
+    """
+    statements, skipped = [], []
+    for batch in split_batches(strip_comments(sql_text)):
+        for statement in split_statements(batch):
+            if not _KEPT_STATEMENTS.match(statement):
+                skipped.append(' '.join(statement.split())[:60])
+            elif re.match(r'^CREATE\s+TABLE', statement, re.I):
+                statements.append(translate_create_table(statement))
+            else:
+                statements.append(translate_create_index(statement))
+    return statements, skipped
+
+
+# ---------------------------------------------------------------------------
+# Database
+# ---------------------------------------------------------------------------
+
+def sqlite_value(value):
+    """Bind parameter for a Python value, in the text forms the translated schema uses."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, uuid.UUID):
+        return str(value).upper()
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ', timespec='milliseconds')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def connect(db_path=DEFAULT_DB, check_same_thread=True):
+    """Connection with foreign keys enforced, as on the server."""
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+    conn.execute('PRAGMA foreign_keys = ON')
+    return conn
+
+
+def insert_rows(conn, table, columns, rows, chunk=INSERT_CHUNK):
+    """executemany() rows of Python values into table in chunks; returns the row count."""
+    sql = (f'INSERT INTO "{table}" ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in columns)}) '
+           f'VALUES ({", ".join("?" * len(columns))})')
+    count, batch = 0, []
+    for row in rows:
+        batch.append([v if v.__class__ in _BINDABLE else sqlite_value(v) for v in row])
+        if len(batch) == chunk:
+            conn.executemany(sql, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+        count += len(batch)
+    return count
+
+
+def build_database(db_path=DEFAULT_DB, sql_path=DEFAULT_SQL, schema_path=None, seed=True, now=None):
+    """
+    Create db_path (replacing it) from the schema and seed rows. Returns
+    {'tables', 'indexes', 'skipped', 'rows': {table: count}, 'dropped':
+    [table or table.column]}. Seed tables and columns missing from the
+    schema are dropped. Raises ValueError for untranslatable T-SQL or rows
+    that break a constraint.
+    """
+    sql_text = Path(sql_path).read_text(encoding='utf-8')
+    schema_sql, data_sql = split_pipeline(sql_text)
+    if schema_path is not None:
+        schema_sql = Path(schema_path).read_text(encoding='utf-8')
+    statements, skipped = translate_script(schema_sql)
+
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    db_path.unlink(missing_ok=True)
+    now = now or datetime.now().replace(microsecond=0)
+
+    rows, dropped = {}, []
+    conn = connect(db_path)
+    try:
+        with conn:
+            for statement in statements:
+                conn.execute(statement)
+            if seed:
+                grouped = group_rows(parse_inserts(data_sql))
+                schema = parse_schema(strip_comments(schema_sql))
+                dropped.extend(sorted(set(grouped) - set(schema)))
+                for table in load_order(schema, set(grouped) & set(schema)):
+                    columns, literal_rows = grouped[table]
+                    known = {bare(c).lower() for c in schema[table]['columns']}
+                    keep = [i for i, c in enumerate(columns) if c.lower() in known]
+                    dropped.extend(f'{table}.{c}' for c in columns if c.lower() not in known)
+                    rows[table] = insert_rows(conn, table, [columns[i] for i in keep],
+                                              ([literal_value(row[i], now) for i in keep] for row in literal_rows))
+        violations = conn.execute('PRAGMA foreign_key_check').fetchall()
+        if violations:
+            raise ValueError(f"foreign key violations: {violations[:5]}")
+        conn.execute('ANALYZE')
+    except sqlite3.Error as exc:
+        raise ValueError(str(exc)) from exc
+    finally:
+        conn.close()
+
+    return {
+        'tables':  sum(s.startswith('CREATE TABLE') for s in statements),
+        'indexes': sum(not s.startswith('CREATE TABLE') for s in statements),
+        'skipped': skipped,
+        'rows':    rows,
+        'dropped': dropped,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    args = sys.argv[1:]
+    schema_path = None
+    if '--schema' in args:
+        i = args.index('--schema')
+        try:
+            schema_path = Path(args[i + 1])
+        except IndexError:
+            print("Error: --schema needs a file")
+            sys.exit(1)
+        del args[i:i + 2]
+    seed = '--no-seed' not in args
+    positional = [a for a in args if not a.startswith('--')]
+    db_path = Path(positional[0]) if positional else DEFAULT_DB
+
+    print(f"Translating schema from: {schema_path or DEFAULT_SQL}")
+    try:
+        result = build_database(db_path, schema_path=schema_path, seed=seed)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+
+    print(f"  - Tables:     {result['tables']}")
+    print(f"  - Indexes:    {result['indexes']}")
+    print(f"  - Skipped:    {len(result['skipped'])} server statements (USE, IF, PRINT, ...)")
+    print(f"  - Seed rows:  {sum(result['rows'].values())} in {len(result['rows'])} tables")
+    if result['dropped']:
+        print(f"  - Dropped:    {', '.join(result['dropped'])} (not in the schema)")
+    print(f"✓ Successfully generated {db_path}")
+
+
+if __name__ == "__main__":
+    main()
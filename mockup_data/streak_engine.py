@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Streak Engine
+Derives user_daily_streak (current_streak, longest_streak,
+last_activity_date, streak_started_at, total_active_days) from learning
+activity — user_course.completed_at and user_section_test.completed_at, the
+two valid streak activities (pipeline.sql).
+
+A streak day is the user's local calendar day: completed_at is GETDATE() on
+the server (SERVER_TIMEZONE) and is moved into user_setting.timezone
+(database/versions/migration_user_setting_timezone.sql) before bucketing;
+users without one, or on a schema without the column, use DEFAULT_TIMEZONE.
+A streak is current while its last day is the user's today or yesterday.
+Every write stores the row as of the moment it is written (a broken streak
+reads current_streak 0); "now" defaults to the wall clock in
+SERVER_TIMEZONE, whatever the machine's own zone.
+
+Maintenance:
+  on_activity()  incremental — one event updates the stored row in O(1).
+                 An event dated before the stored last_activity_date (late
+                 delivery, backfill) falls back to refresh() for that user
+  recompute()    batch — both activity tables are streamed sorted by user
+                 and merged, so memory holds one user's active days plus a
+                 write chunk, whatever the event count. compute_streaks()
+                 is the same pass over any user-sorted event iterable
+  expire()       zeroes current streaks that broke since they were written
+  get()          the row as of now, without writing
+
+    python streak_engine.py [db path]
+"""
+
+import heapq
+import itertools
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlite_db import DEFAULT_DB, connect
+
+
+SERVER_TIMEZONE  = 'Asia/Ho_Chi_Minh'   # zone of GETDATE() on the database server
+DEFAULT_TIMEZONE = SERVER_TIMEZONE       # users without user_setting.timezone
+
+TABLE       = 'user_daily_streak'
+WRITE_CHUNK = 5_000                      # rows per executemany
+FETCH_CHUNK = 10_000                     # cursor.arraysize for the event streams
+
+COLUMNS = ('user_id', 'current_streak', 'longest_streak', 'last_activity_date',
+           'streak_started_at', 'total_active_days')
+
+_NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+
+def server_now():
+    """Naive wall-clock time in SERVER_TIMEZONE, the form completed_at is stored in."""
+    return datetime.now(ZoneInfo(SERVER_TIMEZONE)).replace(tzinfo=None)
+
+
+# ---------------------------------------------------------------------------
+# Day bucketing
+# ---------------------------------------------------------------------------
+
+class DayBucketer:
+    """
+    Local day ordinals for server timestamps. The server→user shift is cached
+    per (zone, server hour): zone offsets only change on hour boundaries in
+    practice, so a long sorted event stream costs one conversion per hour
+    of activity rather than one per event.
+    """
+
+    def __init__(self, server_zone=SERVER_TIMEZONE, default_zone=DEFAULT_TIMEZONE):
+        self.server = ZoneInfo(server_zone)
+        self.default_zone = default_zone
+        self._zones = {}
+        self._shifts = {}
+
+    def zone(self, name):
+        name = name or self.default_zone
+        if name not in self._zones:
+            try:
+                self._zones[name] = ZoneInfo(name)
+            except (ZoneInfoNotFoundError, ValueError):
+                self._zones[name] = ZoneInfo(self.default_zone)
+        return self._zones[name]
+
+    def day(self, moment, zone_name=None):
+        """Local day ordinal of a server timestamp (datetime or SQLite text)."""
+        if isinstance(moment, str):
+            moment = datetime.fromisoformat(moment)
+        key = (zone_name, moment.year, moment.month, moment.day, moment.hour)
+        shift = self._shifts.get(key)
+        if shift is None:
+            if len(self._shifts) > 100_000:
+                self._shifts.clear()
+            local = moment.replace(tzinfo=self.server).astimezone(self.zone(zone_name))
+            shift = self._shifts[key] = local.replace(tzinfo=None) - moment
+        return (moment + shift).toordinal()
+
+
+# ---------------------------------------------------------------------------
+# Streak state
+# ---------------------------------------------------------------------------
+
+class Streak:
+    """One user's streak counters; days are date ordinals."""
+
+    __slots__ = ('current', 'longest', 'last', 'started', 'total')
+
+    def __init__(self, current=0, longest=0, last=None, started=None, total=0):
+        self.current, self.longest, self.last, self.started, self.total = current, longest, last, started, total
+
+    @classmethod
+    def from_row(cls, row):
+        """From (current, longest, last_activity_date, streak_started_at, total) as stored."""
+        current, longest, last, started, total = row
+        return cls(current or 0, longest or 0, _ordinal(last), _ordinal(started), total or 0)
+
+    @classmethod
+    def from_days(cls, days):
+        """From ascending, distinct day ordinals."""
+        streak = cls()
+        for day in days:
+            streak.add(day)
+        return streak
+
+    def add(self, day):
+        """
+        Count an active day. Returns False (and changes nothing) when the
+        counters alone cannot place it: a day before the last active day, or
+        the day after it once the stored streak was zeroed as broken.
+        """
+        if self.last is not None and day <= self.last:
+            return day == self.last
+        if self.last is not None and day == self.last + 1 and not self.current:
+            return False
+        if self.last is not None and day == self.last + 1 and self.current:
+            self.current += 1
+        else:
+            self.current, self.started = 1, day
+        self.last = day
+        self.total += 1
+        self.longest = max(self.longest, self.current)
+        return True
+
+    def as_of(self, today):
+        """Streak as seen on the user's local day today: broken once a whole day is missed."""
+        if self.last is None or today - self.last > 1:
+            return Streak(0, self.longest, self.last, None, self.total)
+        return self
+
+    def row(self, user_id):
+        return (user_id, self.current, self.longest, _iso(self.last), _iso(self.started), self.total)
+
+
+def _ordinal(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.toordinal()
+
+
+def _iso(day):
+    return date.fromordinal(day).isoformat() if day is not None else None
+
+
+def compute_streaks(events, bucketer=None, now=None):
+    """
+    Yield user_daily_streak rows for (user id, completed_at, zone name)
+    events sorted by user id (case-insensitively), one user at a time.
+    """
+    bucketer = bucketer or DayBucketer()
+    now = now or server_now()
+    for user_id, group in itertools.groupby(events, key=lambda e: e[0].upper()):
+        zone, days = None, set()
+        for _, completed_at, zone in group:
+            days.add(bucketer.day(completed_at, zone))
+        yield Streak.from_days(sorted(days)).as_of(bucketer.day(now, zone)).row(user_id)
+
+
+def _counted(events, counter):
+    for event in events:
+        counter[0] += 1
+        yield event
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class StreakEngine:
+    """user_daily_streak on a connection."""
+
+    SOURCES = ('user_course', 'user_section_test')
+
+    def __init__(self, conn, bucketer=None):
+        self.conn = conn
+        self.bucketer = bucketer or DayBucketer()
+        columns = {row[1] for row in conn.execute('PRAGMA table_info("user_setting")')}
+        self._zone_sql = 's.timezone' if 'timezone' in columns else 'NULL'
+
+    def user_zone(self, user_id):
+        if self._zone_sql == 'NULL':
+            return None
+        row = self.conn.execute('SELECT timezone FROM user_setting WHERE user_id = ?', (user_id,)).fetchone()
+        return row[0] if row else None
+
+    def _stored(self, user_id):
+        row = self.conn.execute(f'SELECT {", ".join(COLUMNS[1:])} FROM {TABLE} WHERE user_id = ?',
+                                (user_id,)).fetchone()
+        return Streak.from_row(row) if row else None
+
+    def _upsert(self, rows):
+        updates = ', '.join(f'{c} = excluded.{c}' for c in COLUMNS[1:])
+        self.conn.executemany(
+            f'INSERT INTO {TABLE} ({", ".join(COLUMNS)}, updated_at) '
+            f'VALUES ({", ".join("?" * len(COLUMNS))}, {_NOW_SQL}) '
+            f'ON CONFLICT (user_id) DO UPDATE SET {updates}, updated_at = excluded.updated_at', rows)
+
+    def _events_sql(self, table, where=''):
+        return (f'SELECT a.user_id, a.completed_at, {self._zone_sql} FROM {table} a '
+                f'LEFT JOIN user_setting s ON s.user_id = a.user_id '
+                f'WHERE a.completed_at IS NOT NULL {where} ORDER BY a.user_id')
+
+    # -- reads ---------------------------------------------------------------
+
+    def get(self, user_id, now=None):
+        """{column: value} as of now (a broken streak reads 0), or None."""
+        streak = self._stored(user_id)
+        if streak is None:
+            return None
+        today = self.bucketer.day(now or server_now(), self.user_zone(user_id))
+        return dict(zip(COLUMNS, streak.as_of(today).row(user_id)))
+
+    # -- writes --------------------------------------------------------------
+
+    def on_activity(self, user_id, completed_at=None, now=None):
+        """Count one course / section-test completion. Returns the new row."""
+        now = now or server_now()
+        completed_at = completed_at or now
+        zone = self.user_zone(user_id)
+        streak = self._stored(user_id) or Streak()
+        if not streak.add(self.bucketer.day(completed_at, zone)):
+            return self.refresh(user_id, now)
+        row = streak.as_of(self.bucketer.day(now, zone)).row(user_id)
+        with self.conn:
+            self._upsert([row])
+        return dict(zip(COLUMNS, row))
+
+    def refresh(self, user_id, now=None):
+        """Recompute one user from the activity tables. Returns the new row, or None without activity."""
+        events = heapq.merge(*(self.conn.execute(self._events_sql(t, 'AND a.user_id = ?'), (user_id,))
+                               for t in self.SOURCES), key=lambda e: e[0].upper())
+        rows = list(compute_streaks(events, self.bucketer, now))
+        if not rows:
+            return None
+        with self.conn:
+            self._upsert(rows)
+        return dict(zip(COLUMNS, rows[0]))
+
+    def recompute(self, now=None):
+        """Rebuild the table from the activity tables. Returns (users, events)."""
+        cursors = []
+        for table in self.SOURCES:
+            cursor = self.conn.cursor()
+            cursor.arraysize = FETCH_CHUNK
+            cursors.append(cursor.execute(self._events_sql(table)))
+        counted = [0]
+        events = _counted(heapq.merge(*cursors, key=lambda e: e[0].upper()), counted)
+
+        users, batch = 0, []
+        with self.conn:
+            self.conn.execute(f'DELETE FROM {TABLE}')
+            for row in compute_streaks(events, self.bucketer, now):
+                batch.append(row)
+                if len(batch) == WRITE_CHUNK:
+                    self._upsert(batch)
+                    users += len(batch)
+                    batch = []
+            self._upsert(batch)
+            users += len(batch)
+        return users, counted[0]
+
+    def expire(self, now=None):
+        """Zero current_streak where the streak broke since it was written. Returns the row count."""
+        now = now or server_now()
+        rows = self.conn.execute(f'''
+            SELECT d.user_id, d.{", d.".join(COLUMNS[1:])}, {self._zone_sql} FROM {TABLE} d
+            LEFT JOIN user_setting s ON s.user_id = d.user_id
+            WHERE d.current_streak > 0 AND d.last_activity_date < ?''', (now.date().isoformat(),)).fetchall()
+        broken = []
+        for user_id, *values, zone in rows:
+            streak = Streak.from_row(values)
+            if streak.as_of(self.bucketer.day(now, zone)) is not streak:
+                broken.append((user_id,))
+        with self.conn:
+            self.conn.executemany(f'UPDATE {TABLE} SET current_streak = 0, streak_started_at = NULL, '
+                                  f'updated_at = {_NOW_SQL} WHERE user_id = ?', broken)
+        return len(broken)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DB
+    if not db_path.exists():
+        print(f"Error: {db_path} not found — build it with sqlite_db.py or synthetic_data.py")
+        sys.exit(1)
+
+    print(f"Recomputing {TABLE} in: {db_path}")
+    conn = connect(db_path)
+    try:
+        start = time.perf_counter()
+        users, events = StreakEngine(conn).recompute()
+        seconds = time.perf_counter() - start
+        current, longest = conn.execute(
+            f'SELECT SUM(current_streak > 0), MAX(longest_streak) FROM {TABLE}').fetchone()
+    finally:
+        conn.close()
+
+    rate = events / seconds if seconds else 0
+    print(f"  - Events:     {events:,} in {seconds:.2f}s ({rate:,.0f}/s)")
+    print(f"  - Users:      {users:,} ({current or 0:,} with a current streak, longest {longest or 0} days)")
+    print(f"✓ Successfully updated {TABLE}")
+
+
+if __name__ == "__main__":
+    main()
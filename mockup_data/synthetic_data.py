@@ -0,0 +1,646 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Synthetic Data
+Generates a schema-conformant dataset at any volume — millions of users,
+user_course, user_article_view and user_comment_vote rows, hundreds of
+thousands of courses and articles — for performance work the mockup
+dataset (2 users, a few dozen courses) cannot exercise.
+
+Shape:
+  - popularity is Zipfian: themes users enroll in, articles they read,
+    tags on articles and the articles comments gather under
+  - activity is heavy-tailed per user (most do little, a few do a lot) and
+    comes in streaks: each user has runs of consecutive active days
+    separated by gaps between joining and churning (activeShare are still
+    active today), and completions, views and logins fall on those days —
+    user_daily_streak is derived from the same runs
+  - learners walk a theme's roadmap in order, so completions drop off along
+    it the way real progress does
+
+Nothing is held per user. Every user (and article) draws from its own
+random stream, seeded from (seed, facet, index), so each table is produced
+in one streaming pass that re-derives exactly the same user on every pass;
+ids are UUIDv5 over the index, in the generation.py scheme
+(medicalogy:user:synthetic:<n>, ...). Only the catalog (themes, courses,
+articles, tags) lives in memory. The same seed always gives the same rows.
+
+Rows follow pipeline.sql by default. With --schema they follow that
+schema where the two differ; for database/versions/schema v5.sql that is
+user.demographic in place of user_demographic_id,
+section.intended_demographic, and a placement test per onboarded user
+(initial_assessment, user_initial_assessment,
+initial_user_section_proficiency) for the roadmap's visibility and skip
+rules.
+
+Tables stream, in foreign-key order, to:
+  sqlite   generated/synthetic.sqlite3 (sqlite_db stand-in, foreign keys on)
+  csv      generated/synthetic_bulk/ (CSV + format files + load.sql, sql_bulk)
+  sql      generated/synthetic.sql (schema + batched multi-row INSERTs)
+
+    python synthetic_data.py [small|medium|large|huge] [--users N] [--seed S]
+                             [--format sqlite|csv|sql] [--out PATH]
+                             [--schema <T-SQL schema file>]
+"""
+
+import math
+import random
+import sys
+import time
+from bisect import bisect
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+from generation import stable_id
+from sql_bulk import DEFAULT_SQL, BatchedInsertWriter, CsvTableWriter, bare, parse_schema, split_pipeline
+from sqlite_db import build_database, connect, insert_rows, strip_comments
+
+
+MOCKUP_DIR     = Path(__file__).resolve().parent
+DEFAULT_OUTPUT = {
+    'sqlite': MOCKUP_DIR / 'generated' / 'synthetic.sqlite3',
+    'csv':    MOCKUP_DIR / 'generated' / 'synthetic_bulk',
+    'sql':    MOCKUP_DIR / 'generated' / 'synthetic.sql',
+}
+
+DEFAULT_SEED   = 42
+REFERENCE_TIME = datetime(2026, 1, 1, 21, 0)    # "now" of the dataset
+PARETO_ALPHA   = 2.0                            # tail of per-user engagement
+STAMP_COLUMNS  = ('created_at', 'updated_at')   # GETDATE() defaults, written as "now"
+
+BASE_CONFIG = {
+    'users':                10_000,
+    'themes':               12,
+    'sectionsPerTheme':     6,
+    'coursesPerSection':    8,
+    'articles':             2_000,
+    'tags':                 300,
+    'tagsPerArticle':       4,
+    'themesPerUser':        1.6,                # means per user unless noted
+    'coursesPerUser':       18,
+    'viewsPerUser':         25,
+    'bookmarkRate':         0.08,               # share of viewed articles bookmarked
+    'commentsPerArticle':   3,
+    'replyRate':            0.3,
+    'votesPerUser':         6,
+    'notificationsPerUser': 12,
+    'zipfExponent':         1.1,
+    'historyDays':          365,
+    'meanStreakDays':       4,
+    'meanGapDays':          3,
+    'activeShare':          0.35,               # users still active today
+    'onboardedShare':       0.8,                # users who took the placement test (v5)
+    'targetedSections':     0.25,               # sections meant for one demographic (v5)
+}
+SCALED_KEYS = ('users', 'themes', 'articles', 'tags')
+SCALES = {'small': 1, 'medium': 10, 'large': 100, 'huge': 500}
+
+DEMOGRAPHICS = (('child', 8, 12, 0.1), ('teen', 13, 17, 0.25), ('adult', 18, 65, 0.65))
+PLACEMENT_QUESTIONS = (2, 5)                    # placement questions per section
+NOTIFICATION_WEIGHTS = {
+    'streak_reminder': 30, 'course_recommendation': 20, 'test_result': 10, 'comment_reply': 10,
+    'system_log': 3, 'security': 5, 'achievement': 12, 'content_update': 10,
+}
+COMMENT_TEXTS = (
+    'Very clear explanation, thank you!',
+    'Could you add a source for this section?',
+    'This helped me during my first-aid course.',
+    'The infographic makes it easy to remember.',
+    'I had a question about the second step.',
+    'Shared this with my study group.',
+)
+
+
+def config_for(scale='small', **overrides):
+    """BASE_CONFIG with the entity counts multiplied by SCALES[scale], then overrides applied."""
+    factor = SCALES[scale]
+    config = {key: value * factor if key in SCALED_KEYS else value for key, value in BASE_CONFIG.items()}
+    config.update(overrides)
+    return config
+
+
+def config_for_rows(rows):
+    """Config whose largest per-user table (user_article_view) has about `rows` rows."""
+    factor = rows / (BASE_CONFIG['users'] * BASE_CONFIG['viewsPerUser'])
+    return {key: max(1, round(value * factor)) if key in SCALED_KEYS else value
+            for key, value in BASE_CONFIG.items()}
+
+
+# ---------------------------------------------------------------------------
+# Distributions
+# ---------------------------------------------------------------------------
+
+def heavy_count(rng, mean):
+    """Heavy-tailed count ≥ 0 with the given mean (Weibull, shape 1/2): mostly small, a long tail."""
+    return int(mean * rng.expovariate(1.0) ** 2 / 2)
+
+
+def geometric(rng, mean):
+    """Geometric count ≥ 1 with the given mean."""
+    if mean <= 1:
+        return 1
+    return 1 + int(math.log(1.0 - rng.random()) / math.log(1.0 - 1.0 / mean))
+
+
+class ZipfSampler:
+    """
+    Item indexes 0..n-1 with P(rank k) ∝ 1/k^s. Ranks are shuffled onto items
+    once, so popularity is not tied to creation order.
+    """
+
+    def __init__(self, n, exponent, rng):
+        self.n = n
+        self.cum_weights = list(accumulate(k ** -exponent for k in range(1, n + 1)))
+        self.total = self.cum_weights[-1]
+        self.items = list(range(n))
+        rng.shuffle(self.items)
+
+    def weights(self):
+        """(item, share of all draws) pairs, most popular first."""
+        previous = 0.0
+        for item, cumulative in zip(self.items, self.cum_weights):
+            yield item, (cumulative - previous) / self.total
+            previous = cumulative
+
+    def one(self, rng):
+        return self.items[bisect(self.cum_weights, rng.random() * self.total)]
+
+    def distinct(self, rng, k):
+        """k distinct items, Zipf-weighted (uniform beyond half the population)."""
+        k = min(k, self.n)
+        if 2 * k > self.n:
+            return rng.sample(self.items, k)
+        chosen = {}
+        for _ in range(8):
+            for rank in rng.choices(range(self.n), cum_weights=self.cum_weights, k=k - len(chosen)):
+                chosen[self.items[rank]] = None
+            if len(chosen) == k:
+                return list(chosen)
+        while len(chosen) < k:
+            chosen[rng.randrange(self.n)] = None
+        return list(chosen)
+
+
+# ---------------------------------------------------------------------------
+# Dataset
+# ---------------------------------------------------------------------------
+
+class SyntheticDataset:
+    """
+    Table streams for a config and seed. tables() yields (table, columns,
+    row iterator) in foreign-key order; each iterator is a fresh pass.
+    """
+
+    def __init__(self, config=None, seed=DEFAULT_SEED, now=REFERENCE_TIME):
+        self.config = config or config_for()
+        self.seed = seed
+        self.now = now
+        self.today = now.date().toordinal()
+        c = self.config
+
+        self.demographic_ids = [stable_id('demographic', 'synthetic', name) for name, *_ in DEMOGRAPHICS]
+        self.theme_ids = [stable_id('theme', 'synthetic', str(t)) for t in range(c['themes'])]
+        self.section_ids = [[stable_id('section', 'synthetic', f'{t}-{s}') for s in range(c['sectionsPerTheme'])]
+                            for t in range(c['themes'])]
+        # roadmap order: sections in order, courses in order within each
+        self.theme_courses = [[stable_id('course', 'synthetic', f'{t}-{s}-{k}')
+                               for s in range(c['sectionsPerTheme']) for k in range(c['coursesPerSection'])]
+                              for t in range(c['themes'])]
+        self.article_ids = [stable_id('article', 'synthetic', str(a)) for a in range(c['articles'])]
+        self.tag_ids = [stable_id('tag', 'synthetic', str(g)) for g in range(c['tags'])]
+        self.assessment_id = stable_id('initial_assessment', 'synthetic', 'placement')
+
+        self.theme_zipf = ZipfSampler(c['themes'], c['zipfExponent'], self._rng('zipf', 'theme'))
+        self.article_zipf = ZipfSampler(c['articles'], c['zipfExponent'], self._rng('zipf', 'article'))
+        self.tag_zipf = ZipfSampler(c['tags'], c['zipfExponent'], self._rng('zipf', 'tag'))
+
+        # comments per article follow article popularity; offsets index them globally
+        counts = [0] * c['articles']
+        target = c['commentsPerArticle'] * c['articles']
+        for article, share in self.article_zipf.weights():
+            counts[article] = int(target * share + 0.5)
+        self.comment_offsets = [0, *accumulate(counts)]
+
+    def _rng(self, facet, index):
+        return random.Random(f'{self.seed}:{facet}:{index}')
+
+    def user_id(self, i):
+        return stable_id('user', 'synthetic', str(i))
+
+    def comment_id(self, n):
+        return stable_id('comment', 'synthetic', str(n))
+
+    @property
+    def comment_count(self):
+        return self.comment_offsets[-1]
+
+    # -- per-user derivations -------------------------------------------------
+
+    def activity_days(self, i):
+        """
+        Active days of user i as ascending date ordinals: streak runs separated
+        by gaps, from the day they joined to the day they churned (or today).
+        """
+        c = self.config
+        rng = self._rng('activity', i)
+        engagement = math.sqrt(rng.paretovariate(PARETO_ALPHA))
+        days_ago = rng.randrange(c['historyDays'])
+        last = 0 if rng.random() < c['activeShare'] else rng.randrange(days_ago + 1)
+        # geometric() inlined: this loop runs for every user on every pass
+        log, random_ = math.log, rng.random
+        log_run = log(1.0 - 1.0 / max(1.01, c['meanStreakDays'] * engagement))
+        log_gap = log(1.0 - 1.0 / max(1.01, c['meanGapDays'] / engagement))
+        days = []
+        while days_ago >= last:
+            run = 1 + int(log(1.0 - random_()) / log_run)
+            days.extend(range(self.today - days_ago, self.today - max(days_ago - run, last - 1)))
+            days_ago -= run + 1 + int(log(1.0 - random_()) / log_gap)
+        return days
+
+    def _at(self, rng, day):
+        """A moment on the day with ordinal day, between 06:00 and now's time of day."""
+        span = max(1, (self.now.hour - 6) * 3600)
+        return datetime.fromordinal(day) + timedelta(seconds=6 * 3600 + int(rng.random() * span))
+
+    def learning(self, i, days):
+        """(enrollments, completions) of user i: [(theme, course count)], [(course id, datetime, correct)]."""
+        c = self.config
+        rng = self._rng('learning', i)
+        themes = self.theme_zipf.distinct(rng, geometric(rng, c['themesPerUser']))
+        enrollments = [(t, min(len(self.theme_courses[t]), heavy_count(rng, c['coursesPerUser'] / len(themes))))
+                       for t in themes]
+        ordered = [self.theme_courses[t][k] for t, count in enrollments for k in range(count)]
+        completions = [(course, self._at(rng, days[j * len(days) // len(ordered)]),
+                        rng.choices((2, 3, 4, 5), (1, 2, 4, 5))[0])
+                       for j, course in enumerate(ordered)]
+        return enrollments, completions
+
+    def placement(self, i):
+        """Random stream of user i's placement test, or None if they have not taken it."""
+        rng = self._rng('placement', i)
+        return rng if rng.random() < self.config['onboardedShare'] else None
+
+    def section_demographic(self, t, s):
+        """intended_demographic of section s of theme t: 'all' or one demographic."""
+        rng = self._rng('section', f'{t}-{s}')
+        if s == 0 or rng.random() >= self.config['targetedSections']:
+            return 'all'
+        return rng.choice(DEMOGRAPHICS)[0]
+
+    # -- table streams ---------------------------------------------------------
+
+    def tables(self, schema):
+        """
+        schema — parse_schema() of the target schema. The v5 columns and
+        placement tables are written when it has them; created_at /
+        updated_at a stream leaves out are written as self.now, not left to
+        the GETDATE() default, so a seed fixes every value.
+        """
+        for table, columns, rows in self._streams(schema):
+            stamped = tuple(c for c in schema.get(table, {}).get('columns', ())
+                            if bare(c).lower() in STAMP_COLUMNS and bare(c).lower() not in columns)
+            if stamped:
+                columns, rows = columns + stamped, self._stamp(rows, len(stamped))
+            yield table, columns, rows
+
+    def _stamp(self, rows, count):
+        stamp = (self.now,) * count
+        return (row + stamp for row in rows)
+
+    def _streams(self, schema):
+        def columns(table):
+            return {bare(c).lower() for c in schema.get(table, {}).get('columns', ())}
+
+        v5_user = 'demographic' in columns('user') and 'user_demographic_id' not in columns('user')
+        if not v5_user:
+            yield 'user_demographic', ('id', 'name', 'description', 'min_age', 'max_age'), self._demographics()
+        yield 'user', ('id', 'email', 'username', 'password_hash', 'demographic' if v5_user else 'user_demographic_id',
+                       'date_of_birth', 'role', 'is_active', 'is_verified', 'last_login_at', 'created_at',
+                       'updated_at'), \
+            self._users(v5_user)
+        yield 'theme', ('id', 'name', 'slug', 'order_index'), self._themes()
+        if 'intended_demographic' in columns('section'):
+            yield 'section', ('id', 'theme_id', 'name', 'slug', 'order_index', 'intended_demographic'), \
+                self._sections(targeted=True)
+        else:
+            yield 'section', ('id', 'theme_id', 'name', 'slug', 'order_index'), self._sections()
+        yield 'course', ('id', 'section_id', 'name', 'slug', 'order_index', 'content_file_name'), self._courses()
+        yield 'user_theme_enrollment', ('user_id', 'theme_id', 'status', 'enrolled_at', 'finished_at'), \
+            self._enrollments()
+        yield 'user_course', ('user_id', 'course_id', 'quizzes_correct', 'completed_at'), self._user_courses()
+        yield 'user_daily_streak', ('user_id', 'current_streak', 'longest_streak', 'last_activity_date',
+                                    'streak_started_at', 'total_active_days'), self._streaks()
+        if columns('initial_user_section_proficiency'):
+            yield 'initial_assessment', ('id', 'name', 'content'), \
+                iter([(self.assessment_id, 'Synthetic placement test', '{"questions": []}')])
+            yield 'user_initial_assessment', ('user_id', 'initial_assessment_id', 'completed_at'), \
+                self._placements()
+            yield 'initial_user_section_proficiency', ('user_id', 'initial_assessment_id', 'section_id',
+                                                       'questions_seen', 'questions_correct', 'assessed_at'), \
+                self._placements(per_section=True)
+        yield 'tag', ('id', 'name'), ((tag, f'tag-{g}') for g, tag in enumerate(self.tag_ids))
+        yield 'article', ('id', 'theme_id', 'name', 'slug', 'content_markdown', 'is_published', 'published_at'), \
+            self._articles()
+        yield 'article_tag', ('article_id', 'tag_id'), self._article_tags()
+        yield 'user_article_view', ('user_id', 'article_id', 'view_count', 'first_viewed_at', 'last_viewed_at'), \
+            self._reading(bookmarks=False)
+        yield 'user_article_comment', ('id', 'user_id', 'article_id', 'parent_comment_id', 'comment_text',
+                                       'is_approved', 'created_at'), self._comments()
+        yield 'user_comment_vote', ('user_id', 'comment_id', 'vote_type', 'created_at'), self._votes()
+        yield 'user_bookmark', ('id', 'user_id', 'article_id', 'created_at'), self._reading(bookmarks=True)
+        yield 'notification', ('id', 'user_id', 'notification_type', 'reference_type', 'reference_id',
+                               'is_read', 'read_at', 'sent_at', 'created_at'), self._notifications()
+
+    def _demographics(self):
+        for demographic_id, (name, low, high, _) in zip(self.demographic_ids, DEMOGRAPHICS):
+            yield demographic_id, name, f'Synthetic {name} learners', low, high
+
+    def _users(self, by_name=False):
+        """by_name: the demographic's name, NULL until onboarded (v5 user.demographic), not its id."""
+        weights = [share for *_, share in DEMOGRAPHICS]
+        for i in range(self.config['users']):
+            rng = self._rng('profile', i)
+            days = self.activity_days(i)
+            d = rng.choices(range(len(DEMOGRAPHICS)), weights)[0]
+            name, low, high, _ = DEMOGRAPHICS[d]
+            born = date.fromordinal(self.today - rng.randrange(low * 365, (high + 1) * 365))
+            if by_name:
+                demographic = name if self.placement(i) else None
+            else:
+                demographic = self.demographic_ids[d]
+            last_login = self._at(rng, days[-1])
+            yield (self.user_id(i), f'user{i}@synthetic.medicalogy.io', f'user{i}', 'synthetic_password_hash',
+                   demographic, born, 'USER', 1, int(rng.random() < 0.8),
+                   last_login, self._at(rng, days[0]), last_login)
+
+    def _themes(self):
+        for t, theme in enumerate(self.theme_ids):
+            yield theme, f'Theme {t}', f'synthetic-theme-{t}', t + 1
+
+    def _sections(self, targeted=False):
+        for t, sections in enumerate(self.section_ids):
+            for s, section in enumerate(sections):
+                row = (section, self.theme_ids[t], f'Section {t}.{s}', f'section-{s}', s + 1)
+                yield (*row, self.section_demographic(t, s)) if targeted else row
+
+    def _courses(self):
+        per_section = self.config['coursesPerSection']
+        for t, courses in enumerate(self.theme_courses):
+            for n, course in enumerate(courses):
+                s, k = divmod(n, per_section)
+                yield (course, self.section_ids[t][s], f'Course {t}.{s}.{k}', f'course-{k}', k + 1,
+                       f'synthetic-{t}-{s}-{k}.json')
+
+    def _enrollments(self):
+        for i in range(self.config['users']):
+            days = self.activity_days(i)
+            enrollments, completions = self.learning(i, days)
+            user, done = self.user_id(i), 0
+            for t, count in enrollments:
+                started = completions[done][1] if count else self._at(self._rng('enroll', i), days[0])
+                finished = count == len(self.theme_courses[t])
+                yield (user, self.theme_ids[t], 'finished' if finished else 'enrolled', started,
+                       completions[done + count - 1][1] if finished else None)
+                done += count
+
+    def _user_courses(self):
+        for i in range(self.config['users']):
+            user = self.user_id(i)
+            for course, completed_at, correct in self.learning(i, self.activity_days(i))[1]:
+                yield user, course, correct, completed_at
+
+    def _streaks(self):
+        for i in range(self.config['users']):
+            days = self.activity_days(i)
+            longest, run, run_start = 1, 1, days[0]
+            for previous, day in zip(days, days[1:]):
+                run, run_start = (run + 1, run_start) if day - previous == 1 else (1, day)
+                longest = max(longest, run)
+            current = run if self.today - days[-1] <= 1 else 0
+            yield (self.user_id(i), current, longest, date.fromordinal(days[-1]),
+                   date.fromordinal(run_start) if current else None, len(days))
+
+    def _placements(self, per_section=False):
+        """
+        user_initial_assessment rows, or with per_section the scores for the
+        sections of the user's first theme — skill spreads them across the
+        80% skip line.
+        """
+        low, high = PLACEMENT_QUESTIONS
+        for i in range(self.config['users']):
+            rng = self.placement(i)
+            if rng is None:
+                continue
+            days = self.activity_days(i)
+            user, assessed_at = self.user_id(i), self._at(rng, days[0])
+            if not per_section:
+                yield user, self.assessment_id, assessed_at
+                continue
+            skill = rng.random()
+            theme = self.learning(i, days)[0][0][0]
+            for section in self.section_ids[theme]:
+                seen = rng.randint(low, high)
+                yield user, self.assessment_id, section, seen, sum(rng.random() < skill for _ in range(seen)), \
+                    assessed_at
+
+    def _articles(self):
+        themes = len(self.theme_ids)
+        for a, article in enumerate(self.article_ids):
+            published = self.now - timedelta(days=self._rng('article', a).randrange(self.config['historyDays'] * 2))
+            yield (article, self.theme_ids[a % themes], f'Article {a}', f'synthetic-article-{a}',
+                   f'synthetic-article-{a}.md', 1, published)
+
+    def _article_tags(self):
+        for a, article in enumerate(self.article_ids):
+            for g in self.tag_zipf.distinct(self._rng('article-tags', a), self.config['tagsPerArticle']):
+                yield article, self.tag_ids[g]
+
+    def _reading(self, bookmarks):
+        c = self.config
+        for i in range(c['users']):
+            days = self.activity_days(i)
+            rng = self._rng('reading', i)
+            user = self.user_id(i)
+            for a in self.article_zipf.distinct(rng, heavy_count(rng, c['viewsPerUser'])):
+                first = rng.randrange(len(days))
+                first_at = self._at(rng, days[first])
+                last_at = self._at(rng, days[rng.randrange(first, len(days))])
+                last_at = max(first_at, last_at)
+                view_count = geometric(rng, 2)
+                bookmarked = rng.random() < c['bookmarkRate']
+                if not bookmarks:
+                    yield user, self.article_ids[a], view_count, first_at, last_at
+                elif bookmarked:
+                    yield stable_id('bookmark', 'synthetic', f'{i}-{a}'), user, self.article_ids[a], last_at
+
+    def _comments(self):
+        c = self.config
+        for a, article in enumerate(self.article_ids):
+            start, count = self.comment_offsets[a], self.comment_offsets[a + 1] - self.comment_offsets[a]
+            if not count:
+                continue
+            rng = self._rng('comments', a)
+            first = self.now - timedelta(days=rng.uniform(0, c['historyDays']))
+            step = (self.now - first) / (count + 1)
+            for k in range(count):
+                parent = (self.comment_id(start + rng.randrange(k))
+                          if k and rng.random() < c['replyRate'] else None)
+                yield (self.comment_id(start + k), self.user_id(rng.randrange(c['users'])), article, parent,
+                       rng.choice(COMMENT_TEXTS), int(rng.random() < 0.9), first + step * (k + 1))
+
+    def _votes(self):
+        c = self.config
+        if not self.comment_count:
+            return
+        for i in range(c['users']):
+            rng = self._rng('votes', i)
+            wanted = min(heavy_count(rng, c['votesPerUser']), self.comment_count)
+            chosen = {}
+            for _ in range(wanted * 4):
+                if len(chosen) == wanted:
+                    break
+                a = self.article_zipf.one(rng)
+                start, end = self.comment_offsets[a], self.comment_offsets[a + 1]
+                if end > start:
+                    chosen.setdefault(rng.randrange(start, end), None)
+            user = self.user_id(i)
+            for n in chosen:
+                yield (user, self.comment_id(n), 'like' if rng.random() < 0.8 else 'dislike',
+                       self.now - timedelta(seconds=rng.randrange(c['historyDays'] * 86400)))
+
+    def _notifications(self):
+        c = self.config
+        types, weights = list(NOTIFICATION_WEIGHTS), list(NOTIFICATION_WEIGHTS.values())
+        courses = [course for theme in self.theme_courses for course in theme]
+        for i in range(c['users']):
+            rng = self._rng('notifications', i)
+            user = self.user_id(i)
+            for k in range(heavy_count(rng, c['notificationsPerUser'])):
+                kind = rng.choices(types, weights)[0]
+                reference_type, reference_id = None, None
+                if kind in ('course_recommendation', 'achievement'):
+                    reference_type, reference_id = 'course', rng.choice(courses)
+                elif kind == 'content_update':
+                    reference_type, reference_id = 'article', self.article_ids[self.article_zipf.one(rng)]
+                elif kind == 'comment_reply' and self.comment_count:
+                    reference_type, reference_id = 'comment', self.comment_id(rng.randrange(self.comment_count))
+                created_at = self.now - timedelta(seconds=rng.randrange(90 * 86400))
+                age_days = (self.now - created_at).days
+                is_read = rng.random() < (0.9 if age_days > 7 else 0.4)
+                read_at = created_at + timedelta(seconds=rng.randrange(1, 86400)) if is_read else None
+                yield (stable_id('notification', 'synthetic', f'{i}-{k}'), user, kind, reference_type,
+                       reference_id, int(is_read), min(read_at, self.now) if read_at else None,
+                       created_at, created_at)
+
+
+# ---------------------------------------------------------------------------
+# Sinks
+# ---------------------------------------------------------------------------
+
+def _schema_sql(sql_path, schema_path=None):
+    if schema_path is not None:
+        return Path(schema_path).read_text(encoding='utf-8')
+    schema_sql, _ = split_pipeline(Path(sql_path).read_text(encoding='utf-8'))
+    return schema_sql
+
+
+def _schema(sql_path, schema_path):
+    """parse_schema() of --schema, or of the pipeline.sql schema."""
+    return parse_schema(strip_comments(_schema_sql(sql_path, schema_path)))
+
+
+def write_sqlite(dataset, db_path=DEFAULT_OUTPUT['sqlite'], sql_path=DEFAULT_SQL, schema_path=None, progress=None):
+    """Stream the dataset into a fresh SQLite stand-in. Returns {table: rows}."""
+    build_database(db_path, sql_path, schema_path=schema_path, seed=False)
+    conn = connect(db_path)
+    conn.execute('PRAGMA synchronous = OFF')
+    counts = {}
+    try:
+        for table, columns, rows in dataset.tables(_schema(sql_path, schema_path)):
+            with conn:
+                counts[table] = insert_rows(conn, table, columns, rows)
+            if progress:
+                progress(table, counts[table])
+        conn.execute('ANALYZE')
+    finally:
+        conn.close()
+    return counts
+
+
+def write_csv(dataset, out_dir=DEFAULT_OUTPUT['csv'], sql_path=DEFAULT_SQL, schema_path=None, progress=None):
+    """Stream the dataset to CSV + format files + load.sql. Returns {table: rows}."""
+    schema_sql = _schema_sql(sql_path, schema_path)
+    writer = CsvTableWriter(out_dir, parse_schema(strip_comments(schema_sql)))
+    for table, columns, rows in dataset.tables(_schema(sql_path, schema_path)):
+        count = writer.write_rows(table, columns, rows)
+        if progress:
+            progress(table, count)
+    (Path(out_dir) / 'load.sql').write_text(writer.load_script(schema_sql), encoding='utf-8')
+    return dict(writer.tables)
+
+
+def write_sql(dataset, output_path=DEFAULT_OUTPUT['sql'], sql_path=DEFAULT_SQL, schema_path=None, batch_size=None,
+              progress=None):
+    """Stream the dataset as schema + batched INSERTs. Returns {table: rows}."""
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    with open(output_path, 'w', encoding='utf-8') as out:
+        out.write(_schema_sql(sql_path, schema_path))
+        out.write(f'\n-- SYNTHETIC DATA (seed {dataset.seed})\n')
+        with BatchedInsertWriter(out, **({'batch_size': batch_size} if batch_size else {})) as writer:
+            for table, columns, rows in dataset.tables(_schema(sql_path, schema_path)):
+                counts[table] = writer.write_rows(table, columns, rows)
+                if progress:
+                    progress(table, counts[table])
+    return counts
+
+
+WRITERS = {'sqlite': write_sqlite, 'csv': write_csv, 'sql': write_sql}
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def _option(args, flag, default, parse=str):
+    if flag not in args:
+        return default
+    try:
+        return parse(args[args.index(flag) + 1])
+    except (IndexError, ValueError):
+        print(f"Error: {flag} needs a value")
+        sys.exit(1)
+
+
+def main():
+    args = sys.argv[1:]
+    scale = next((a for a in args if a in SCALES), 'small')
+    fmt = _option(args, '--format', 'sqlite')
+    if fmt not in WRITERS:
+        print(f"Error: --format must be one of {', '.join(WRITERS)}")
+        sys.exit(1)
+    seed = _option(args, '--seed', DEFAULT_SEED, int)
+    output = Path(_option(args, '--out', DEFAULT_OUTPUT[fmt]))
+    schema_path = _option(args, '--schema', None, Path)
+    overrides = {}
+    if '--users' in args:
+        overrides['users'] = _option(args, '--users', None, lambda v: int(v.replace('_', '')))
+
+    dataset = SyntheticDataset(config_for(scale, **overrides), seed)
+    print(f"Generating {scale} dataset (seed {seed}, {dataset.config['users']:,} users) to: {output}")
+    start = time.perf_counter()
+
+    def progress(table, count):
+        print(f"  - {table:<24} {count:>12,} rows  ({time.perf_counter() - start:.1f}s)")
+
+    try:
+        counts = WRITERS[fmt](dataset, output, schema_path=schema_path, progress=progress)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}")
+        sys.exit(1)
+    print(f"  - Total:     {sum(counts.values()):,} rows in {time.perf_counter() - start:.1f}s")
+    print(f"✓ Successfully generated {output}")
+
+
+if __name__ == "__main__":
+    main()
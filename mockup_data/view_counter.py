@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Medicalogy View Counter
+Write-behind counting of wiki article views (screens/7-infographic/docs.md:
+first view creates the user_article_view row with view_count = 1, every
+later one bumps view_count and last_viewed_at).
+
+Views are aggregated in memory per (user, article) and per article, and
+flushed as one transaction of batched upserts when either threshold trips:
+  max_pending  distinct (user, article) pairs buffered
+  max_delay    seconds since the oldest buffered view (checked on record()
+               and by the background flusher started with start())
+
+Each flush also adds to article_view_total
+(database/versions/migration_article_view_total.sql), the denormalized
+per-article total that feeds the page's "N views" line (md_to_html_v2
+reads it through article_view_stats()) and the "Most viewed" sort.
+views() and view_stats() include counts still in the buffer.
+
+No buffered count is lost on a graceful shutdown: close() (also registered
+with atexit by start()) stops the flusher and flushes what is left, and a
+flush that fails puts its batch back into the buffer. Views of articles
+that no longer exist are dropped at flush time and counted in .dropped.
+
+Works on the SQLite stand-in (sqlite_db.py), with SQLite upserts.
+
+    python view_counter.py [db path] [--events N]
+
+replays N Zipf-distributed views over the users and articles in the
+database and reports throughput and the most viewed articles.
+"""
+
+import atexit
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlite_db import DEFAULT_DB, connect, sqlite_value, translate_script
+from synthetic_data import ZipfSampler
+
+
+MOCKUP_DIR        = Path(__file__).resolve().parent
+DEFAULT_MIGRATION = MOCKUP_DIR.parent / 'database' / 'versions' / 'migration_article_view_total.sql'
+
+TOTALS_TABLE   = 'article_view_total'
+MAX_PENDING    = 10_000                 # distinct (user, article) pairs before a flush
+MAX_DELAY      = 5.0                    # seconds a view may wait in the buffer
+WRITE_CHUNK    = 5_000                  # rows per executemany
+DEFAULT_EVENTS = 100_000
+
+_NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+_UPSERT_VIEW = '''
+    INSERT INTO user_article_view (user_id, article_id, view_count, first_viewed_at, last_viewed_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (user_id, article_id) DO UPDATE SET
+        view_count     = view_count + excluded.view_count,
+        last_viewed_at = max(ifnull(last_viewed_at, ''), excluded.last_viewed_at)'''
+
+_UPSERT_TOTAL = f'''
+    INSERT INTO {TOTALS_TABLE} (article_id, total_views, last_viewed_at, updated_at)
+    VALUES (?, ?, ?, {_NOW_SQL})
+    ON CONFLICT (article_id) DO UPDATE SET
+        total_views    = total_views + excluded.total_views,
+        last_viewed_at = max(ifnull(last_viewed_at, ''), excluded.last_viewed_at),
+        updated_at     = excluded.updated_at'''
+
+
+# ---------------------------------------------------------------------------
+# Totals table
+# ---------------------------------------------------------------------------
+
+def ensure_totals(conn, migration_path=DEFAULT_MIGRATION):
+    """Create article_view_total from the migration if needed, filled from user_article_view."""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                          (TOTALS_TABLE,)).fetchone()
+    if exists:
+        return
+    statements, _ = translate_script(Path(migration_path).read_text(encoding='utf-8'))
+    with conn:
+        for statement in statements:
+            conn.execute(statement)
+    rebuild_totals(conn)
+
+
+def rebuild_totals(conn):
+    """Recompute every article total from user_article_view. Returns the row count."""
+    with conn:
+        conn.execute(f'DELETE FROM {TOTALS_TABLE}')
+        cursor = conn.execute(f'''
+            INSERT INTO {TOTALS_TABLE} (article_id, total_views, last_viewed_at)
+            SELECT article_id, SUM(view_count), MAX(last_viewed_at) FROM user_article_view
+            GROUP BY article_id''')
+    return cursor.rowcount
+
+
+def most_viewed(conn, limit=20):
+    """[(article id, name, total views)] of published articles, most viewed first."""
+    return conn.execute(f'''
+        SELECT a.id, a.name, t.total_views FROM {TOTALS_TABLE} t
+        JOIN article a ON a.id = t.article_id
+        WHERE a.is_published = 1
+        ORDER BY t.total_views DESC LIMIT ?''', (limit,)).fetchall()
+
+
+# ---------------------------------------------------------------------------
+# Write-behind buffer
+# ---------------------------------------------------------------------------
+
+class ViewCounter:
+    """
+    Buffered view counts on its own connection. record() is safe to call
+    from any thread; flushes are serialized.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB, max_pending=MAX_PENDING, max_delay=MAX_DELAY):
+        self.conn = connect(db_path, check_same_thread=False)
+        ensure_totals(self.conn)
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.flushes = self.flushed = self.dropped = 0
+        self.last_error = None
+        self._views = {}                        # (user, article) -> [count, first_at, last_at]
+        self._totals = {}                       # article -> [count, last_at]
+        self._oldest = None                     # monotonic time of the oldest buffered view
+        self._lock = threading.Lock()           # buffer
+        self._flush_lock = threading.Lock()     # connection
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- recording -----------------------------------------------------------
+
+    def record(self, user_id, article_id, viewed_at=None):
+        """Count one view. Flushes inline when a threshold is reached."""
+        viewed_at = viewed_at or datetime.now()
+        with self._lock:
+            entry = self._views.get((user_id, article_id))
+            if entry is None:
+                self._views[(user_id, article_id)] = [1, viewed_at, viewed_at]
+            else:
+                entry[0] += 1
+                entry[2] = max(entry[2], viewed_at)
+            total = self._totals.get(article_id)
+            if total is None:
+                self._totals[article_id] = [1, viewed_at]
+            else:
+                total[0] += 1
+                total[1] = max(total[1], viewed_at)
+            now = time.monotonic()
+            if self._oldest is None:
+                self._oldest = now
+            due = len(self._views) >= self.max_pending or now - self._oldest >= self.max_delay
+        if due:
+            self.flush()
+
+    @property
+    def pending(self):
+        """Buffered views not yet written."""
+        with self._lock:
+            return sum(total[0] for total in self._totals.values())
+
+    def views(self, article_id):
+        """Total views of an article, buffered ones included."""
+        return self.view_stats(article_id)[0]
+
+    def view_stats(self, article_id):
+        """(total views, last viewed at) of an article, buffered views included."""
+        with self._flush_lock:                 # no flush between the two reads
+            row = self.conn.execute(f'SELECT total_views, last_viewed_at FROM {TOTALS_TABLE} WHERE article_id = ?',
+                                    (article_id,)).fetchone()
+            with self._lock:
+                pending = self._totals.get(article_id)
+                pending = list(pending) if pending else None
+        views, last = row if row else (0, None)
+        if pending:
+            views += pending[0]
+            last = max(last or '', sqlite_value(pending[1]))
+        return views, last
+
+    # -- flushing ------------------------------------------------------------
+
+    def flush(self):
+        """Write the buffer. Returns the number of views written."""
+        with self._flush_lock:
+            with self._lock:
+                views, totals = self._views, self._totals
+                self._views, self._totals, self._oldest = {}, {}, None
+            if not views:
+                return 0
+            try:
+                written = self._write(views, totals)
+            except Exception:
+                self._restore(views, totals)
+                raise
+            self.flushes += 1
+            self.flushed += written
+            return written
+
+    def _write(self, views, totals):
+        articles = list(totals)
+        known = set()
+        for start in range(0, len(articles), 500):
+            chunk = articles[start:start + 500]
+            known.update(row[0].upper() for row in self.conn.execute(
+                f'SELECT id FROM article WHERE id IN ({", ".join("?" * len(chunk))})', chunk))
+        live = {a for a in articles if a.upper() in known}
+
+        view_rows = [(user_id, article_id, count, sqlite_value(first), sqlite_value(last))
+                     for (user_id, article_id), (count, first, last) in views.items() if article_id in live]
+        total_rows = [(article_id, count, sqlite_value(last))
+                      for article_id, (count, last) in totals.items() if article_id in live]
+        with self.conn:
+            for start in range(0, len(view_rows), WRITE_CHUNK):
+                self.conn.executemany(_UPSERT_VIEW, view_rows[start:start + WRITE_CHUNK])
+            for start in range(0, len(total_rows), WRITE_CHUNK):
+                self.conn.executemany(_UPSERT_TOTAL, total_rows[start:start + WRITE_CHUNK])
+        written = sum(count for _, count, _ in total_rows)
+        self.dropped += sum(count for article_id, (count, _) in totals.items() if article_id not in live)
+        return written
+
+    def _restore(self, views, totals):
+        """Merge a batch that failed to write back into the buffer."""
+        with self._lock:
+            for key, (count, first, last) in views.items():
+                entry = self._views.setdefault(key, [0, first, last])
+                entry[0] += count
+                entry[1], entry[2] = min(entry[1], first), max(entry[2], last)
+            for article_id, (count, last) in totals.items():
+                entry = self._totals.setdefault(article_id, [0, last])
+                entry[0] += count
+                entry[1] = max(entry[1], last)
+            self._oldest = self._oldest or time.monotonic() - self.max_delay
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def start(self):
+        """Start the background flusher (time threshold); register close() at exit."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        return self
+
+    def _run(self):
+        while not self._stop.wait(min(1.0, self.max_delay / 2)):
+            with self._lock:
+                due = self._oldest is not None and time.monotonic() - self._oldest >= self.max_delay
+            if due:
+                try:
+                    self.flush()
+                except Exception as exc:        # kept in the buffer; retried next tick
+                    self.last_error = exc
+
+    def close(self):
+        """Stop the flusher, flush everything buffered and close the connection."""
+        if self._closed:
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            atexit.unregister(self.close)
+        self.flush()
+        self._closed = True
+        self.conn.close()
+
+
+def article_view_stats(article, db_path=DEFAULT_DB):
+    """
+    (total views, last viewed at) from article_view_total for an article id
+    or slug, or None without the database, the table or a row. Read only:
+    no DDL, no rebuild, and views still buffered in a ViewCounter are not
+    included.
+    """
+    if not Path(db_path).exists():
+        return None
+    conn = connect(db_path)
+    try:
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                              (TOTALS_TABLE,)).fetchone()
+        if not exists:
+            return None
+        return conn.execute(f'''
+            SELECT t.total_views, t.last_viewed_at FROM {TOTALS_TABLE} t
+            JOIN article a ON a.id = t.article_id
+            WHERE a.id = ? OR a.slug = ?''', (article, article)).fetchone()
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    args = sys.argv[1:]
+    events = DEFAULT_EVENTS
+    if '--events' in args:
+        i = args.index('--events')
+        try:
+            events = int(args[i + 1].replace('_', ''))
+        except (IndexError, ValueError):
+            print("Error: --events needs a number")
+            sys.exit(1)
+        del args[i:i + 2]
+    db_path = Path(args[0]) if args else DEFAULT_DB
+    if not db_path.exists():
+        print(f"Error: {db_path} not found — build it with sqlite_db.py or synthetic_data.py")
+        sys.exit(1)
+
+    conn = connect(db_path)
+    try:
+        users = [row[0] for row in conn.execute('SELECT id FROM "user"')]
+        articles = [row[0] for row in conn.execute('SELECT id FROM article WHERE is_published = 1')]
+    finally:
+        conn.close()
+    if not users or not articles:
+        print("Error: the database has no users or published articles")
+        sys.exit(1)
+
+    print(f"Replaying {events:,} article views into: {db_path}")
+    rng = random.Random(42)
+    user_zipf = ZipfSampler(len(users), 1.0, rng)
+    article_zipf = ZipfSampler(len(articles), 1.1, rng)
+    start = time.perf_counter()
+    with ViewCounter(db_path) as counter:
+        for _ in range(events):
+            counter.record(users[user_zipf.one(rng)], articles[article_zipf.one(rng)])
+    seconds = time.perf_counter() - start
+
+    conn = connect(db_path)
+    try:
+        top = most_viewed(conn, 5)
+    finally:
+        conn.close()
+    print(f"  - Views:      {counter.flushed:,} written in {counter.flushes:,} flushes, "
+          f"{seconds:.2f}s ({events / seconds:,.0f}/s)")
+    print("  - Most viewed:")
+    for article_id, name, total in top:
+        print(f"      {total:>8,}  {name}")
+    print("✓ Successfully counted article views")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Learning Path Planner
+Server-side counterpart of buildPathList in the onboarding page.
+
+Takes the curriculum from the shared content index (mockup_data.json themes →
+sections, ordered by orderIndex) and a user's per-section placement scores,
+and produces in one pass:
+  - the suggested learning path shown on the onboarding "path" step
+  - the roadmap skip flags ("Already known · Onboarding" sections)
+
+Plans depend only on each section's level (untested / to learn / already
+known), so they are cached per proficiency vector — users with the same
+score pattern share one plan.
+"""
+
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'mockup_data'))
+from content_index import load_content_index  # noqa: E402
+
+
+PASS_THRESHOLD = 0.80
+
+# Per-section level, in the order they appear in a proficiency vector
+LEVEL_UNTESTED = 0
+LEVEL_TO_LEARN = 1
+LEVEL_KNOWN    = 2
+
+
+# ---------------------------------------------------------------------------
+# Curriculum loader
+# ---------------------------------------------------------------------------
+
+def load_curriculum(index=None):
+    """
+    Sections in roadmap order (theme.orderIndex, then section.orderIndex),
+    taken from the shared content index.
+    """
+    index = index or load_content_index()
+    return [
+        {
+            'id':        index.section_ids[slug],
+            'slug':      slug,
+            'name':      index.section_names[slug],
+            'themeSlug': index.section_theme[slug],
+            'themeName': index.theme_names[index.section_theme[slug]],
+        }
+        for slug in (section['slug'] for section in index.sections)
+    ]
+
+
+def section_level(seen, correct, threshold=PASS_THRESHOLD):
+    """Same rule as getLevel() in the onboarding JS."""
+    if seen <= 0:
+        return LEVEL_UNTESTED
+    return LEVEL_KNOWN if correct / seen >= threshold else LEVEL_TO_LEARN
+
+
+# ---------------------------------------------------------------------------
+# Planner
+# ---------------------------------------------------------------------------
+
+class LearningPathPlanner:
+    """
+    Builds learning paths against a fixed curriculum.
+
+    Usage:
+        planner = LearningPathPlanner(load_curriculum())
+        plan = planner.plan({'airway-emergencies': {'seen': 3, 'correct': 3}})
+    """
+
+    def __init__(self, curriculum, threshold=PASS_THRESHOLD, cache_size=4096):
+        self.curriculum = curriculum
+        self.threshold = threshold
+        self.section_index = {s['slug']: i for i, s in enumerate(curriculum)}
+        self._plan_vector = lru_cache(maxsize=cache_size)(self._build_plan)
+
+    def proficiency_vector(self, section_scores):
+        """
+        Reduce { sectionSlug: {'seen': n, 'correct': m} } to a hashable tuple
+        of levels in curriculum order. Slugs not in the curriculum are ignored.
+        """
+        levels = [LEVEL_UNTESTED] * len(self.curriculum)
+        for slug, score in section_scores.items():
+            i = self.section_index.get(slug)
+            if i is not None:
+                levels[i] = section_level(score['seen'], score['correct'], self.threshold)
+        return tuple(levels)
+
+    def plan(self, section_scores):
+        """Plan for one user's section scores (shape of sectionScores in the JS)."""
+        return self._plan_vector(self.proficiency_vector(section_scores))
+
+    def plan_vector(self, levels):
+        """Plan for an already-computed proficiency vector."""
+        return self._plan_vector(tuple(levels))
+
+    def cache_info(self):
+        return self._plan_vector.cache_info()
+
+    def _build_plan(self, levels):
+        """
+        Single pass over the curriculum. Tested sections stay in roadmap
+        order, as buildPathList lists them; known ones are only flagged —
+        'pass' level and a skip flag so the roadmap can mark them skippable.
+        The returned plan is shared by every user with the same vector, so
+        callers must treat it as read-only.
+        """
+        path, skip, next_slug = [], set(), None
+        for section, level in zip(self.curriculum, levels):
+            if level == LEVEL_UNTESTED:
+                continue
+            entry = {
+                'sectionSlug': section['slug'],
+                'sectionName': section['name'],
+                'themeSlug':   section['themeSlug'],
+                'level':       'pass' if level == LEVEL_KNOWN else 'fail',
+            }
+            path.append(entry)
+            if level == LEVEL_KNOWN:
+                skip.add(section['slug'])
+            elif next_slug is None:
+                next_slug = section['slug']
+
+        return {
+            'path':      tuple(path),
+            'skippable': frozenset(skip),
+            'nextSectionSlug': next_slug,
+        }
+
+
+def plan_scored_batch(planner, result):
+    """
+    Yield (user_id, plan) for a batch scored by scoring.score_answers —
+    each distinct score pattern is planned once.
+    """
+    slugs = result['section_slugs']
+    seen, correct = result['questions_seen'], result['questions_correct']
+    for row, user_id in enumerate(result['user_ids']):
+        scores = {
+            slug: {'seen': int(seen[row, col]), 'correct': int(correct[row, col])}
+            for col, slug in enumerate(slugs)
+        }
+        yield user_id, planner.plan(scores)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    print("Loading curriculum from the content index...")
+    planner = LearningPathPlanner(load_curriculum())
+    print(f"  - Sections: {len(planner.curriculum)}")
+
+    sample_scores = {
+        'airway-emergencies':  {'seen': 3, 'correct': 3},
+        'cardiac-emergencies': {'seen': 3, 'correct': 1},
+        'mood-disorders':      {'seen': 3, 'correct': 2},
+    }
+    plan = planner.plan(sample_scores)
+    for entry in plan['path']:
+        label = 'Already known' if entry['level'] == 'pass' else 'To learn'
+        print(f"  {entry['sectionName']:<40} {label}")
+    print(f"  Next section: {plan['nextSectionSlug']}")
+
+
+if __name__ == "__main__":
+    main()
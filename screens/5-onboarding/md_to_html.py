@@ -14,31 +14,25 @@ import json
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'mockup_data'))
+from content_index import load_content_index  # noqa: E402
+from content_validator import load_validated  # noqa: E402
+from question_records import normalize_questions  # noqa: E402
+
 
 # ---------------------------------------------------------------------------
 # Loader & validator
 # ---------------------------------------------------------------------------
 
 def load_assessment_json(filepath):
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        if 'version' not in data or 'questions' not in data:
-            raise ValueError("Invalid assessment JSON: missing 'version' or 'questions'")
-        if not isinstance(data['questions'], list) or len(data['questions']) == 0:
-            raise ValueError("Invalid assessment JSON: 'questions' must be a non-empty array")
-        if 'ageGroups' not in data:
-            raise ValueError("Invalid assessment JSON: missing 'ageGroups'")
-        return data
-    except FileNotFoundError:
-        print(f"Error: File not found: {filepath}")
-        sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON format: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error loading assessment: {e}")
+    """Load the assessment JSON file, reporting every spec.md violation at once."""
+    data, errors = load_validated(filepath, 'assessment')
+    if errors:
+        print(f"Error: Invalid assessment JSON: {filepath} ({len(errors)} problems)")
+        for error in errors:
+            print(f"  - {error}")
         sys.exit(1)
+    return data
 
 
 # ---------------------------------------------------------------------------
@@ -88,25 +82,25 @@ def generate_step1_age(age_groups):
         </div>'''
 
 
-def generate_question_mc(q):
+def generate_question_mc(rec):
     """Multiple choice question screen"""
     options_html = ''
-    for opt in q['options']:
-        correct = str(opt['isCorrect']).lower()
+    for opt_id, text in rec.options:
+        correct = str(opt_id in rec.correct_tokens).lower()
         options_html += f'''
-                    <button class="quiz-option" data-correct="{correct}" data-option-id="{opt['id']}">
-                        <span class="option-label">{opt['id'].upper()}</span>
-                        <span class="option-text">{opt['text']}</span>
+                    <button class="quiz-option" data-correct="{correct}" data-option-id="{opt_id}">
+                        <span class="option-label">{opt_id.upper()}</span>
+                        <span class="option-text">{text}</span>
                         <span class="option-feedback"></span>
                     </button>'''
 
     return f'''
-        <div class="step quiz-step" id="q-{q['id']}" data-section="{q['sectionSlug']}">
+        <div class="step quiz-step" id="q-{rec.id}" data-section="{rec.section_slug}">
             <div class="step-header">
                 <span class="step-type-label label-quiz">{SVG_QUIZ} Question</span>
             </div>
             <div class="step-body">
-                <div class="question-text">{q['questionText']}</div>
+                <div class="question-text">{rec.question_text}</div>
                 <div class="quiz-options">
                     {options_html}
                 </div>
@@ -114,18 +108,18 @@ def generate_question_mc(q):
         </div>'''
 
 
-def generate_question_tf(q):
+def generate_question_tf(rec):
     """True/False question screen"""
-    true_is_correct  = str(next(o['isCorrect'] for o in q['options'] if o['text'].lower() in ('true', 'đúng'))).lower()
-    false_is_correct = str(next(o['isCorrect'] for o in q['options'] if o['text'].lower() in ('false', 'sai'))).lower()
+    true_is_correct  = str(rec.tf_answer is True).lower()
+    false_is_correct = str(rec.tf_answer is False).lower()
 
     return f'''
-        <div class="step quiz-step" id="q-{q['id']}" data-section="{q['sectionSlug']}">
+        <div class="step quiz-step" id="q-{rec.id}" data-section="{rec.section_slug}">
             <div class="step-header">
                 <span class="step-type-label label-quiz">{SVG_TF} True or False?</span>
             </div>
             <div class="step-body">
-                <div class="question-text">{q['questionText']}</div>
+                <div class="question-text">{rec.question_text}</div>
                 <div class="quiz-options tf-options">
                     <button class="quiz-option tf-option" data-correct="{true_is_correct}" data-value="true">
                         <span class="option-label tf-check">{SVG_TF_CHECK}</span>
@@ -142,13 +136,27 @@ def generate_question_tf(q):
         </div>'''
 
 
-def generate_question_screen(q):
-    qtype = q.get('questionType')
-    if qtype == 'multiple_choice':
-        return generate_question_mc(q)
-    if qtype == 'true_false':
-        return generate_question_tf(q)
-    return f'<div class="step" id="q-{q["id"]}">Unknown question type: {qtype}</div>'
+def generate_question_screen(rec):
+    """Dispatch on question type; takes a QuestionRecord (question_records.py)"""
+    if rec.question_type == 'multiple_choice':
+        return generate_question_mc(rec)
+    if rec.question_type == 'true_false':
+        return generate_question_tf(rec)
+    return f'<div class="step" id="q-{rec.id}">Unknown question type: {rec.question_type}</div>'
+
+
+def generate_question_placeholder():
+    """Lazy mode — single quiz step, filled in by renderQuestion() in JS"""
+    return '''
+        <div class="step quiz-step" id="step-quiz">
+            <div class="step-header">
+                <span class="step-type-label label-quiz"></span>
+            </div>
+            <div class="step-body">
+                <div class="question-text"></div>
+                <div class="quiz-options"></div>
+            </div>
+        </div>'''
 
 
 def generate_step_explainer():
@@ -267,60 +275,70 @@ def generate_step_path():
 # Full HTML generator
 # ---------------------------------------------------------------------------
 
-def generate_html(data):
+def tested_sections(data, index):
+    """Distinct sectionSlugs in the assessment, in roadmap order."""
+    slugs = {q['sectionSlug'] for q in data['questions']}
+    return sorted(slugs, key=lambda slug: (index.roadmap_order.get(slug, len(index.roadmap_order)), slug))
+
+
+def generate_html(data, index=None, sections=None, lazy=False):
+    """
+    Build the onboarding page.
+
+    lazy=False  every question is pre-rendered as a hidden .step (default)
+    lazy=True   only one quiz step is in the DOM; questions are shipped once,
+                as compact JSON, and rendered as the user advances
+    """
+    index        = index or load_content_index()
+    sections     = sections if sections is not None else tested_sections(data, index)
     meta         = data.get('meta', {})
     title        = meta.get('title', 'Placement Assessment')
     subtitle     = meta.get('subtitle', 'Cá nhân hóa lộ trình học của bạn')
     age_groups   = data['ageGroups']
-    questions    = sorted(data['questions'], key=lambda q: q['orderIndex'])
+    questions    = normalize_questions(data)
     total_steps  = 1 + 1 + len(questions) + 1 + 1   # age + explainer + questions + results + path
 
     # Build all steps HTML
     # Order: age → explainer → questions → results → path
     steps_html = generate_step1_age(age_groups)
     steps_html += generate_step_explainer()
-    for q in questions:
-        steps_html += generate_question_screen(q)
+    if lazy:
+        steps_html += generate_question_placeholder()
+    else:
+        for rec in questions:
+            steps_html += generate_question_screen(rec)
     steps_html += generate_step_results()
     steps_html += generate_step_path()
 
     # Build JS question data for scoring
-    questions_js = json.dumps([
+    questions_data = [
         {
-            'id': q['id'],
-            'sectionSlug': q['sectionSlug'],
-            'correctOptionId': next(
-                (o['id'] for o in q['options'] if o.get('isCorrect')),
-                'a' if q['questionType'] == 'multiple_choice' else None
-            ) if q['questionType'] == 'multiple_choice' else None,
-            'correctAnswer': next(
-                (o['isCorrect'] for o in q['options'] if o['text'].lower() in ('true', 'đúng')),
-                True
-            ) if q['questionType'] == 'true_false' else None,
-            'questionType': q['questionType'],
-        }
-        for q in questions
-    ], ensure_ascii=False, indent=2)
-
-    section_labels_js = json.dumps({
-        'airway-emergencies':                    'Airway Emergencies',
-        'cardiac-emergencies':                   'Cardiac Emergencies',
-        'trauma-first-response':                 'Trauma First Response',
-        'anxiety-spectrum-disorders':            'Anxiety Spectrum Disorders',
-        'mood-disorders':                        'Mood Disorders',
-        'crisis-intervention':                   'Crisis Intervention',
-        'sleep-and-stress-medicine':             'Sleep & Stress Medicine',
-        'balanced-nutrition-principles':         'Balanced Nutrition Principles',
-        'clinical-nutrition-in-chronic-disease': 'Clinical Nutrition in Chronic Disease',
-        'metabolic-syndrome-and-obesity':        'Metabolic Syndrome & Obesity',
-        'prevention-and-infection-control':      'Prevention & Infection Control',
-        'respiratory-infections':                'Respiratory Infections',
-        'gastrointestinal-infections':           'Gastrointestinal Infections',
-        'vector-borne-diseases':                 'Vector-Borne Diseases',
-        'prenatal-care-pathways':                'Prenatal Care Pathways',
-        'newborn-care-essentials':               'Newborn Care Essentials',
-        'common-pediatric-illnesses':            'Common Pediatric Illnesses',
-    }, ensure_ascii=False)
+            'id': rec.id,
+            'sectionSlug': rec.section_slug,
+            'correctOptionId': rec.correct_option_id,
+            'correctAnswer': rec.tf_answer,
+            'questionType': rec.question_type,
+        }
+        for rec in questions
+    ]
+
+    if lazy:
+        # Lazy mode carries the display data too — this is the only copy
+        for record, rec in zip(questions_data, questions):
+            record['questionText'] = rec.question_text
+            if rec.question_type == 'multiple_choice':
+                record['options'] = [{'id': opt_id, 'text': text} for opt_id, text in rec.options]
+        questions_js = json.dumps(questions_data, ensure_ascii=False, separators=(',', ':'))
+        icons_js = json.dumps({'quiz': SVG_QUIZ, 'tf': SVG_TF, 'check': SVG_TF_CHECK, 'x': SVG_TF_X})
+        script_js = f"const ICONS = {icons_js};\n        {JS_LAZY}"
+    else:
+        questions_js = json.dumps(questions_data, ensure_ascii=False, indent=2)
+        script_js = JS
+
+    section_labels_js = json.dumps(
+        {slug: index.section_label(slug) for slug in sections},
+        ensure_ascii=False,
+    )
 
     return f"""<!DOCTYPE html>
 <html lang="en">
@@ -376,7 +394,7 @@ def generate_html(data):
         const QUESTIONS = {questions_js};
         const SECTION_LABELS = {section_labels_js};
         const TOTAL_STEPS = {total_steps};
-        {JS}
+        {script_js}
     </script>
 </body>
 </html>
@@ -835,7 +853,8 @@ CSS = """
 # JavaScript
 # ---------------------------------------------------------------------------
 
-JS = """
+# Shared by both output modes: sidebar/navbar behaviour
+JS_NAV = """
         // ===== SIDEBAR & NAVBAR =====
         function toggleMobileSidebar() {
             document.getElementById('sidebar').classList.toggle('mobile-open');
@@ -855,6 +874,10 @@ JS = """
             document.getElementById(id).classList.toggle('expanded');
         }
 
+"""
+
+# Default mode: every question is pre-rendered as a hidden .step
+JS_STEPS = """
         // ===== ONBOARDING STATE =====
         const steps      = Array.from(document.querySelectorAll('.step'));
         let currentStep  = 0;
@@ -938,14 +961,6 @@ JS = """
             if (currentStep > 0) showStep(currentStep - 1);
         }
 
-        // ===== AGE SELECTION =====
-        function selectAge(card) {
-            document.querySelectorAll('.age-card').forEach(c => c.classList.remove('selected'));
-            card.classList.add('selected');
-            selectedAge = card.dataset.ageId;
-            updateNavButtons();
-        }
-
         // ===== QUIZ INTERACTION =====
         document.querySelectorAll('.quiz-option').forEach(option => {
             option.addEventListener('click', function () {
@@ -986,6 +1001,163 @@ JS = """
             });
         });
 
+"""
+
+# Lazy mode: one quiz step, questions rendered from QUESTIONS on demand
+JS_STEPS_LAZY = """
+        // ===== ONBOARDING STATE (lazy questions) =====
+        // Only one quiz step exists in the DOM; each question is rendered
+        // into it from QUESTIONS when the user reaches it.
+        const stepEls = {
+            age:       document.getElementById('step-age'),
+            explainer: document.getElementById('step-explainer'),
+            quiz:      document.getElementById('step-quiz'),
+            results:   document.getElementById('step-results'),
+            path:      document.getElementById('step-path'),
+        };
+        const FIRST_QUESTION_STEP = 2;
+        let currentStep  = 0;
+        let selectedAge  = null;
+
+        // Per-question answer tracking: { questionId: { correct: bool, choice: optionId | 'true' | 'false' } }
+        const answers = {};
+
+        // Per-section score tracking: { sectionSlug: { seen: 0, correct: 0 } }
+        const sectionScores = {};
+
+        showStep(0);
+
+        function stepAt(index) {
+            if (index === 0) return { el: stepEls.age };
+            if (index === 1) return { el: stepEls.explainer };
+            const qi = index - FIRST_QUESTION_STEP;
+            if (qi < QUESTIONS.length) return { el: stepEls.quiz, question: QUESTIONS[qi] };
+            return { el: qi === QUESTIONS.length ? stepEls.results : stepEls.path };
+        }
+
+        function showStep(index) {
+            const target = stepAt(index);
+            Object.values(stepEls).forEach(s => s.classList.remove('active'));
+            if (target.question) renderQuestion(target.question);
+            target.el.classList.add('active');
+            currentStep = index;
+            updateProgress();
+            updateNavButtons();
+            window.scrollTo({ top: 0, behavior: 'smooth' });
+        }
+
+        function updateProgress() {
+            const pct = ((currentStep + 1) / TOTAL_STEPS) * 100;
+            document.getElementById('progressBar').style.width = pct + '%';
+            document.getElementById('progressCount').textContent = (currentStep + 1) + ' / ' + TOTAL_STEPS;
+        }
+
+        function updateNavButtons() {
+            const prevBtn = document.getElementById('prevBtn');
+            const nextBtn = document.getElementById('nextBtn');
+            const target  = stepAt(currentStep);
+
+            prevBtn.disabled = currentStep === 0;
+            nextBtn.style.display = '';
+
+            if (target.el === stepEls.age) {
+                nextBtn.disabled = selectedAge === null;
+                return;
+            }
+            if (target.question) {
+                nextBtn.disabled = !(target.question.id in answers);
+                return;
+            }
+            if (target.el === stepEls.results) buildScoreBreakdown();
+            if (target.el === stepEls.path) {
+                buildPathList();
+                nextBtn.style.display = 'none';
+                return;
+            }
+            nextBtn.disabled = false;
+        }
+
+        function nextStep() {
+            if (currentStep < TOTAL_STEPS - 1) showStep(currentStep + 1);
+        }
+
+        function previousStep() {
+            if (currentStep > 0) showStep(currentStep - 1);
+        }
+
+        // ===== QUESTION RENDERING =====
+        function renderQuestion(q) {
+            const el = stepEls.quiz;
+            const tf = q.questionType === 'true_false';
+            el.dataset.section = q.sectionSlug;
+            el.querySelector('.step-type-label').innerHTML = tf ? ICONS.tf + ' True or False?' : ICONS.quiz + ' Question';
+            el.querySelector('.question-text').innerHTML = q.questionText;
+
+            const choices = tf
+                ? [
+                    { value: 'true',  label: ICONS.check, labelClass: ' tf-check', text: 'True'  },
+                    { value: 'false', label: ICONS.x,     labelClass: ' tf-x',     text: 'False' },
+                  ]
+                : q.options.map(o => ({ value: o.id, label: o.id.toUpperCase(), labelClass: '', text: o.text }));
+
+            const list = el.querySelector('.quiz-options');
+            list.classList.toggle('tf-options', tf);
+            list.innerHTML = choices.map(c => `
+                    <button class="quiz-option${tf ? ' tf-option' : ''}" data-value="${c.value}">
+                        <span class="option-label${c.labelClass}">${c.label}</span>
+                        <span class="option-text">${c.text}</span>
+                        <span class="option-feedback"></span>
+                    </button>`).join('');
+
+            if (q.id in answers) markAnswered(q, answers[q.id].choice);
+        }
+
+        function isCorrectChoice(q, choice) {
+            return q.questionType === 'true_false'
+                ? (choice === 'true') === q.correctAnswer
+                : choice === q.correctOptionId;
+        }
+
+        function markAnswered(q, choice) {
+            stepEls.quiz.querySelectorAll('.quiz-option').forEach(opt => {
+                opt.classList.add('answered');
+                const right = isCorrectChoice(q, opt.dataset.value);
+                if (opt.dataset.value === choice) opt.classList.add(right ? 'correct' : 'incorrect');
+                else if (right) opt.classList.add('correct');
+            });
+        }
+
+        // ===== QUIZ INTERACTION =====
+        stepEls.quiz.addEventListener('click', e => {
+            const option = e.target.closest('.quiz-option');
+            const q      = stepAt(currentStep).question;
+            if (!option || !q || q.id in answers) return;
+
+            const choice    = option.dataset.value;
+            const isCorrect = isCorrectChoice(q, choice);
+            answers[q.id] = { correct: isCorrect, choice: choice };
+
+            const slug = q.sectionSlug;
+            if (!sectionScores[slug]) sectionScores[slug] = { seen: 0, correct: 0 };
+            sectionScores[slug].seen++;
+            if (isCorrect) sectionScores[slug].correct++;
+
+            markAnswered(q, choice);
+            updateNavButtons();
+        });
+
+"""
+
+# Shared: age picker, results breakdown, learning path
+JS_SHARED = """
+        // ===== AGE SELECTION =====
+        function selectAge(card) {
+            document.querySelectorAll('.age-card').forEach(c => c.classList.remove('selected'));
+            card.classList.add('selected');
+            selectedAge = card.dataset.ageId;
+            updateNavButtons();
+        }
+
         // ===== SCORING BREAKDOWN =====
         function getLevel(seen, correct) {
             if (seen === 0) return 'fail';
@@ -1048,6 +1220,9 @@ JS = """
         });
 """
 
+JS      = JS_NAV + JS_STEPS + JS_SHARED
+JS_LAZY = JS_NAV + JS_STEPS_LAZY + JS_SHARED
+
 
 # ---------------------------------------------------------------------------
 # Navbar & Sidebar (identical to json_to_html.py)
@@ -1157,6 +1332,9 @@ SIDEBAR_HTML = """
 # Entry point
 # ---------------------------------------------------------------------------
 
+# Above this many questions, main() switches to lazy question rendering
+LAZY_QUESTION_THRESHOLD = 60
+
 def main():
     input_path  = r"medicalogy_docs\screens\5-onboarding\initial_assessment.json"
     output_path = r"medicalogy_docs\screens\5-onboarding\demo.html"
@@ -1169,10 +1347,14 @@ def main():
     print(f"  - Age groups:      {len(data['ageGroups'])}")
     print(f"  - Questions:       {len(data['questions'])}")
 
-    sections = list({q['sectionSlug'] for q in data['questions']})
+    index    = load_content_index()
+    sections = tested_sections(data, index)
     print(f"  - Sections tested: {len(sections)} ({', '.join(sections)})")
 
-    html = generate_html(data)
+    lazy = len(data['questions']) > LAZY_QUESTION_THRESHOLD
+    print(f"  - Question mode:   {'lazy (rendered on demand)' if lazy else 'pre-rendered'}")
+
+    html = generate_html(data, index, sections, lazy=lazy)
 
     print(f"Writing HTML to: {output_path}")
     with open(output_path, 'w', encoding='utf-8') as f:
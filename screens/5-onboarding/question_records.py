@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Assessment Question Records
+Normalisation stage between initial_assessment.json and everything that reads it.
+
+Each question is parsed once into a QuestionRecord that already knows its
+correct option id, its True/False answer and a map from every accepted
+(localised, case-folded) option label to the option id. The onboarding page
+renderers (md_to_html.py) and the batch scorer (scoring.py) read these
+fields instead of scanning q['options'] and folding option text themselves.
+"""
+
+import unicodedata
+from typing import NamedTuple, Optional
+
+
+# Option texts accepted as the True / False side of a true_false question
+TF_TRUE_TEXTS  = ('true', 'đúng')
+TF_FALSE_TEXTS = ('false', 'sai')
+
+
+def fold_label(text):
+    """Case- and normalisation-insensitive form of an option label."""
+    return unicodedata.normalize('NFC', str(text)).strip().casefold()
+
+
+_TF_ALIASES = {
+    'true':  tuple(fold_label(t) for t in TF_TRUE_TEXTS),
+    'false': tuple(fold_label(t) for t in TF_FALSE_TEXTS),
+}
+_TF_VALUES = {alias: value for value, aliases in _TF_ALIASES.items() for alias in aliases}
+
+
+class QuestionRecord(NamedTuple):
+    """
+    One assessment question, normalised.
+
+    options            — ((optionId, text), ...) in file order
+    correct_option_id  — first correct option id (multiple_choice; falls back
+                         to 'a' when none is flagged, as the page always has)
+    tf_answer          — True / False for true_false questions, else None
+    tf_option_ids      — { 'true': optionId, 'false': optionId } (true_false)
+    labels             — { folded option id / option text / True-False alias
+                         in any supported language: optionId }
+    correct_tokens     — every answer token that scores as correct: correct
+                         option ids, plus 'true'/'false' for true_false
+    """
+    id: str
+    order_index: int
+    section_slug: str
+    question_type: str
+    question_text: str
+    options: tuple
+    correct_option_id: Optional[str]
+    tf_answer: Optional[bool]
+    tf_option_ids: dict
+    labels: dict
+    correct_tokens: frozenset
+
+    def option_id_for(self, answer):
+        """Resolve a submitted label or option id to the option id, or None."""
+        if isinstance(answer, bool):
+            return self.tf_option_ids.get('true' if answer else 'false')
+        return self.labels.get(fold_label(answer))
+
+
+def normalize_question(q):
+    """Parse one question dict from the assessment JSON into a QuestionRecord."""
+    qtype = q['questionType']
+    options, labels, tf_option_ids = [], {}, {}
+    correct_ids = []
+
+    for opt in q['options']:
+        opt_id = str(opt['id'])
+        options.append((opt_id, opt.get('text', '')))
+        labels.setdefault(fold_label(opt_id), opt_id)
+        if opt.get('isCorrect'):
+            correct_ids.append(opt_id)
+
+    for opt_id, text in options:
+        folded = fold_label(text)
+        labels.setdefault(folded, opt_id)
+        if qtype == 'true_false' and folded in _TF_VALUES:
+            value = _TF_VALUES[folded]
+            tf_option_ids.setdefault(value, opt_id)
+            for alias in _TF_ALIASES[value]:
+                labels.setdefault(alias, opt_id)
+
+    correct_tokens = set(correct_ids)
+    tf_answer = None
+    correct_option_id = None
+    if qtype == 'true_false':
+        # Same default as before normalisation: no "true" option → True
+        true_id = tf_option_ids.get('true')
+        tf_answer = true_id in correct_ids if true_id is not None else True
+        correct_tokens |= {value for value, opt_id in tf_option_ids.items() if opt_id in correct_ids}
+    elif qtype == 'multiple_choice':
+        correct_option_id = correct_ids[0] if correct_ids else 'a'
+
+    return QuestionRecord(
+        id=q['id'],
+        order_index=q.get('orderIndex', 0),
+        section_slug=q['sectionSlug'],
+        question_type=qtype,
+        question_text=q.get('questionText', ''),
+        options=tuple(options),
+        correct_option_id=correct_option_id,
+        tf_answer=tf_answer,
+        tf_option_ids=tf_option_ids,
+        labels=labels,
+        correct_tokens=frozenset(correct_tokens),
+    )
+
+
+def normalize_questions(data):
+    """All questions of an assessment as QuestionRecords, in orderIndex order."""
+    questions = sorted(data['questions'], key=lambda q: q['orderIndex'])
+    return [normalize_question(q) for q in questions]
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Placement Assessment Batch Scorer
+Scores a batch of onboarding answer sets against the initial_assessment key
+and emits bulk rows for initial_user_section_proficiency.
+
+Scoring follows the onboarding page (buildScoreBreakdown / getLevel in
+md_to_html.py) and spec.md:
+  questions_seen    = questions the user answered for that sectionSlug
+  questions_correct = answered questions where the chosen option is correct
+  questions_correct / questions_seen >= 0.80  →  "Already known"
+
+Answers are flattened into parallel arrays (user, question, option) and the
+per-section counts are NumPy group-by reductions, so re-scoring every user
+after a question-bank fix is a handful of array passes instead of a loop
+over users. Requires NumPy.
+
+main() scores user_initial_assessment_answers.json, a small sample of
+answer sets ([{"userId", "answers": {questionId: answer}}]), into
+initial_user_section_proficiency.sql.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'mockup_data'))
+from content_index import load_content_index  # noqa: E402
+from question_records import normalize_questions  # noqa: E402
+
+
+PASS_THRESHOLD = 0.80
+
+
+# ---------------------------------------------------------------------------
+# Answer key
+# ---------------------------------------------------------------------------
+
+def build_answer_key(data):
+    """
+    Compile the assessment JSON into array form.
+
+    Returns a dict with:
+      question_ids    — list of question ids, column order of every array below
+      question_index  — { questionId: column }
+      section_slugs   — list of distinct sectionSlug values (group order)
+      question_section — int array, column → group index into section_slugs
+      correct_tokens  — { questionId: set of answer tokens that are correct }
+      records         — { questionId: QuestionRecord }
+
+    Answers may arrive as the option id, a bool, the data-value the
+    onboarding page puts on the True/False buttons, or an option label in
+    any supported language ('Đúng', the text of an option);
+    QuestionRecord.option_id_for resolves the labels to option ids.
+    """
+    questions = normalize_questions(data)
+
+    section_slugs = []
+    section_index = {}
+    question_section = np.empty(len(questions), dtype=np.int32)
+
+    for col, rec in enumerate(questions):
+        if rec.section_slug not in section_index:
+            section_index[rec.section_slug] = len(section_slugs)
+            section_slugs.append(rec.section_slug)
+        question_section[col] = section_index[rec.section_slug]
+
+    return {
+        'question_ids':     [rec.id for rec in questions],
+        'question_index':   {rec.id: i for i, rec in enumerate(questions)},
+        'section_slugs':    section_slugs,
+        'question_section': question_section,
+        'correct_tokens':   {rec.id: rec.correct_tokens for rec in questions},
+        'records':          {rec.id: rec for rec in questions},
+    }
+
+
+def _factorize(values):
+    """Hash-encode values to dense int codes; returns (uniques, codes)."""
+    index = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values),
+                        dtype=np.int64, count=len(values))
+    return list(index), codes
+
+
+def _answer_token(value):
+    """Normalise one submitted answer to the token form used by the key."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    token = str(value).strip()
+    return token.lower() if token.lower() in ('true', 'false') else token
+
+
+# ---------------------------------------------------------------------------
+# Answer sets → columns
+# ---------------------------------------------------------------------------
+
+def flatten_answer_sets(answer_sets):
+    """
+    Flatten [{ "userId": ..., "answers": { questionId: answer } }, ...]
+    into three parallel arrays (user_ids, question_ids, answers).
+    """
+    user_ids, question_ids, answers = [], [], []
+    for entry in answer_sets:
+        uid = entry['userId']
+        for qid, value in entry.get('answers', {}).items():
+            user_ids.append(uid)
+            question_ids.append(qid)
+            answers.append(_answer_token(value))
+    return (np.asarray(user_ids, dtype=object),
+            np.asarray(question_ids, dtype=object),
+            np.asarray(answers, dtype=object))
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+def score_answers(key, user_ids, question_ids, answers):
+    """
+    Score flattened answers against a compiled key.
+
+    Answers for questions no longer in the key are dropped; if a user answered
+    the same question twice, the last answer wins. Returns a dict with:
+      user_ids          — distinct users (row order)
+      section_slugs     — key['section_slugs'] (column order)
+      questions_seen    — int array (users × sections)
+      questions_correct — int array (users × sections)
+    """
+    n_sections = len(key['section_slugs'])
+    empty = np.zeros((0, n_sections), dtype=np.int64)
+    if len(user_ids) == 0:
+        return {'user_ids': [], 'section_slugs': key['section_slugs'],
+                'questions_seen': empty, 'questions_correct': empty}
+
+    # Map the (few) distinct question ids and answer tokens once, then
+    # broadcast the lookups back over every answer.
+    uq_q, q_inv = _factorize(question_ids)
+    q_col = np.array([key['question_index'].get(q, -1) for q in uq_q], dtype=np.int64)[q_inv]
+
+    uq_a, a_inv = _factorize(answers)
+    qids = key['question_ids']
+    correct_table = np.zeros((len(qids), len(uq_a)), dtype=bool)
+    for col, qid in enumerate(qids):
+        tokens, rec = key['correct_tokens'][qid], key['records'][qid]
+        for j, tok in enumerate(uq_a):
+            correct_table[col, j] = tok in tokens or rec.option_id_for(tok) in tokens
+
+    valid = q_col >= 0
+    q_col, a_inv = q_col[valid], a_inv[valid]
+
+    uq_u, u_inv = _factorize(user_ids[valid])
+    n_users, n_questions = len(uq_u), len(qids)
+
+    # Last answer wins for repeated (user, question) cells.
+    cell = u_inv.astype(np.int64) * n_questions + q_col
+    _, last_rev = np.unique(cell[::-1], return_index=True)
+    keep = len(cell) - 1 - last_rev
+    u_keep, q_keep, a_keep = u_inv[keep], q_col[keep], a_inv[keep]
+
+    is_correct = correct_table[q_keep, a_keep]
+    group = u_keep.astype(np.int64) * n_sections + key['question_section'][q_keep]
+    size = n_users * n_sections
+
+    seen    = np.bincount(group, minlength=size).reshape(n_users, n_sections)
+    correct = np.bincount(group, weights=is_correct, minlength=size).astype(np.int64)
+    correct = correct.reshape(n_users, n_sections)
+
+    return {
+        'user_ids':          uq_u,
+        'section_slugs':     key['section_slugs'],
+        'questions_seen':    seen,
+        'questions_correct': correct,
+    }
+
+
+def score_answer_sets(data, answer_sets):
+    """Convenience wrapper: compile the key and score nested answer sets."""
+    key = build_answer_key(data)
+    return score_answers(key, *flatten_answer_sets(answer_sets))
+
+
+def passed_mask(result, threshold=PASS_THRESHOLD):
+    """Boolean users × sections array — True where the section is already known."""
+    seen = result['questions_seen']
+    ratio = result['questions_correct'] / np.maximum(seen, 1)
+    return (seen > 0) & (ratio >= threshold)
+
+
+# ---------------------------------------------------------------------------
+# initial_user_section_proficiency rows
+# ---------------------------------------------------------------------------
+
+def proficiency_rows(result, assessment_id, section_ids):
+    """
+    Yield (user_id, initial_assessment_id, section_id, questions_seen,
+    questions_correct) for every (user, section) with at least one answer.
+    section_ids maps sectionSlug → section.id (ContentIndex.section_ids);
+    sections missing from it are skipped — they have no row to reference
+    in the Learning Service.
+    """
+    seen, correct = result['questions_seen'], result['questions_correct']
+    section_id_col = [section_ids.get(slug) for slug in result['section_slugs']]
+    users, sections = np.nonzero(seen)
+    for u, s in zip(users.tolist(), sections.tolist()):
+        if section_id_col[s] is None:
+            continue
+        yield (result['user_ids'][u], assessment_id, section_id_col[s],
+               int(seen[u, s]), int(correct[u, s]))
+
+
+def proficiency_insert_sql(rows, batch_size=1000):
+    """Render rows as batched multi-row INSERT statements (SQL Server limit: 1000)."""
+    header = ('INSERT INTO initial_user_section_proficiency '
+              '(user_id, initial_assessment_id, section_id, questions_seen, questions_correct) VALUES\n')
+    batch = []
+    for user_id, assessment_id, section_id, seen, correct in rows:
+        batch.append(f"    ('{user_id}', '{assessment_id}', '{section_id}', {seen}, {correct})")
+        if len(batch) == batch_size:
+            yield header + ',\n'.join(batch) + ';\n'
+            batch = []
+    if batch:
+        yield header + ',\n'.join(batch) + ';\n'
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    here          = Path(__file__).resolve().parent
+    key_path      = here / 'initial_assessment.json'
+    answers_path  = here / 'user_initial_assessment_answers.json'
+    output_path   = here / 'initial_user_section_proficiency.sql'
+    assessment_id = 'A11D5CDA-0592-5A27-B9E9-19F785E94DA1'
+
+    try:
+        with open(key_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        with open(answers_path, 'r', encoding='utf-8') as f:
+            answer_sets = json.load(f)
+    except FileNotFoundError as e:
+        print(f"Error: File not found: {e.filename}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON format: {e}")
+        sys.exit(1)
+
+    print(f"Scoring {len(answer_sets)} answer sets against {key_path.name}...")
+    result = score_answer_sets(data, answer_sets)
+    known  = passed_mask(result)
+    print(f"  - Users scored:     {len(result['user_ids'])}")
+    print(f"  - Sections tested:  {len(result['section_slugs'])}")
+    print(f"  - Already known:    {int(known.sum())} (user, section) pairs")
+
+    rows = proficiency_rows(result, assessment_id, load_content_index().section_ids)
+
+    print(f"Writing SQL to: {output_path}")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for statement in proficiency_insert_sql(rows):
+            f.write(statement)
+
+    print(f"✓ Successfully generated {output_path}")
+
+
+if __name__ == "__main__":
+    main()
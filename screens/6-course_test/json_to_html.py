@@ -4,29 +4,27 @@ BioBasics Course JSON to HTML Converter
 Converts course JSON structure into an interactive HTML demonstration.
 """
 
-import json
+import os
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'mockup_data'))
+from content_index import load_content_index  # noqa: E402
+from content_validator import load_validated, validate_screen, validate_section_test_question  # noqa: E402
+from json_stream import JsonArrayStream  # noqa: E402
+from media_placeholders import placeholder_style  # noqa: E402
+from media_variants import load_responsive_media, picture_html, picture_sources  # noqa: E402
+
 
 def load_course_json(filepath):
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        if 'version' not in data or 'screens' not in data:
-            raise ValueError("Invalid course JSON: missing 'version' or 'screens'")
-        if not isinstance(data['screens'], list) or len(data['screens']) == 0:
-            raise ValueError("Invalid course JSON: 'screens' must be a non-empty array")
-        return data
-    except FileNotFoundError:
-        print(f"Error: File not found: {filepath}")
-        sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON format: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error loading course: {e}")
+    """Load a course JSON file, reporting every JSON_SPEC.md violation at once."""
+    data, errors = load_validated(filepath, 'course')
+    if errors:
+        print(f"Error: Invalid course JSON: {filepath} ({len(errors)} problems)")
+        for error in errors:
+            print(f"  - {error}")
         sys.exit(1)
+    return data
 
 
 # ---------------------------------------------------------------------------
@@ -50,12 +48,36 @@ SVG_ARROW_RIGHT = '<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16
 # Screen generators
 # ---------------------------------------------------------------------------
 
-def generate_infographic_html(screen_id, content):
+# Rendered width of an infographic image: the .container column (780px less
+# 2 × 32px padding), or the viewport less padding on narrower screens
+IMAGE_SIZES = '(max-width: 780px) calc(100vw - 64px), 716px'
+
+
+def _image_attrs(file_name, media):
+    """
+    width/height attributes for a media file when its dimensions are known,
+    plus its placeholder as the background when it has one.
+    """
+    info = (media or {}).get(file_name)
+    if not info or not info.get('width'):
+        return ''
+    return f' width="{info["width"]}" height="{info["height"]}"{placeholder_style(info)}'
+
+
+def generate_infographic_html(screen_id, content, media=None, eager=True):
+    """
+    eager=False marks the image loading="lazy" — for screens beyond the
+    first few, whose images the player prefetches just ahead of navigation.
+    """
     image_html = ""
     if content.get('imageFileName'):
+        file_name = content['imageFileName']
+        loading   = '' if eager else ' loading="lazy"'
+        img_html  = (f'<img src="{file_name}" alt="Educational infographic"'
+                     f'{_image_attrs(file_name, media)}{loading} decoding="async" />')
         image_html = f'''
                     <div class="infographic-image">
-                        <img src="{content['imageFileName']}" alt="Educational infographic" />
+                        {picture_html(img_html, (media or {}).get(file_name), IMAGE_SIZES)}
                     </div>'''
     summary = content.get('summaryText', '')
     return f'''
@@ -179,13 +201,13 @@ def generate_matching_html(screen_id, content):
             </div>'''
 
 
-def generate_screen_html(screen):
+def generate_screen_html(screen, media=None, eager=True):
     screen_id   = screen['id']
     screen_type = screen['type']
     content     = screen['content']
 
     if screen_type == 'infographic':
-        return generate_infographic_html(screen_id, content)
+        return generate_infographic_html(screen_id, content, media, eager)
 
     if screen_type == 'quiz':
         qtype = content.get('questionType')
@@ -507,6 +529,7 @@ CSS = """
             width: 100%; height: 240px; object-fit: cover;
             display: block; transition: transform 0.3s ease;
         }
+        .infographic-image picture { display: block; }
         .infographic-image:hover img { transform: scale(1.02); }
 
         .summary-text { font-size: 1.05rem; line-height: 1.8; color: var(--text-secondary); font-weight: 600; }
@@ -682,6 +705,29 @@ CSS = """
 # JavaScript
 # ---------------------------------------------------------------------------
 
+# Screens after the current one whose images are fetched ahead of navigation
+PREFETCH_AHEAD = 2
+
+# Runs before JS: showScreen(0) there already calls prefetchFrom()
+JS_PREFETCH = f"""
+        // ===== IMAGE PREFETCH =====
+        // Screens past the first few mark their images loading="lazy", which
+        // a hidden screen never triggers. While screen i is showing, switch
+        // the next PREFETCH_AHEAD screens' images to eager: each fetches
+        // through its own <picture>, so the browser picks the same candidate
+        // it will display.
+        const PREFETCH_AHEAD = {PREFETCH_AHEAD};
+
+        function prefetchFrom(index) {{
+            for (let i = index + 1; i <= index + PREFETCH_AHEAD && i < screens.length; i++) {{
+                screens[i].querySelectorAll('img[loading="lazy"]').forEach(img => {{
+                    img.loading = 'eager';
+                }});
+            }}
+        }}
+"""
+
+
 JS = """
         // ===== SIDEBAR & NAVBAR =====
         function toggleMobileSidebar() {
@@ -725,6 +771,7 @@ JS = """
             currentScreen = index;
             updateProgress();
             updateNavigation();
+            prefetchFrom(index);
             window.scrollTo({ top: 0, behavior: 'smooth' });
         }
 
@@ -1019,22 +1066,67 @@ SIDEBAR_HTML = """
     </aside>"""
 
 
-def generate_html(course_data):
-    screens_html  = '\n'.join(generate_screen_html(s) for s in course_data['screens'])
-    total_screens = len(course_data['screens'])
-    quiz_count    = sum(1 for s in course_data['screens'] if s.get('type') == 'quiz')
+def breadcrumb_names(course_slug, index=None):
+    """(theme, section, course) display names for a course slug, from the content index."""
+    index = index or load_content_index()
+    if course_slug not in index.course_names:
+        return {}
+    section_slug = index.course_section[course_slug]
+    return {
+        'themeName':  index.theme_names[index.section_theme[section_slug]],
+        'courseName': index.section_names[section_slug],
+        'lessonName': index.course_names[course_slug],
+    }
+
+
+def screen_image(screen):
+    """The image a screen shows, or None."""
+    if screen.get('type') == 'infographic':
+        return screen.get('content', {}).get('imageFileName') or None
+    return None
+
+
+def _preload_links(images, ahead=PREFETCH_AHEAD, media=None):
+    """
+    <link rel="preload"> for the images of the first screens (one entry per
+    screen, None = no image). Images with
+    variants preload their preferred format's srcset; browsers without that
+    format skip the hint.
+    """
+    first = []
+    for src in images[:1 + ahead]:
+        if src and src not in first:
+            first.append(src)
+    links = []
+    for src in first:
+        sources = picture_sources((media or {}).get(src))
+        if sources:
+            mime, srcset = sources[0]
+            links.append(f'\n    <link rel="preload" as="image" href="{src}" type="{mime}" '
+                         f'imagesrcset="{srcset}" imagesizes="{IMAGE_SIZES}">')
+        else:
+            links.append(f'\n    <link rel="preload" as="image" href="{src}">')
+    return ''.join(links)
+
+
+def _page_names(course_data, course_slug=None):
+    names = {**breadcrumb_names(course_slug), **course_data} if course_slug else course_data
+    return (
+        names.get('themeName',  'Emergency Care'),
+        names.get('courseName', 'Choking Emergency'),
+        names.get('lessonName', 'Essential First Aid Skills'),
+    )
 
-    theme_name  = course_data.get('themeName',  'Emergency Care')
-    course_name = course_data.get('courseName', 'Choking Emergency')
-    lesson_name = course_data.get('lessonName', 'Essential First Aid Skills')
 
+def _page_head(theme_name, course_name, lesson_name, total_label, preload_html=''):
+    """Everything up to and including the opening of #screensContainer."""
     return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>BioBasics Course Demo - {course_name}</title>
-    <link href="https://fonts.googleapis.com/css2?family=Nunito:wght@400;600;700;800;900&display=swap" rel="stylesheet">
+    <link href="https://fonts.googleapis.com/css2?family=Nunito:wght@400;600;700;800;900&display=swap" rel="stylesheet">{preload_html}
     <style>{CSS}
     </style>
 </head>
@@ -1059,7 +1151,7 @@ def generate_html(course_data):
             <div class="progress-container">
                 <div class="progress-meta">
                     <span class="progress-label">Progress</span>
-                    <span class="progress-count" id="progressCount">1 / {total_screens}</span>
+                    <span class="progress-count" id="progressCount">1 / {total_label}</span>
                 </div>
                 <div class="progress-bar">
                     <div class="progress-fill" id="progressBar" style="width: 8%"></div>
@@ -1067,7 +1159,12 @@ def generate_html(course_data):
             </div>
 
             <div id="screensContainer">
-                {screens_html}
+                """
+
+
+def _page_tail(course_name, total_screens, quiz_count):
+    """Everything after the last screen."""
+    return f"""
             </div>
 
             <div class="navigation">
@@ -1097,20 +1194,141 @@ def generate_html(course_data):
         </div>
     </div>
 
-    <script>{JS}
+    <script>
+        {JS_PREFETCH}{JS}
     </script>
 </body>
 </html>
 """
 
 
+def generate_html(course_data, course_slug=None, media=None):
+    """
+    media — optional { imageFileName: media entry } (load_responsive_media())
+    used for intrinsic <img> dimensions and srcset variants.
+    """
+    screens_html  = '\n'.join(
+        generate_screen_html(s, media, eager=i <= PREFETCH_AHEAD)
+        for i, s in enumerate(course_data['screens'])
+    )
+    total_screens = len(course_data['screens'])
+    quiz_count    = sum(1 for s in course_data['screens'] if s.get('type') == 'quiz')
+    images        = [screen_image(s) for s in course_data['screens']]
+
+    theme_name, course_name, lesson_name = _page_names(course_data, course_slug)
+
+    return (_page_head(theme_name, course_name, lesson_name, total_screens, _preload_links(images, media=media))
+            + screens_html
+            + _page_tail(course_name, total_screens, quiz_count))
+
+
+# ---------------------------------------------------------------------------
+# Streaming render (large courses / section tests)
+# ---------------------------------------------------------------------------
+
+def section_test_screen(question):
+    """A section test question (JSON_SPEC.md Part 2) as a quiz screen."""
+    return {
+        'id':         question['id'],
+        'type':       'quiz',
+        'orderIndex': question['orderIndex'],
+        'content':    question['content'],
+    }
+
+
+def stream_html(input_path, out, course_slug=None, media=None):
+    """
+    Render a course ("screens") or section test ("questions") file into the
+    text stream out, one screen at a time — the file is never loaded whole
+    and the page head is written before the first screen is parsed.
+
+    Each element is validated as it arrives; invalid or duplicate elements
+    are left out of the page and reported. Returns (total_screens,
+    quiz_count, errors). The head is out before any image is known, so the
+    preload links for the first 1 + PREFETCH_AHEAD screens follow those
+    screens in the body; only that window of images is kept.
+    """
+    errors, seen_ids, first_images = [], set(), []
+    total_screens = quiz_count = 0
+
+    with open(input_path, 'r', encoding='utf-8') as f:
+        doc = JsonArrayStream(f)
+        is_test = doc.array_key == 'questions'
+        validate = validate_section_test_question if is_test else validate_screen
+
+        theme_name, course_name, lesson_name = _page_names(doc.head, course_slug)
+        out.write(_page_head(theme_name, course_name, lesson_name, '…'))
+
+        for i, item in enumerate(doc):
+            path = f"$.{doc.array_key}[{i}]"
+            item_errors = []
+            validate(item, path, item_errors)
+            if not item_errors and item['id'] in seen_ids:
+                item_errors.append(f"{path}.id: duplicate id '{item['id']}'")
+            if item_errors:
+                errors.extend(item_errors)
+                continue
+            seen_ids.add(item['id'])
+
+            screen = section_test_screen(item) if is_test else item
+            if total_screens:
+                out.write('\n')
+            out.write(generate_screen_html(screen, media, eager=total_screens <= PREFETCH_AHEAD))
+            total_screens += 1
+            quiz_count += screen['type'] == 'quiz'
+            if total_screens <= 1 + PREFETCH_AHEAD:
+                first_images.append(screen_image(screen))
+                if total_screens == 1 + PREFETCH_AHEAD:
+                    out.write(_preload_links(first_images, media=media))
+
+    if doc.array_key is None:
+        errors.append("$: no 'screens' or 'questions' array")
+    if total_screens < 1 + PREFETCH_AHEAD:
+        out.write(_preload_links(first_images, media=media))
+    out.write(_page_tail(course_name, total_screens, quiz_count))
+    return total_screens, quiz_count, errors
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 
+# Course files larger than this are rendered with stream_html()
+STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+
 def main():
     input_path  = r"medicalogy_docs\screens\5-course_test\json_demo.json"
     output_path = r"medicalogy_docs\screens\5-course_test\demo.html"
+    course_slug = Path(input_path).stem     # breadcrumb names, when the file is a known course
+    media       = load_responsive_media()
+
+    if not os.path.isfile(input_path):
+        print(f"Error: File not found: {input_path}")
+        sys.exit(1)
+
+    if os.path.getsize(input_path) > STREAM_THRESHOLD_BYTES:
+        print(f"Streaming course from: {input_path}")
+        print(f"Writing HTML to: {output_path}")
+        # Written next to the output and renamed on success: a file that turns
+        # out malformed halfway never leaves a truncated page behind
+        partial_path = output_path + '.partial'
+        try:
+            with open(partial_path, 'w', encoding='utf-8') as f:
+                total_screens, quiz_count, errors = stream_html(input_path, f, course_slug, media=media)
+        except ValueError as e:                 # json.JSONDecodeError included
+            os.remove(partial_path)
+            print(f"Error: Invalid JSON format: {e}")
+            sys.exit(1)
+        os.replace(partial_path, output_path)
+        print(f"  - Total screens: {total_screens}")
+        print(f"  - Quizzes:       {quiz_count}")
+        if errors:
+            print(f"Error: {len(errors)} problems; affected screens were skipped:")
+            for error in errors:
+                print(f"  - {error}")
+            sys.exit(1)
+        print(f"✓ Successfully generated {output_path}")
+        return
 
     print(f"Loading course from: {input_path}")
     course_data = load_course_json(input_path)
@@ -1119,7 +1337,7 @@ def main():
     print(f"  - Version:       {course_data['version']}")
     print(f"  - Total screens: {len(course_data['screens'])}")
 
-    html_content = generate_html(course_data)
+    html_content = generate_html(course_data, course_slug, media=media)
 
     print(f"Writing HTML to: {output_path}")
     with open(output_path, 'w', encoding='utf-8') as f:
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Medicalogy Section Test Assembly
+Builds section_test content (JSON_SPEC.md Part 2) from the quiz screens of
+the courses in each section.
+
+Pools are built once from mockup_data.json (via the shared content index)
+and content_files/courses: every quiz screen of every course in a section,
+with identical question content kept once, grouped by difficulty stratum —
+course difficultyLevel beginner / intermediate / advanced → easy / medium /
+hard.
+
+A test instance draws a fixed number of questions per stratum, proportional
+to the stratum's share of the pool, using a generator seeded from (user,
+section, attempt): the same user gets the same test on reload, different
+users get different tests. Sampling is Floyd's algorithm over the stratum
+index, so assembly costs O(test size) whatever the pool size.
+
+Instances are plain section test documents — json_to_html.py renders them
+(stream_html, or generate_html(test_to_course(test))).
+"""
+
+import hashlib
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'mockup_data'))
+from content_index import load_content_index  # noqa: E402
+from content_validator import validate_section_test  # noqa: E402
+from near_duplicates import fragment_id  # noqa: E402
+from json_to_html import generate_html, section_test_screen  # noqa: E402
+
+
+COURSE_DIR        = Path(__file__).resolve().parents[2] / 'mockup_data' / 'content_files' / 'courses'
+DEFAULT_TEST_SIZE = 10
+
+DIFFICULTY_STRATA = {
+    'beginner':     'easy',
+    'intermediate': 'medium',
+    'advanced':     'hard',
+}
+STRATUM_ORDER = ('easy', 'medium', 'hard')
+
+
+# ---------------------------------------------------------------------------
+# Pools
+# ---------------------------------------------------------------------------
+
+class SectionPool:
+    """
+    Quiz questions available to one section's test.
+
+    strata — { 'easy' | 'medium' | 'hard': [question, ...] } where each
+             question is { 'source': '<course-slug>#<screen-id>',
+                           'difficultyLevel': ..., 'content': {...} }
+    """
+
+    def __init__(self, section_slug):
+        self.section_slug = section_slug
+        self.strata = {level: [] for level in STRATUM_ORDER}
+        self._allocations = {}                  # size -> allocation
+
+    def __len__(self):
+        return sum(len(items) for items in self.strata.values())
+
+    def allocation(self, size):
+        """
+        Questions per stratum for a test of `size` (capped at the pool size):
+        proportional to stratum size, largest remainder first. Cached, so
+        only call it once the pool is fully built.
+        """
+        if size not in self._allocations:
+            self._allocations[size] = self._allocate(size)
+        return self._allocations[size]
+
+    def _allocate(self, size):
+        total = len(self)
+        size = min(size, total)
+        if size == 0:
+            return ()
+        shares = [(level, len(self.strata[level]) * size / total) for level in STRATUM_ORDER]
+        counts = {level: int(share) for level, share in shares}
+        remainder = size - sum(counts.values())
+        by_fraction = sorted(shares, key=lambda s: (-(s[1] - int(s[1])), STRATUM_ORDER.index(s[0])))
+        for level, _ in by_fraction[:remainder]:
+            counts[level] += 1
+        return tuple((level, counts[level]) for level in STRATUM_ORDER if counts[level])
+
+
+def build_pools(index=None, course_dir=COURSE_DIR):
+    """{ section slug: SectionPool } for every section in the content index."""
+    index = index or load_content_index()
+    pools = {}
+    for section in index.sections:
+        pool = SectionPool(section['slug'])
+        seen = set()
+        for course in section['courses']:
+            path = Path(course_dir) / course['contentFile']
+            if not path.exists():
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                screens = json.load(f)['screens']
+            stratum = DIFFICULTY_STRATA.get(course.get('difficultyLevel'), 'medium')
+            for screen in screens:
+                if screen.get('type') != 'quiz':
+                    continue
+                fid = fragment_id(screen['content'])
+                if fid in seen:
+                    continue
+                seen.add(fid)
+                pool.strata[stratum].append({
+                    'source':          f"{course['slug']}#{screen['id']}",
+                    'difficultyLevel': stratum,
+                    'content':         screen['content'],
+                })
+        pools[section['slug']] = pool
+    return pools
+
+
+# ---------------------------------------------------------------------------
+# Instances
+# ---------------------------------------------------------------------------
+
+def instance_seed(user_id, section_slug, attempt=1):
+    """Stable 64-bit seed for one user's attempt at one section test."""
+    digest = hashlib.sha256(f"{user_id}:{section_slug}:{attempt}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+
+def _floyd_sample(rng, n, k):
+    """k distinct indices from range(n) in O(k) (Floyd's algorithm)."""
+    chosen = set()
+    for j in range(n - k, n):
+        t = rng.randrange(j + 1)
+        chosen.add(j if t in chosen else t)
+    return list(chosen)
+
+
+def assemble_test(pool, user_id, attempt=1, size=DEFAULT_TEST_SIZE):
+    """
+    One randomized, stratified section test document for user_id. Questions
+    are renumbered q-001… with sequential orderIndex; 'source' records the
+    course screen each one came from.
+    """
+    rng = random.Random(instance_seed(user_id, pool.section_slug, attempt))
+    picked = []
+    for level, count in pool.allocation(size):
+        items = pool.strata[level]
+        picked.extend(items[i] for i in _floyd_sample(rng, len(items), count))
+    rng.shuffle(picked)
+
+    return {
+        'version': '1.0',
+        'questions': [
+            {
+                'id':              f"q-{n:03d}",
+                'orderIndex':      n,
+                'difficultyLevel': item['difficultyLevel'],
+                'source':          item['source'],
+                'content':         item['content'],
+            }
+            for n, item in enumerate(picked, start=1)
+        ],
+    }
+
+
+def test_to_course(test):
+    """Section test document → course document, for json_to_html.generate_html()."""
+    return {'version': test['version'], 'screens': [section_test_screen(q) for q in test['questions']]}
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    output_dir = Path(__file__).resolve().parent / 'section_tests'
+    user_id    = sys.argv[1] if len(sys.argv) > 1 else 'D0FD63AB-7DD9-5AF6-BB78-C901E7442B98'
+
+    print("Building section question pools...")
+    index = load_content_index()
+    pools = build_pools(index)
+    print(f"  - Sections:  {len(pools)}")
+    print(f"  - Questions: {sum(len(p) for p in pools.values())}")
+
+    output_dir.mkdir(exist_ok=True)
+    for slug, pool in pools.items():
+        if not len(pool):
+            print(f"  ! {slug}: no quiz screens, skipped")
+            continue
+        test = assemble_test(pool, user_id)
+        errors = validate_section_test(test)
+        if errors:
+            print(f"Error: generated test for {slug} is invalid:")
+            for error in errors:
+                print(f"  - {error}")
+            sys.exit(1)
+
+        with open(output_dir / f"{slug}.json", 'w', encoding='utf-8') as f:
+            json.dump(test, f, ensure_ascii=False, indent=2)
+        names = {
+            'themeName':  index.theme_names[index.section_theme[slug]],
+            'courseName': index.section_names[slug],
+            'lessonName': 'Section Test',
+        }
+        with open(output_dir / f"{slug}.html", 'w', encoding='utf-8') as f:
+            f.write(generate_html({**test_to_course(test), **names}))
+        mix = ', '.join(f"{count} {level}" for level, count in pool.allocation(DEFAULT_TEST_SIZE))
+        print(f"  {slug:<40} {len(test['questions']):>2} questions ({mix})")
+
+    print(f"✓ Successfully generated section tests in {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,24 @@ Converts custom medical markdown format to styled HTML pages.
 """
 
 import re
+import sys
+from pathlib import Path
 from typing import List, Tuple, Optional, Dict
+from urllib.parse import unquote, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'mockup_data'))
+from content_index import load_content_index  # noqa: E402
+from media_placeholders import placeholder_style  # noqa: E402
+from media_variants import load_responsive_media, picture_html  # noqa: E402
+from view_counter import article_view_stats  # noqa: E402
+
+# Rendered width per image position: .article-content is at most 900px less
+# 2 × 40px padding; left/right floats take 45% of it, all go full width ≤768px
+IMAGE_SIZES = {
+    'center': '(max-width: 900px) 100vw, 820px',
+    'left':   '(max-width: 768px) 100vw, 370px',
+    'right':  '(max-width: 768px) 100vw, 370px',
+}
 
 
 class MedicalogyMarkdownConverter:
@@ -30,7 +47,9 @@ class MedicalogyMarkdownConverter:
     - Article metadata (view count, last viewed, tags, related articles)
     """
 
-    def __init__(self):
+    def __init__(self, media: Optional[Dict[str, Dict]] = None):
+        # { image file name: media entry } — intrinsic width/height and srcset variants
+        self.media = media or {}
         self.in_table = False
         self.in_list = False
         self.in_ordered_list = False
@@ -361,11 +380,21 @@ class MedicalogyMarkdownConverter:
             alt_text = alt_with_pos.strip()
         if position not in ('left', 'right', 'center'):
             position = 'center'
+        entry = self.media.get(unquote(Path(urlparse(url).path).name))
+        img_html = (f'<img src="{url}" alt="{alt_text}"{self._image_size_attrs(entry)}'
+                    f'{placeholder_style(entry)} loading="lazy" />')
         html = (f'<div class="image-container image-{position}">'
-                f'<img src="{url}" alt="{alt_text}" loading="lazy" />'
+                f'{picture_html(img_html, entry, IMAGE_SIZES[position])}'
                 f'</div>')
         return html, alt_text
 
+    def _image_size_attrs(self, entry: Optional[Dict]) -> str:
+        """width/height attributes for images known to the media index, so the
+        browser reserves the box before the file loads."""
+        if not entry or not entry.get('width'):
+            return ''
+        return f' width="{entry["width"]}" height="{entry["height"]}"'
+
     def _convert_table_row(self, line: str, is_first: bool = False) -> str:
         cells = [c.strip() for c in line.split('|')[1:-1]]
         if is_first:
@@ -445,9 +474,19 @@ class MedicalogyMarkdownConverter:
     #  Full HTML wrapper
     # ------------------------------------------------------------------ #
 
+    def _generate_theme_links(self) -> str:
+        """Sidebar theme submenu, in roadmap order, from the shared content index."""
+        index = load_content_index()
+        return '\n'.join(
+            f'                        <li class="submenu-item"><a href="/{theme["slug"]}" '
+            f'class="submenu-link">{theme["name"]}</a></li>'
+            for theme in index.themes
+        )
+
     def _wrap_in_html(self, top_meta_content: str, sidebar_content: str,
                       body_content: str) -> str:
         title = self.article_title or 'Medicalogy Medical Wiki'
+        theme_links = self._generate_theme_links()
         return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -977,6 +1016,7 @@ class MedicalogyMarkdownConverter:
             transition: transform 0.3s ease;
         }}
 
+        .image-container picture {{ display: block; }}
         .image-container:hover img {{ transform: scale(1.02); }}
 
         .image-left {{ float: left; max-width: 45%; margin: 8px 24px 16px 0; }}
@@ -1591,9 +1631,7 @@ class MedicalogyMarkdownConverter:
                         </svg>
                     </button>
                     <ul class="submenu expanded" id="themesSubmenu">
-                        <li class="submenu-item"><a href="/emergency-care" class="submenu-link">Emergency Care</a></li>
-                        <li class="submenu-item"><a href="/mental-health" class="submenu-link">Mental Health</a></li>
-                        <li class="submenu-item"><a href="/nutrition" class="submenu-link">Nutrition</a></li>
+{theme_links}
                     </ul>
                 </li>
             </ul>
@@ -1976,7 +2014,8 @@ def convert_file(input_path: str, output_path: str,
                  view_count: int = 0,
                  last_viewed_at: str = "",
                  tags: list = None,
-                 related_articles: list = None) -> None:
+                 related_articles: list = None,
+                 media: Optional[Dict[str, Dict]] = None) -> None:
     """
     Convert a Medicalogy markdown file to HTML.
 
@@ -1987,11 +2026,12 @@ def convert_file(input_path: str, output_path: str,
         last_viewed_at: Formatted datetime string
         tags: List of tag strings
         related_articles: List of dicts with 'title', 'slug', 'category'
+        media: Media entries ({file name: entry}); defaults to load_responsive_media()
     """
     with open(input_path, 'r', encoding='utf-8') as f:
         markdown_content = f.read()
 
-    converter = MedicalogyMarkdownConverter()
+    converter = MedicalogyMarkdownConverter(media if media is not None else load_responsive_media())
     html_content = converter.convert(
         markdown_content,
         view_count=view_count,
@@ -2027,11 +2067,19 @@ def main():
         {"title": "CPR Basics",                     "slug": "cpr-basics",                     "category": "First Aid"},
     ]
 
+    # Seeded article the demo stands in for: its article_view_total row in the
+    # stand-in database (view_counter.py), else the sample metadata
+    stats = article_view_stats("cardiac-emergencies-time-critical-response")
+    if stats:
+        view_count, last_viewed_at = stats[0], (stats[1] or "")[:16]
+    else:
+        view_count, last_viewed_at = 12847, "2 minutes ago"
+
     convert_file(
         input_path,
         output_path,
-        view_count=12847,
-        last_viewed_at="2 minutes ago",
+        view_count=view_count,
+        last_viewed_at=last_viewed_at,
         tags=sample_tags,
         related_articles=sample_related_articles,
     )